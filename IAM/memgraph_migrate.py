@@ -3,10 +3,9 @@ from dotenv import load_dotenv
 import os
 import time
 from concurrent.futures import ProcessPoolExecutor
-import multiprocessing
 from tqdm import tqdm
 import psycopg2
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
 
@@ -21,74 +20,120 @@ DB_NAME = os.getenv('DB_NAME', 'iam_demo')
 MEMGRAPH_HOST = os.getenv('MEMGRAPH_HOST', 'localhost')
 MEMGRAPH_PORT = int(os.getenv('MEMGRAPH_PORT', '7687'))
 
+# PostgreSQL as seen from Memgraph, for migrate.postgresql
+PG_CONFIG = "{host: 'localhost', port: 5432, database: 'iam_demo', user: 'memgraph', password: 'memgraph'}"
+
+# Parallel migration of the large tables
+NUM_PROCESSES = 8
+# More chunks than processes, so that one slow chunk doesn't hold up the end
+CHUNKS_PER_PROCESS = 4
+
+# Large tables, migrated in key ranges: table, key column, selected columns
+# and the Cypher that writes a row and returns how many it wrote
+CHUNKED_TABLES = {
+    'users': (
+        'users', 'id', 'id, name',
+        "CREATE (n:User {id: row.id, name: row.name}) RETURN count(n) AS count"
+    ),
+    'user_groups': (
+        'user_groups', 'user_id', 'user_id, group_id',
+        """MATCH (u:User {id: row.user_id})
+    MATCH (g:Group {name: row.group_id})
+    CREATE (u)-[r:MEMBER_OF]->(g) RETURN count(r) AS count"""
+    ),
+}
+
 @dataclass
 class MigrationStats:
     duration: float
     count: int
 
-def count_nodes(memgraph: Memgraph, label: str) -> int:
-    """Count nodes with a specific label"""
-    result = next(memgraph.execute_and_fetch(f"MATCH (n:{label}) RETURN count(n) as count"))
+def migrate_table(memgraph: Memgraph, sql: str, write: str) -> int:
+    """Run one migrate.postgresql stream; write ends with RETURN count(...) AS count"""
+    result = next(memgraph.execute_and_fetch(f"""
+    CALL migrate.postgresql('{sql}', {PG_CONFIG})
+    YIELD row
+    {write};
+    """))
     return result['count']
 
-def count_relationships(memgraph: Memgraph, type: str) -> int:
-    """Count relationships of a specific type"""
-    result = next(memgraph.execute_and_fetch(f"MATCH ()-[r:{type}]->() RETURN count(r) as count"))
-    return result['count']
+def storage_counts(memgraph: Memgraph) -> Tuple[int, int]:
+    """Vertex and edge count from SHOW STORAGE INFO, without scanning the graph"""
+    info = {row['storage info']: row['value'] for row in memgraph.execute_and_fetch("SHOW STORAGE INFO")}
+    return int(info['vertex_count']), int(info['edge_count'])
+
+def key_boundaries(pg_cursor, table: str, column: str, chunks: int) -> List[str]:
+    """Keys that split a table into chunks of about equal size.
+
+    One percentile_disc query reads the column in order once and returns all
+    the cut points. Keys are compared as strings ('USER_10' < 'USER_9'), which
+    is fine: the ranges between them still cover every row exactly once.
+    """
+    fractions = [i / chunks for i in range(1, chunks)]
+    pg_cursor.execute(
+        f"SELECT percentile_disc(%s::float8[]) WITHIN GROUP (ORDER BY {column}) FROM {table}",
+        (fractions,)
+    )
+    boundaries = pg_cursor.fetchone()[0] or []
+    # A key that repeats (a user in many groups) may be more than one cut point
+    return sorted(set(key for key in boundaries if key is not None))
 
-def migrate_users_chunk(chunk_data: List[Tuple[int, int]]) -> Tuple[float, int]:
-    """Migrate a chunk of users from PostgreSQL to Memgraph"""
+def key_ranges(boundaries: List[str]) -> List[Tuple[Optional[str], Optional[str]]]:
+    """(low, high] ranges between the boundaries; the first and last are open"""
+    keys = [None] + boundaries + [None]
+    return list(zip(keys, keys[1:]))
+
+def migrate_chunk(chunk: Tuple[str, Optional[str], Optional[str]]) -> Tuple[float, int]:
+    """Migrate the rows of a chunked table with low < key <= high"""
     start_time = time.time()
-    
-    # Create new connections in the worker process
+    table_name, low, high = chunk
+    table, column, columns, write = CHUNKED_TABLES[table_name]
+
+    # Keyset range on the key's index, instead of ORDER BY ... OFFSET, which
+    # sorts and skips all the rows of the chunks before this one
+    conditions, params = [], []
+    if low is not None:
+        conditions.append(f"{column} > %s")
+        params.append(low)
+    if high is not None:
+        conditions.append(f"{column} <= %s")
+        params.append(high)
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+
+    # Create a new connection in the worker process
     memgraph = Memgraph()
-    pg_conn = psycopg2.connect(
-        host="localhost",
-        database="iam_demo",
-        user="memgraph",
-        password="memgraph"
-    )
-    pg_cursor = pg_conn.cursor()
-    
-    start_idx, end_idx = chunk_data
-    chunk_size = end_idx - start_idx
-    
-    # Get initial user count
-    initial_count = count_nodes(memgraph, "User")
-    
-    # Migrate users in this chunk
-    query = """
+    result = next(memgraph.execute_and_fetch(f"""
     CALL migrate.postgresql(
-        'SELECT id, name FROM users ORDER BY id LIMIT """ + str(chunk_size) + " OFFSET " + str(start_idx - 1) + """',
-        {
-            host: 'localhost',
-            port: 5432,
-            database: 'iam_demo',
-            user: 'memgraph',
-            password: 'memgraph'
-        }
+        'SELECT {columns} FROM {table}{where}',
+        {PG_CONFIG},
+        '',
+        $params
     )
     YIELD row
-    CREATE (n:User {id: row.id, name: row.name});
-    """
-    memgraph.execute(query)
-    
-    # Get final user count
-    final_count = count_nodes(memgraph, "User")
-    users_added = final_count - initial_count
-    
-    # Clean up connections
-    pg_cursor.close()
-    pg_conn.close()
-    
+    {write};
+    """, {'params': params}))
+
     duration = time.time() - start_time
-    return duration, users_added
+    return duration, result['count']
+
+def migrate_chunked(pg_cursor, table_name: str) -> Tuple[float, List[Tuple[float, int]]]:
+    """Migrate a chunked table on NUM_PROCESSES processes"""
+    table, column, _, _ = CHUNKED_TABLES[table_name]
+    boundaries = key_boundaries(pg_cursor, table, column, NUM_PROCESSES * CHUNKS_PER_PROCESS)
+    chunks = [(table_name, low, high) for low, high in key_ranges(boundaries)]
+
+    start_time = time.time()
+    with ProcessPoolExecutor(max_workers=NUM_PROCESSES) as executor:
+        chunk_results = list(tqdm(executor.map(migrate_chunk, chunks),
+                                total=len(chunks),
+                                desc=f"Processing {table_name} chunks"))
+    return time.time() - start_time, chunk_results
 
 def migrate_data():
     """Migrate data from PostgreSQL to Memgraph using parallel processing"""
     total_start_time = time.time()
     stats = defaultdict(MigrationStats)
-    
+
     # Create main process connections
     memgraph = Memgraph()
     pg_conn = psycopg2.connect(
@@ -98,20 +143,20 @@ def migrate_data():
         password="memgraph"
     )
     pg_cursor = pg_conn.cursor()
-    
+
     # Get total number of users
     pg_cursor.execute("SELECT COUNT(*) FROM users")
     total_users = pg_cursor.fetchone()[0]
-    
+
     print("\nStarting migration process...")
     print(f"Total users to migrate: {total_users:,}")
-    
+
     # Clear existing data
     print("\nClearing existing data...")
     clear_start = time.time()
     memgraph.execute("MATCH (n) DETACH DELETE n")
     stats['clear'] = MigrationStats(time.time() - clear_start, 0)
-    
+
     # Create constraints
     print("Creating constraints...")
     constraints_start = time.time()
@@ -128,166 +173,85 @@ def migrate_data():
         except Exception as e:
             print(f"Constraint might already exist: {e}")
     stats['constraints'] = MigrationStats(time.time() - constraints_start, len(constraints))
-    
-    # Migrate non-user data first (these are small enough to do in main process)
+
+    # Migrate non-user data first (these are small enough to do in main process).
+    # Every count is the number of rows the migration query itself returns.
     print("\nMigrating permissions...")
     perm_start = time.time()
-    initial_perm_count = count_nodes(memgraph, "Permission")
-    memgraph.execute("""
-    CALL migrate.postgresql(
-        'SELECT name FROM permissions',
-        {host: 'localhost', port: 5432, database: 'iam_demo', user: 'memgraph', password: 'memgraph'}
-    )
-    YIELD row
-    CREATE (n:Permission {name: row.name});
-    """)
-    final_perm_count = count_nodes(memgraph, "Permission")
-    stats['permissions'] = MigrationStats(time.time() - perm_start, final_perm_count - initial_perm_count)
-    
+    count = migrate_table(memgraph, 'SELECT name FROM permissions',
+                          "CREATE (n:Permission {name: row.name}) RETURN count(n) AS count")
+    stats['permissions'] = MigrationStats(time.time() - perm_start, count)
+
     print("Migrating apps...")
     apps_start = time.time()
-    initial_app_count = count_nodes(memgraph, "App")
-    memgraph.execute("""
-    CALL migrate.postgresql(
-        'SELECT name FROM apps',
-        {host: 'localhost', port: 5432, database: 'iam_demo', user: 'memgraph', password: 'memgraph'}
-    )
-    YIELD row
-    CREATE (n:App {name: row.name});
-    """)
-    final_app_count = count_nodes(memgraph, "App")
-    stats['apps'] = MigrationStats(time.time() - apps_start, final_app_count - initial_app_count)
-    
+    count = migrate_table(memgraph, 'SELECT name FROM apps',
+                          "CREATE (n:App {name: row.name}) RETURN count(n) AS count")
+    stats['apps'] = MigrationStats(time.time() - apps_start, count)
+
     print("Migrating roles...")
     roles_start = time.time()
-    initial_role_count = count_nodes(memgraph, "Role")
-    memgraph.execute("""
-    CALL migrate.postgresql(
-        'SELECT name FROM roles',
-        {host: 'localhost', port: 5432, database: 'iam_demo', user: 'memgraph', password: 'memgraph'}
-    )
-    YIELD row
-    CREATE (n:Role {name: row.name});
-    """)
-    final_role_count = count_nodes(memgraph, "Role")
-    stats['roles'] = MigrationStats(time.time() - roles_start, final_role_count - initial_role_count)
-    
+    count = migrate_table(memgraph, 'SELECT name FROM roles',
+                          "CREATE (n:Role {name: row.name}) RETURN count(n) AS count")
+    stats['roles'] = MigrationStats(time.time() - roles_start, count)
+
     print("Migrating groups...")
     groups_start = time.time()
-    initial_group_count = count_nodes(memgraph, "Group")
-    memgraph.execute("""
-    CALL migrate.postgresql(
-        'SELECT name FROM groups',
-        {host: 'localhost', port: 5432, database: 'iam_demo', user: 'memgraph', password: 'memgraph'}
-    )
-    YIELD row
-    CREATE (n:Group {name: row.name});
-    """)
-    final_group_count = count_nodes(memgraph, "Group")
-    stats['groups'] = MigrationStats(time.time() - groups_start, final_group_count - initial_group_count)
-    
-    # Prepare user chunks for parallel processing
-    num_processes = 8
-    chunk_size = total_users // num_processes
-    user_chunks = []
-    
-    for i in range(num_processes):
-        start_idx = i * chunk_size + 1  # PostgreSQL IDs start at 1
-        end_idx = start_idx + chunk_size if i < num_processes - 1 else total_users + 1
-        user_chunks.append((start_idx, end_idx))
-    
-    # Migrate users in parallel
+    count = migrate_table(memgraph, 'SELECT name FROM groups',
+                          "CREATE (n:Group {name: row.name}) RETURN count(n) AS count")
+    stats['groups'] = MigrationStats(time.time() - groups_start, count)
+
+    # Migrate users in parallel, in key ranges of users.id
     print("\nMigrating users using parallel processing...")
-    users_start = time.time()
-    initial_user_count = count_nodes(memgraph, "User")
-    
-    with ProcessPoolExecutor(max_workers=num_processes) as executor:
-        chunk_results = list(tqdm(executor.map(migrate_users_chunk, user_chunks),
-                                total=num_processes,
-                                desc="Processing user chunks"))
-    
-    # Calculate total user migration stats
-    user_duration = time.time() - users_start
-    total_users_added = sum(count for _, count in chunk_results)
-    avg_chunk_duration = sum(duration for duration, _ in chunk_results) / len(chunk_results)
+    user_duration, user_chunk_results = migrate_chunked(pg_cursor, 'users')
+    total_users_added = sum(count for _, count in user_chunk_results)
     stats['users'] = MigrationStats(user_duration, total_users_added)
-    
+
     # Migrate relationships (after all nodes are created)
     print("\nMigrating app permissions...")
     app_perm_start = time.time()
-    initial_app_perm_count = count_relationships(memgraph, "HAS_PERMISSION")
-    memgraph.execute("""
-    CALL migrate.postgresql(
-        'SELECT app_id, permission_id FROM app_permissions',
-        {host: 'localhost', port: 5432, database: 'iam_demo', user: 'memgraph', password: 'memgraph'}
-    )
-    YIELD row
-    MATCH (a:App {name: row.app_id})
+    count = migrate_table(memgraph, 'SELECT app_id, permission_id FROM app_permissions', """MATCH (a:App {name: row.app_id})
     MATCH (p:Permission {name: row.permission_id})
-    CREATE (a)-[:HAS_PERMISSION]->(p);
-    """)
-    final_app_perm_count = count_relationships(memgraph, "HAS_PERMISSION")
-    stats['app_permissions'] = MigrationStats(time.time() - app_perm_start, final_app_perm_count - initial_app_perm_count)
-    
+    CREATE (a)-[r:HAS_PERMISSION]->(p) RETURN count(r) AS count""")
+    stats['app_permissions'] = MigrationStats(time.time() - app_perm_start, count)
+
     print("Migrating role permissions...")
     role_perm_start = time.time()
-    initial_role_perm_count = count_relationships(memgraph, "CAN_ACCESS")
-    memgraph.execute("""
-    CALL migrate.postgresql(
-        'SELECT role_id, app_id FROM role_apps',
-        {host: 'localhost', port: 5432, database: 'iam_demo', user: 'memgraph', password: 'memgraph'}
-    )
-    YIELD row
-    MATCH (r:Role {name: row.role_id})
+    count = migrate_table(memgraph, 'SELECT role_id, app_id FROM role_apps', """MATCH (r:Role {name: row.role_id})
     MATCH (a:App {name: row.app_id})
-    CREATE (r)-[:CAN_ACCESS]->(a);
-    """)
-    final_role_perm_count = count_relationships(memgraph, "CAN_ACCESS")
-    stats['role_permissions'] = MigrationStats(time.time() - role_perm_start, final_role_perm_count - initial_role_perm_count)
-    
+    CREATE (r)-[c:CAN_ACCESS]->(a) RETURN count(c) AS count""")
+    stats['role_permissions'] = MigrationStats(time.time() - role_perm_start, count)
+
     print("Migrating group roles...")
     group_role_start = time.time()
-    initial_group_role_count = count_relationships(memgraph, "HAS_ROLE")
-    memgraph.execute("""
-    CALL migrate.postgresql(
-        'SELECT group_id, role_id FROM group_roles',
-        {host: 'localhost', port: 5432, database: 'iam_demo', user: 'memgraph', password: 'memgraph'}
-    )
-    YIELD row
-    MATCH (g:Group {name: row.group_id})
+    count = migrate_table(memgraph, 'SELECT group_id, role_id FROM group_roles', """MATCH (g:Group {name: row.group_id})
     MATCH (r:Role {name: row.role_id})
-    CREATE (g)-[:HAS_ROLE]->(r);
-    """)
-    final_group_role_count = count_relationships(memgraph, "HAS_ROLE")
-    stats['group_roles'] = MigrationStats(time.time() - group_role_start, final_group_role_count - initial_group_role_count)
-    
-    print("Migrating user groups...")
-    user_group_start = time.time()
-    initial_user_group_count = count_relationships(memgraph, "MEMBER_OF")
-    memgraph.execute("""
-    CALL migrate.postgresql(
-        'SELECT user_id, group_id FROM user_groups',
-        {host: 'localhost', port: 5432, database: 'iam_demo', user: 'memgraph', password: 'memgraph'}
+    CREATE (g)-[h:HAS_ROLE]->(r) RETURN count(h) AS count""")
+    stats['group_roles'] = MigrationStats(time.time() - group_role_start, count)
+
+    # Migrate user groups in parallel, in key ranges of user_groups.user_id.
+    # Every chunk adds edges to the same 30 groups, which concurrent
+    # transactions would conflict on, so this runs in analytical mode.
+    print("Migrating user groups using parallel processing...")
+    memgraph.execute("STORAGE MODE IN_MEMORY_ANALYTICAL")
+    try:
+        user_group_duration, user_group_chunk_results = migrate_chunked(pg_cursor, 'user_groups')
+    finally:
+        memgraph.execute("STORAGE MODE IN_MEMORY_TRANSACTIONAL")
+    stats['user_groups'] = MigrationStats(
+        user_group_duration, sum(count for _, count in user_group_chunk_results)
     )
-    YIELD row
-    MATCH (u:User {id: row.user_id})
-    MATCH (g:Group {name: row.group_id})
-    CREATE (u)-[:MEMBER_OF]->(g);
-    """)
-    final_user_group_count = count_relationships(memgraph, "MEMBER_OF")
-    stats['user_groups'] = MigrationStats(time.time() - user_group_start, final_user_group_count - initial_user_group_count)
-    
+
     # Clean up main process connections
     pg_cursor.close()
     pg_conn.close()
-    
+
     total_duration = time.time() - total_start_time
-    
+
     # Print detailed statistics
     print("\nMigration Statistics:")
     print("=" * 50)
     print(f"\nTotal Migration Time: {total_duration:.2f}s")
-    
+
     print("\nNode Migration:")
     print("-" * 30)
     for node_type in ['permissions', 'apps', 'roles', 'groups', 'users']:
@@ -296,7 +260,7 @@ def migrate_data():
         print(f"  Count: {s.count:,}")
         print(f"  Time:  {s.duration:.2f}s")
         print(f"  Rate:  {s.count/s.duration:.1f} nodes/s")
-    
+
     print("\nRelationship Migration:")
     print("-" * 30)
     for rel_type in ['app_permissions', 'role_permissions', 'group_roles', 'user_groups']:
@@ -305,16 +269,32 @@ def migrate_data():
         print(f"  Count: {s.count:,}")
         print(f"  Time:  {s.duration:.2f}s")
         print(f"  Rate:  {s.count/s.duration:.1f} rels/s")
-    
-    print("\nParallel User Migration Details:")
+
+    print("\nParallel Migration Details:")
     print("-" * 30)
-    print(f"Number of processes: {num_processes}")
-    print(f"Average chunk duration: {avg_chunk_duration:.2f}s")
-    print(f"Users per process: {chunk_size:,}")
-    print(f"Total throughput: {total_users_added/user_duration:.1f} users/s")
+    print(f"Number of processes: {NUM_PROCESSES}")
+    for table_name, (duration, chunk_results) in [
+        ('users', (user_duration, user_chunk_results)),
+        ('user_groups', (user_group_duration, user_group_chunk_results)),
+    ]:
+        rows = sum(count for _, count in chunk_results)
+        durations = [chunk_duration for chunk_duration, _ in chunk_results]
+        print(f"{table_name.replace('_', ' ').capitalize()}:")
+        print(f"  Chunks: {len(chunk_results)} (~{rows // len(chunk_results):,} rows each)")
+        print(f"  Chunk duration: {sum(durations) / len(durations):.2f}s average, {max(durations):.2f}s longest")
+        print(f"  Total throughput: {rows/duration:.1f} rows/s")
+
+    # The graph only holds what this migration created, so the storage
+    # counters must match the migrated rows
+    nodes, edges = storage_counts(memgraph)
+    migrated_nodes = sum(stats[t].count for t in ['permissions', 'apps', 'roles', 'groups', 'users'])
+    migrated_edges = sum(stats[t].count for t in ['app_permissions', 'role_permissions', 'group_roles', 'user_groups'])
+    print(f"\nStorage info: {nodes:,} nodes, {edges:,} relationships")
+    if (nodes, edges) != (migrated_nodes, migrated_edges):
+        print(f"Warning: expected {migrated_nodes:,} nodes and {migrated_edges:,} relationships")
 
 def main():
     migrate_data()
 
 if __name__ == "__main__":
-    main() 
+    main()
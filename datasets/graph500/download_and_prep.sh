@@ -63,11 +63,5 @@ fi
 
 cd ..
 
-echo "Running node extraction script..."
-python3 node_extraction.py "$size"
-
-echo "Running csv conversion script..."
-python3 csv_converter.py "$size"
-
-echo "Running csv splitter script..."
-python3 csv_splitter.py "$size"
+echo "Running preprocessing script..."
+python3 preprocess.py "$size"
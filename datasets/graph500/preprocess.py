@@ -0,0 +1,223 @@
+"""Turn a downloaded graph500 .edges file into every file the import tests use.
+
+This makes one streaming pass over the edge list, in blocks of BLOCK_MB:
+
+- Each block is parsed with NumPy into an (n, 2) array of ids. Its edges
+  go to relationships.csv and to the edge chunk they fall into. Chunks are
+  cut by byte offset, so there are exactly --chunks of them, about equally
+  big, without knowing the edge count up front.
+- The block's unique ids (np.unique) are kept; they are merged into the
+  sorted unique node ids once, after the pass.
+
+Then the unique ids are written to <name>.nodes and nodes.csv, and split
+into --chunks node chunks. Every write is a whole block through pyarrow,
+never a row at a time, and memory stays at one block plus the unique ids
+of every block. Chunk files left over from an earlier run (say, one with more
+--chunks) are removed first, so the import scripts only see this run's.
+
+    python3 preprocess.py small                     # 10 CSV chunks
+    python3 preprocess.py large --chunks 16
+    python3 preprocess.py medium --format parquet   # Parquet instead of CSV
+
+Outputs, in ./<size>/:
+
+    <name>.nodes                       one node id per line
+    nodes.csv / nodes.parquet          id
+    relationships.csv / .parquet       source,sink (in .edges column order)
+    csv_node_chunks/nodes_<i>.csv      (parquet_node_chunks/... with --format parquet)
+    csv_relationship_chunks/relationships_<i>.csv
+                                       source,sink (reversed: col2 -> col1)
+"""
+import argparse
+import glob
+import os
+import time
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+BLOCK_MB = 64
+
+NODE_SCHEMA = pa.schema([("id", pa.int64())])
+EDGE_SCHEMA = pa.schema([("source", pa.int64()), ("sink", pa.int64())])
+
+
+class Sizes:
+    OPTIONS = ["small", "medium", "large"]
+
+
+class TableWriter:
+    """Appends Arrow tables to one CSV or Parquet file."""
+
+    def __init__(self, path, schema, file_format, header=True):
+        if file_format == "parquet":
+            self.writer = pq.ParquetWriter(path, schema)
+        else:
+            self.file = open(path, "wb")
+            if header:
+                # pyarrow would quote the column names.
+                self.file.write((",".join(schema.names) + "\n").encode())
+            self.writer = pa_csv.CSVWriter(
+                self.file, schema, write_options=pa_csv.WriteOptions(include_header=False)
+            )
+
+    def write(self, table):
+        if table.num_rows:
+            self.writer.write_table(table)
+
+    def close(self):
+        self.writer.close()
+        if hasattr(self, "file"):
+            self.file.close()
+
+
+def read_blocks(file_path, block_size):
+    """Yield (start byte, end byte, edges) for blocks of whole lines, with
+    edges as an (n, 2) int64 array."""
+    with open(file_path, "rb") as f:
+        offset = 0
+        rest = b""
+        while True:
+            data = f.read(block_size)
+            if data:
+                data = rest + data
+                cut = data.rfind(b"\n") + 1
+                block, rest = data[:cut], data[cut:]
+            else:
+                block, rest = rest, b""
+            if not block:
+                if data:
+                    continue
+                return
+            # sep=" " matches any whitespace, newlines included.
+            ids = np.fromstring(block, dtype=np.int64, sep=" ")
+            if ids.size % 2:
+                raise ValueError(f"{file_path}: odd number of ids near byte {offset}")
+            yield offset, offset + len(block), ids.reshape(-1, 2)
+            offset += len(block)
+
+
+def edge_table(edges, reverse=False):
+    """reverse=True makes the second .edges column the source, the
+    orientation of the relationship chunks and of the Cypher importers."""
+    source, sink = (edges[:, 1], edges[:, 0]) if reverse else (edges[:, 0], edges[:, 1])
+    return pa.table({"source": source, "sink": sink}, schema=EDGE_SCHEMA)
+
+
+def node_table(nodes):
+    return pa.table({"id": nodes}, schema=NODE_SCHEMA)
+
+
+def clear_chunks(chunk_directory, prefix, extension):
+    """Create chunk_directory, or remove the chunk files an earlier run left
+    in it: the import scripts read every file matching the glob."""
+    os.makedirs(chunk_directory, exist_ok=True)
+    for old in glob.glob(os.path.join(chunk_directory, f"{prefix}_*.{extension}")):
+        os.remove(old)
+
+
+def write_edges(file_edges, directory, file_format, chunks):
+    """The streaming pass. Returns the sorted unique node ids and the number
+    of edges."""
+    extension = "parquet" if file_format == "parquet" else "csv"
+    chunk_directory = os.path.join(directory, f"{extension}_relationship_chunks")
+    clear_chunks(chunk_directory, "relationships", extension)
+
+    file_size = os.path.getsize(file_edges)
+    # Blocks well below a chunk, so the byte-offset cut stays fine-grained.
+    block_size = max(1 << 16, min(BLOCK_MB << 20, file_size // (chunks * 4) + 1))
+
+    relationships = TableWriter(os.path.join(directory, f"relationships.{extension}"), EDGE_SCHEMA, file_format)
+    parts = [
+        TableWriter(os.path.join(chunk_directory, f"relationships_{i}.{extension}"), EDGE_SCHEMA, file_format)
+        for i in range(chunks)
+    ]
+    block_nodes = []
+    total = 0
+    for start, end, edges in read_blocks(file_edges, block_size):
+        relationships.write(edge_table(edges))
+        # Spread the block's edges over the chunks by their approximate byte
+        # offset; boundaries[i] is the first edge of chunk i + 1.
+        positions = start + (end - start) * np.arange(len(edges)) // max(len(edges), 1)
+        limits = np.arange(1, chunks) * file_size // chunks
+        boundaries = np.searchsorted(positions, limits)
+        for i, part in enumerate(np.split(edges, boundaries)):
+            parts[i].write(edge_table(part, reverse=True))
+        block_nodes.append(np.unique(edges))
+        total += len(edges)
+
+    relationships.close()
+    for part in parts:
+        part.close()
+    nodes = np.unique(np.concatenate(block_nodes)) if block_nodes else np.empty(0, dtype=np.int64)
+    return nodes, total
+
+
+def write_nodes(nodes, file_nodes, directory, file_format, chunks):
+    extension = "parquet" if file_format == "parquet" else "csv"
+    chunk_directory = os.path.join(directory, f"{extension}_node_chunks")
+    clear_chunks(chunk_directory, "nodes", extension)
+
+    # The .nodes list the Cypher import scripts read is always plain text.
+    writer = TableWriter(file_nodes, NODE_SCHEMA, "csv", header=False)
+    writer.write(node_table(nodes))
+    writer.close()
+
+    writer = TableWriter(os.path.join(directory, f"nodes.{extension}"), NODE_SCHEMA, file_format)
+    writer.write(node_table(nodes))
+    writer.close()
+
+    for i, part in enumerate(np.array_split(nodes, chunks)):
+        writer = TableWriter(os.path.join(chunk_directory, f"nodes_{i}.{extension}"), NODE_SCHEMA, file_format)
+        writer.write(node_table(part))
+        writer.close()
+
+
+def run(size, chunks, file_format):
+    if size not in Sizes.OPTIONS:
+        print("Invalid size argument. Please choose 'small', 'medium', or 'large'.")
+        return
+
+    directory = f"./{size}"
+    file_edges = ""
+    for file in os.listdir(directory):
+        if file.endswith(".edges"):
+            file_edges = os.path.join(directory, file)
+            break
+    if file_edges == "":
+        print(f"No .edges file found in {directory}.")
+        return
+
+    start = time.time()
+    print("Converting and splitting edges ...")
+    nodes, edges = write_edges(file_edges, directory, file_format, chunks)
+    print(f"Relationships: {edges:,} in {chunks} chunks")
+
+    print("Writing nodes ...")
+    write_nodes(nodes, file_edges[:-len(".edges")] + ".nodes", directory, file_format, chunks)
+    print(f"Nodes: {len(nodes):,} in {chunks} chunks")
+    print(f"Done preprocessing in {time.time() - start:.2f} seconds.")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Prepare the graph500 node, relationship and chunk files.")
+    parser.add_argument("size", help="Dataset size: small, medium or large.")
+    parser.add_argument("--chunks", type=int, default=10, help="Number of node and relationship chunks (default: 10).")
+    parser.add_argument(
+        "--format",
+        choices=["csv", "parquet"],
+        default="csv",
+        help="Output format of the node and relationship files (default: csv).",
+    )
+    args = parser.parse_args()
+    if args.chunks < 1:
+        parser.error("--chunks must be at least 1")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print(f"Running with size: {args.size}")
+    run(args.size, args.chunks, args.format)
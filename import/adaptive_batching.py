@@ -0,0 +1,233 @@
+"""Adaptive batch sizing for UNWIND imports.
+
+The right number of rows per transaction depends on property width, index
+count and server load, so a fixed batch size is always a guess. An
+AdaptiveBatchSize starts from that guess and steers towards a target commit
+latency instead:
+
+    batcher = AdaptiveBatchSize(initial=10_000, target_latency=0.5)
+    chunk = rows[offset:offset + batcher.size]
+    ...write chunk, timing it...
+    batcher.record(len(chunk), seconds, retries)
+    print(batcher.summary())   # pin the converged size for the next run
+
+After every commit the expected cost per row (an exponential moving average)
+gives the size that would hit the target; the batch moves there, growing at
+most max_growth times per step. Conflict retries halve the size and pause
+growth for a few commits, and a memory-limit error halves it and caps it
+there for the rest of the run.
+
+Shared by the Iceberg importer (import/iceberg) and the graph500 scripts
+(import/cypher). It uses only the standard library, so the scripts just
+put this directory on sys.path.
+"""
+import threading
+import time
+from itertools import islice
+from multiprocessing.pool import Pool
+from typing import Callable, Iterable, Iterator
+
+
+def is_memory_limit_error(error: BaseException) -> bool:
+    """Memgraph reports "Memory limit exceeded!" when a transaction would go
+    over --memory-limit (or a per-query limit)."""
+    return "memory limit" in str(error).lower()
+
+
+class AdaptiveBatchSize:
+    """Batch size controller. Thread-safe: pool callbacks may record while
+    the submitting thread reads `size`.
+
+    With split_on_memory_limit, callers retry a chunk that hit the memory
+    limit as two halves. Only set it in IN_MEMORY_TRANSACTIONAL mode: there a
+    failed transaction leaves nothing behind, while IN_MEMORY_ANALYTICAL
+    keeps whatever the failed chunk wrote before the error.
+    """
+
+    def __init__(
+        self,
+        initial: int = 10_000,
+        target_latency: float = 0.5,
+        minimum: int = 100,
+        maximum: int = 500_000,
+        max_growth: float = 2.0,
+        smoothing: float = 0.3,
+        tolerance: float = 0.1,
+        stable_after: int = 5,
+        split_on_memory_limit: bool = False,
+    ) -> None:
+        self.size = max(minimum, min(initial, maximum))
+        self.target_latency = target_latency
+        self.minimum = minimum
+        self.maximum = maximum
+        self.max_growth = max_growth
+        self.smoothing = smoothing
+        self.tolerance = tolerance
+        self.stable_after = stable_after
+        self.split_on_memory_limit = split_on_memory_limit
+
+        self.adjustments = 0
+        self.retries = 0
+        self.memory_errors = 0
+        self._seconds_per_row: float | None = None
+        self._stable = 0
+        self._cooldown = 0  # commits left during which the size may not grow
+        self._lock = threading.Lock()
+
+    @property
+    def converged(self) -> bool:
+        """True once the size has not moved for stable_after commits."""
+        return self._stable >= self.stable_after
+
+    def record(self, rows: int, seconds: float, retries: int = 0) -> None:
+        """Feed back one committed chunk: its rows, commit latency and the
+        number of conflict retries it needed."""
+        if rows <= 0:
+            return
+        with self._lock:
+            if retries:
+                # The latency includes backoff sleeps, so it says nothing
+                # about the cost per row; just make the next chunks smaller.
+                self.retries += retries
+                self._resize(self.size // 2)
+                self._cooldown = self.stable_after
+                return
+
+            per_row = seconds / rows
+            if self._seconds_per_row is None:
+                self._seconds_per_row = per_row
+            else:
+                self._seconds_per_row += self.smoothing * (per_row - self._seconds_per_row)
+
+            ideal = self.target_latency / self._seconds_per_row
+            ideal = min(ideal, self.size * self.max_growth)
+            if self._cooldown:
+                self._cooldown -= 1
+                ideal = min(ideal, self.size)
+            if abs(ideal - self.size) <= self.tolerance * self.size:
+                self._stable += 1
+            else:
+                self._resize(int(ideal))
+
+    def record_memory_limit(self, rows: int) -> None:
+        """A chunk of `rows` hit the memory limit: never go above half of it
+        again."""
+        with self._lock:
+            self.memory_errors += 1
+            self.maximum = max(self.minimum, min(self.maximum, rows // 2))
+            self._resize(self.maximum)
+            self._cooldown = self.stable_after
+
+    def record_result(self, rows: int, seconds: float, retries: int, failed: list[int]) -> None:
+        """Feed back the (rows, seconds, retries, failed) a write_chunk-style
+        writer returns. A chunk that had to be split only tells us about the
+        memory limit, not about the cost per row."""
+        for size in failed:
+            self.record_memory_limit(size)
+        if not failed:
+            self.record(rows, seconds, retries)
+
+    def _resize(self, size: int) -> None:
+        size = max(self.minimum, min(size, self.maximum))
+        if size != self.size:
+            self.size = size
+            self.adjustments += 1
+        self._stable = 0
+
+    def summary(self) -> str:
+        """One line for the end of a run, with the size worth pinning."""
+        state = "converged at" if self.converged else "ended at (not converged)"
+        observed = (
+            f", ~{self._seconds_per_row * self.size * 1000:.0f} ms observed"
+            if self._seconds_per_row is not None
+            else ""
+        )
+        return (
+            f"Adaptive batch size {state} {self.size:,} rows "
+            f"(target {self.target_latency * 1000:.0f} ms per commit{observed}; "
+            f"{self.adjustments} adjustments, {self.retries} conflict retries, "
+            f"{self.memory_errors} memory-limit errors)"
+        )
+
+
+def write_chunk(
+    write: Callable[[str, list], int], query: str, chunk: list, split: bool
+) -> tuple[int, float, int, list[int]]:
+    """Pool task for run_adaptive: time write(query, chunk), which returns
+    its conflict retries. With split, a chunk that hits the memory limit is
+    written as two halves instead of failing the import.
+
+    Returns (rows, seconds, retries, sizes of the chunks that hit the limit).
+    """
+    start = time.perf_counter()
+    try:
+        retries = write(query, chunk)
+    except Exception as e:
+        if not (split and is_memory_limit_error(e) and len(chunk) > 1):
+            raise
+        half = len(chunk) // 2
+        failed = [len(chunk)]
+        retries = 0
+        for part in (chunk[:half], chunk[half:]):
+            _, _, part_retries, part_failed = write_chunk(write, query, part, split)
+            retries += part_retries
+            failed += part_failed
+        return len(chunk), time.perf_counter() - start, retries, failed
+    return len(chunk), time.perf_counter() - start, retries, []
+
+
+def sized_chunks(rows: Iterable, batcher: AdaptiveBatchSize) -> Iterator[list]:
+    """Cut rows lazily into chunks of whatever batcher.size is when each
+    chunk is requested."""
+    rows = iter(rows)
+    while chunk := list(islice(rows, batcher.size)):
+        yield chunk
+
+
+def run_adaptive(
+    pool: Pool,
+    write: Callable[[str, list], int],
+    query: str,
+    rows: Iterable,
+    batcher: AdaptiveBatchSize,
+    in_flight: int,
+) -> int:
+    """Write rows through pool in chunks of batcher.size and return the
+    number of chunks written.
+
+    At most in_flight chunks are queued at a time, so each new chunk is cut
+    with a size that already reflects recent commits. rows is consumed
+    lazily, so a generator keeps memory bounded to the chunks in flight.
+    write must be a module-level function (it is pickled to the workers)."""
+    slots = threading.BoundedSemaphore(in_flight)
+    errors: list[BaseException] = []
+
+    def done(result: tuple[int, float, int, list[int]]) -> None:
+        batcher.record_result(*result)
+        slots.release()
+
+    def crashed(error: BaseException) -> None:
+        errors.append(error)
+        slots.release()
+
+    pending = []
+    rows = iter(rows)
+    while not errors:
+        slots.acquire()
+        chunk = list(islice(rows, batcher.size))
+        if not chunk:
+            slots.release()
+            break
+        pending.append(
+            pool.apply_async(
+                write_chunk,
+                (write, query, chunk, batcher.split_on_memory_limit),
+                callback=done,
+                error_callback=crashed,
+            )
+        )
+    for result in pending:
+        result.wait()
+    if errors:
+        raise errors[0]
+    return len(pending)
@@ -1,11 +1,15 @@
 from neo4j import GraphDatabase
-from time import sleep
+import argparse
 import time
 import subprocess
 import multiprocessing
 from pathlib import Path
 import sys
 
+sys.path.insert(0, str(Path(__file__).parents[2]))
+from import_monitor import ImportMonitor, neo4j_storage_info
+from import_profile import PROFILES, ProfiledImport
+
 HOST_PORT = "bolt://localhost:7687"
 
 def execute_csv_chunk(query):
@@ -18,7 +22,7 @@ def execute_csv_chunk(query):
         raise e
 
 
-def run(size: str):
+def run(size: str, profile: str = "bulk", managed: bool = False):
     
 
     target_nodes_directory = Path(__file__).parents[3].joinpath(f"datasets/graph500/{size}/csv_node_chunks")
@@ -30,43 +34,62 @@ def run(size: str):
         queries.append(f"LOAD CSV FROM '/usr/lib/memgraph/{file.name}' WITH HEADER AS row CREATE (n:Node {{id: row.id}})")
     
 
+    # Storage mode, DROP GRAPH and the :Node(id) index follow the profile
+    # (import_profile.py), not whatever mode the server was left in.
     driver = GraphDatabase.driver(HOST_PORT, auth=("", ""))
-
-    with driver.session() as session:
-        session.run("DROP INDEX ON :Node(id)")
-        session.run("MATCH (n) DETACH DELETE n")
-        sleep(1)
-        session.run("CREATE INDEX ON :Node(id)")
-
-    driver.close()
+    session = driver.session()
+    profiled = ProfiledImport(
+        lambda query: session.run(query).consume(),
+        PROFILES[profile],
+        edge_indexes=["CREATE INDEX ON :Node(id)"],
+        managed=managed,
+    )
+    profiled.begin()
 
 
     print("Starting processing different csv files...")
 
-    memory = subprocess.run(["docker", "exec", "-it", "memgraph", "grep", "^VmHWM", "/proc/1/status"], check=True, capture_output=True, text=True)
-    megabytes_peak_RSS = round(int(memory.stdout.split()[1])/1024, 2)
-    print("Peak memory usage before processing chunks: ", megabytes_peak_RSS, " MB")
+    monitor = ImportMonitor(neo4j_storage_info(HOST_PORT)).start()
 
     start = time.time()
-    with multiprocessing.Pool(10) as pool:
+    with profiled.step("load nodes"), multiprocessing.Pool(10) as pool:
         pool.starmap(execute_csv_chunk, [(q, ) for q in queries])
 
     end = time.time()
     print("Processing node LOAD CSV chunks finished in (wall time) ", end - start, " seconds")
 
-    memory = subprocess.run(["docker", "exec", "-it", "memgraph", "grep", "^VmHWM", "/proc/1/status"], check=True, capture_output=True, text=True)
-    megabytes_peak_RSS = round(int(memory.stdout.split()[1])/1024, 2)
-    print("Peak memory usage after processing chunks: ", megabytes_peak_RSS, " MB")
-                    
-        
+    monitor.stop()
+    print(monitor.summary())
+
+    # Build the index the edge import MATCHes on, then leave the server in
+    # the profile's final mode.
+    profiled.nodes_loaded()
+    profiled.finish()
+    print(profiled.summary())
+    session.close()
+    driver.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Import graph500 node chunks with concurrent LOAD CSV.")
+    parser.add_argument("size", help="Dataset size: small, medium or large.")
+    parser.add_argument(
+        "--profile",
+        choices=tuple(PROFILES),
+        default="bulk",
+        help="Import profile (see import/import_profile.py; default: bulk).",
+    )
+    parser.add_argument(
+        "--managed",
+        action="store_true",
+        help="Leave DROP GRAPH, the storage mode and the snapshot to the caller "
+             "(import_benchmark.py); only create the indexes.",
+    )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python3 concurrent_LOAD_CSV_nodes.py <size>")
-        sys.exit(1)
-    else:
-        size = sys.argv[1]
-        print(f"Running with size: {size}")
-        run(size=size)
+    args = parse_args()
+    print(f"Running with size: {args.size}")
+    run(args.size, profile=args.profile, managed=args.managed)
 
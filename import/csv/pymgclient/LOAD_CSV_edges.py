@@ -1,3 +1,4 @@
+import argparse
 import mgclient
 from time import sleep
 import time
@@ -5,10 +6,14 @@ import subprocess
 from pathlib import Path
 import sys
 
+sys.path.insert(0, str(Path(__file__).parents[2]))
+from import_monitor import ImportMonitor, mgclient_storage_info
+from import_profile import PROFILES, ProfiledImport
+
 HOST="127.0.0.1"
 PORT=7687
 
-def run(size: str):
+def run(size: str, profile: str = "bulk"):
 
     p = Path(__file__).parents[3].joinpath(f"datasets/graph500/{size}/relationships.csv")
 
@@ -25,38 +30,52 @@ def run(size: str):
         print("Connection status: %s" % conn.status)
         return
 
+    # Load into the nodes the node import left, in the profile's storage
+    # mode, and make sure the :Node(id) index the edges MATCH on is there.
+    conn.autocommit = True
     cursor = conn.cursor()
-
-    conn.autocommit = False
-
+    profiled = ProfiledImport(
+        cursor.execute, PROFILES[profile], edge_indexes=["CREATE INDEX ON :Node(id)"], reset=False
+    )
+    profiled.begin()
+    profiled.nodes_loaded()
 
     edge_query = """
     LOAD CSV FROM '/usr/lib/memgraph/relationships.csv' WITH HEADER AS row
     MATCH (source:Node {id: row.source}), (sink:Node {id: row.sink})
     CREATE (source)-[:RELATIONSHIP]->(sink)
     """
-    memory = subprocess.run(["docker", "exec", "-it", "memgraph", "grep", "^VmHWM", "/proc/1/status"], check=True, capture_output=True, text=True)
-    megabytes_peak_RSS = round(int(memory.stdout.split()[1])/1024, 2)
-    print("Peak memory usage before processing chunks: ", megabytes_peak_RSS, " MB")
+    monitor = ImportMonitor(mgclient_storage_info(HOST, PORT)).start()
 
     time_start = time.time()
-    cursor.execute(edge_query)
-    conn.commit()
-    conn.close()
+    with profiled.step("load edges"):
+        cursor.execute(edge_query)
     time_end = time.time()
 
-    memory = subprocess.run(["docker", "exec", "-it", "memgraph", "grep", "^VmHWM", "/proc/1/status"], check=True, capture_output=True, text=True)
-    megabytes_peak_RSS = round(int(memory.stdout.split()[1])/1024, 2)
-    print("Peak memory usage after processing chunks: ", megabytes_peak_RSS, " MB")
+    monitor.stop()
+    print(monitor.summary())
     
     print("Processing finished in ", time_end - time_start, " seconds")
 
+    profiled.finish()
+    print(profiled.summary())
+    conn.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Import graph500 relationships with a single LOAD CSV.")
+    parser.add_argument("size", help="Dataset size: small, medium or large.")
+    parser.add_argument(
+        "--profile",
+        choices=tuple(PROFILES),
+        default="bulk",
+        help="Import profile (see import/import_profile.py; default: bulk)."
+             " Use the one the node import ran with.",
+    )
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python LOAD_CSV_edges.py <size>")
-        sys.exit(1)
-    else:
-        size = sys.argv[1]
-        print(f"Running with size: {size}")
-        run(size)
+    args = parse_args()
+    print(f"Running with size: {args.size}")
+    run(args.size, profile=args.profile)
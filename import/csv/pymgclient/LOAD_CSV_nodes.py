@@ -1,3 +1,4 @@
+import argparse
 import mgclient
 from time import sleep
 import time
@@ -5,10 +6,14 @@ import subprocess
 from pathlib import Path
 import sys
 
+sys.path.insert(0, str(Path(__file__).parents[2]))
+from import_monitor import ImportMonitor, mgclient_storage_info
+from import_profile import PROFILES, ProfiledImport
+
 HOST="127.0.0.1"
 PORT=7687
 
-def run(size: str):
+def run(size: str, profile: str = "bulk"):
 
 
     p = Path(__file__).parents[3].joinpath(f"datasets/graph500/{size}/nodes.csv")
@@ -25,44 +30,49 @@ def run(size: str):
     else:
         print("Connection status: %s" % conn.status)
         return
+    # Storage mode, DROP GRAPH and the :Node(id) index follow the profile
+    # (import_profile.py), not whatever mode the server was left in.
     conn.autocommit = True
     cursor = conn.cursor()
-    cursor.execute("DROP INDEX ON :Node(id)")
-    cursor.execute("MATCH (n) DETACH DELETE n")
-
-    sleep(1)
-
-    cursor.execute("CREATE INDEX ON :Node(id)")
-
-    conn.autocommit = False
+    profiled = ProfiledImport(cursor.execute, PROFILES[profile], edge_indexes=["CREATE INDEX ON :Node(id)"])
+    profiled.begin()
 
     query = """
     LOAD CSV FROM '/usr/lib/memgraph/nodes.csv' WITH HEADER AS row
     CREATE (n:Node {id: row.id})
     """
-    memory = subprocess.run(["docker", "exec", "-it", "memgraph", "grep", "^VmHWM", "/proc/1/status"], check=True, capture_output=True, text=True)
-    megabytes_peak_RSS = round(int(memory.stdout.split()[1])/1024, 2)
-    print("Peak memory usage before processing chunks: ", megabytes_peak_RSS, " MB")
+    monitor = ImportMonitor(mgclient_storage_info(HOST, PORT)).start()
     time_start = time.time()
-    cursor.execute(query)
-    conn.commit()
-    conn.close()
+    with profiled.step("load nodes"):
+        cursor.execute(query)
     time_end = time.time()
 
     print("Processing finished in ", time_end - time_start, " seconds")
           
-    memory = subprocess.run(["docker", "exec", "-it", "memgraph", "grep", "^VmHWM", "/proc/1/status"], check=True, capture_output=True, text=True)
-    megabytes_peak_RSS = round(int(memory.stdout.split()[1])/1024, 2)
-    print("Peak memory usage after processing chunks: ", megabytes_peak_RSS, " MB")
-        
+    monitor.stop()
+    print(monitor.summary())
+
+    # Build the index the edge import MATCHes on, then leave the server in
+    # the profile's final mode.
+    profiled.nodes_loaded()
+    profiled.finish()
+    print(profiled.summary())
+    conn.close()
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Import graph500 nodes with a single LOAD CSV.")
+    parser.add_argument("size", help="Dataset size: small, medium or large.")
+    parser.add_argument(
+        "--profile",
+        choices=tuple(PROFILES),
+        default="bulk",
+        help="Import profile (see import/import_profile.py; default: bulk).",
+    )
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python3 LOAD_CSV_nodes.py <size>")
-        sys.exit(1)
-    else:
-        size = sys.argv[1]
-        print(f"Running with size: {size}")
-        run(size)
+    args = parse_args()
+    print(f"Running with size: {args.size}")
+    run(args.size, profile=args.profile)
@@ -1,15 +1,22 @@
+import argparse
 import mgclient
-from time import sleep
 import time
 import subprocess
 import multiprocessing
 from pathlib import Path
 import sys
 
+sys.path.insert(0, str(Path(__file__).parents[2]))
+from import_monitor import ImportMonitor, mgclient_storage_info
+from import_profile import PROFILES, ProfiledImport
+
+HOST = "127.0.0.1"
+PORT = 7687
+
 
 def execute_csv_chunk(query):
     try: 
-        conn = mgclient.connect(host='127.0.0.1', port=7687)
+        conn = mgclient.connect(host=HOST, port=PORT)
         cursor = conn.cursor()
         cursor.execute(query)
         conn.commit()
@@ -19,7 +26,7 @@ def execute_csv_chunk(query):
         raise e
 
 
-def run(size: str):
+def run(size: str, profile: str = "bulk", managed: bool = False):
     
     target_nodes_directory = Path(__file__).parents[3].joinpath(f"datasets/graph500/{size}/csv_relationship_chunks")
     for file in target_nodes_directory.glob("*.csv"):
@@ -35,28 +42,58 @@ def run(size: str):
             CREATE (source)-[:RELATIONSHIP]->(sink)
             """)
         
+    conn = mgclient.connect(host=HOST, port=PORT)
+    # Load into the nodes the node import left, in the profile's storage
+    # mode, and make sure the :Node(id) index the edges MATCH on is there.
+    conn.autocommit = True
+    cursor = conn.cursor()
+    profiled = ProfiledImport(
+        cursor.execute,
+        PROFILES[profile],
+        edge_indexes=["CREATE INDEX ON :Node(id)"],
+        reset=False,
+        managed=managed,
+    )
+    profiled.begin()
+    profiled.nodes_loaded()
+
     print("Starting processing different csv files...")
-    memory = subprocess.run(["docker", "exec", "-it", "memgraph", "grep", "^VmHWM", "/proc/1/status"], check=True, capture_output=True, text=True)
-    megabytes_peak_RSS = round(int(memory.stdout.split()[1])/1024, 2)
-    print("Peak memory usage before processing chunks: ", megabytes_peak_RSS, " MB")
+    monitor = ImportMonitor(mgclient_storage_info(HOST, PORT)).start()
 
     start = time.time()
-    with multiprocessing.Pool(10) as pool:
+    with profiled.step("load edges"), multiprocessing.Pool(10) as pool:
         pool.starmap(execute_csv_chunk, [(q, ) for q in queries])
     end = time.time()
     print("Processing chunks finished in ", end - start, " seconds")
 
-    memory = subprocess.run(["docker", "exec", "-it", "memgraph", "grep", "^VmHWM", "/proc/1/status"], check=True, capture_output=True, text=True)
-    megabytes_peak_RSS = round(int(memory.stdout.split()[1])/1024, 2)
-    print("Peak memory usage after processing chunks: ", megabytes_peak_RSS, " MB")
-        
+    monitor.stop()
+    print(monitor.summary())
+
+    profiled.finish()
+    print(profiled.summary())
+    conn.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Import graph500 relationship chunks with concurrent LOAD CSV.")
+    parser.add_argument("size", help="Dataset size: small, medium or large.")
+    parser.add_argument(
+        "--profile",
+        choices=tuple(PROFILES),
+        default="bulk",
+        help="Import profile (see import/import_profile.py; default: bulk)."
+             " Use the one the node import ran with.",
+    )
+    parser.add_argument(
+        "--managed",
+        action="store_true",
+        help="Leave DROP GRAPH, the storage mode and the snapshot to the caller "
+             "(import_benchmark.py); only create the indexes.",
+    )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python3 concurrent_LOAD_CSV_edges.py <size>")
-        sys.exit(1)
-    else:
-        size = sys.argv[1]
-        print(f"Running with size: {size}")
-        run(size=size)
+    args = parse_args()
+    print(f"Running with size: {args.size}")
+    run(args.size, profile=args.profile, managed=args.managed)
@@ -0,0 +1,253 @@
+"""Server-side LOAD CSV import of a graph500 dataset, nodes then edges.
+
+concurrent_LOAD_CSV_nodes.py and concurrent_LOAD_CSV_edges.py load the
+fixed 10 chunks made by the dataset preprocessing, `docker cp` every chunk
+into the container and leave memory measurement to a manual before/after
+read. This script runs the whole import instead:
+
+1. Plan: read the number of Bolt worker threads from SHOW CONFIG (or the
+   container's CPU count) and cut each of nodes.csv and relationships.csv
+   into as many chunks, but never below MIN_CHUNK_MB per chunk, so a small
+   file is not spread over transactions that cost more than they load.
+2. Stage: write the chunks, each with the CSV header, straight into a host
+   directory that is bind-mounted into the container. Nothing is copied
+   through the Docker daemon.
+3. Load: follow the --profile (import_profile.py). The default bulk profile
+   drops the graph in IN_MEMORY_ANALYTICAL (concurrent LOAD CSV needs it),
+   loads the nodes, only then builds the :Node(id) index the edges MATCH
+   on, loads the edges, and switches back to IN_MEMORY_TRANSACTIONAL with a
+   snapshot. Each phase runs --parallelism concurrent LOAD CSV queries.
+4. Report: wall time, rows/s and Memgraph peak RSS for every phase, with
+   an ImportMonitor (import/import_monitor.py) sampling during each one.
+
+Start Memgraph with the staging directory mounted, e.g. from the repository
+root:
+
+    mkdir -p datasets/graph500/small/load_csv
+    docker run -p 7687:7687 --name memgraph \\
+        -v "$(pwd)/datasets/graph500/small/load_csv:/import-data" memgraph/memgraph
+
+    python3 ./import/csv/pymgclient/concurrent_LOAD_CSV_import.py small
+"""
+import argparse
+import math
+import multiprocessing
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import mgclient
+
+sys.path.insert(0, str(Path(__file__).parents[2]))
+from import_monitor import ImportMonitor, mgclient_storage_info, reset_peak_rss
+from import_profile import PROFILES, ProfiledImport
+
+HOST = "127.0.0.1"
+PORT = 7687
+CONTAINER = "memgraph"
+
+# Smallest chunk worth its own LOAD CSV transaction.
+MIN_CHUNK_MB = 8
+
+NODE_QUERY = "LOAD CSV FROM '{path}' WITH HEADER AS row CREATE (n:Node {{id: row.id}})"
+EDGE_QUERY = (
+    "LOAD CSV FROM '{path}' WITH HEADER AS row "
+    "MATCH (source:Node {{id: row.source}}), (sink:Node {{id: row.sink}}) "
+    "CREATE (source)-[:RELATIONSHIP]->(sink)"
+)
+
+# (phase, source file, query); edges need every node in place first.
+PHASES = [
+    ("nodes", "nodes.csv", NODE_QUERY),
+    ("relationships", "relationships.csv", EDGE_QUERY),
+]
+
+
+def execute_csv_chunk(query):
+    conn = mgclient.connect(host=HOST, port=PORT)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query)
+        conn.commit()
+    except Exception as e:
+        print(f"Failed to execute transaction: {e}")
+        raise e
+    finally:
+        conn.close()
+
+
+def docker_exec(*command, check=True):
+    return subprocess.run(
+        ["docker", "exec", CONTAINER, *command],
+        check=check,
+        capture_output=True,
+        text=True,
+    )
+
+
+def server_workers(cursor):
+    """Number of Bolt worker threads, i.e. how many queries Memgraph runs at
+    once. Falls back to the container's CPU count, Memgraph's default."""
+    cursor.execute("SHOW CONFIG")
+    columns = [column.name for column in cursor.description]
+    for row in cursor.fetchall():
+        setting = dict(zip(columns, row))
+        if setting.get("name") == "bolt_num_workers":
+            try:
+                return int(setting["current_value"])
+            except (TypeError, ValueError):
+                break
+    return int(docker_exec("nproc").stdout)
+
+
+def plan_chunks(file_size, workers):
+    """One chunk per server worker, unless that would make them smaller than
+    MIN_CHUNK_MB."""
+    by_size = math.ceil(file_size / (MIN_CHUNK_MB * 1024 * 1024))
+    return max(1, min(workers, by_size))
+
+
+def split_csv(source, chunks, target_directory, prefix):
+    """Split source into `chunks` files of about equal size at line
+    boundaries, repeating the header in each. The file is streamed, never
+    read whole. Returns the written files and the number of data rows."""
+    target_directory.mkdir(parents=True, exist_ok=True)
+    for old in target_directory.glob(f"{prefix}_*.csv"):
+        old.unlink()
+
+    file_size = source.stat().st_size
+    files = []
+    rows = 0
+    with open(source, "rb") as f:
+        header = f.readline()
+        data_start = f.tell()
+        boundaries = [data_start]
+        for i in range(1, chunks):
+            f.seek(data_start + (file_size - data_start) * i // chunks)
+            f.readline()
+            boundaries.append(max(f.tell(), boundaries[-1]))
+        boundaries.append(file_size)
+
+        for i, (start, end) in enumerate(zip(boundaries, boundaries[1:])):
+            if start >= end:
+                continue
+            target = target_directory / f"{prefix}_{i}.csv"
+            f.seek(start)
+            remaining = end - start
+            with open(target, "wb") as out:
+                out.write(header)
+                while remaining:
+                    block = f.read(min(remaining, 1 << 20))
+                    remaining -= len(block)
+                    rows += block.count(b"\n")
+                    out.write(block)
+            files.append(target)
+    return files, rows
+
+
+def check_mount(host_file, container_directory):
+    """LOAD CSV reads paths inside the container: make sure the staged files
+    are visible there before starting a phase."""
+    container_path = f"{container_directory}/{host_file.name}"
+    if docker_exec("test", "-r", container_path, check=False).returncode != 0:
+        print(f"{container_path} is not readable inside the '{CONTAINER}' container.")
+        print("Start Memgraph with the staging directory bind-mounted, e.g.:")
+        print(f'  docker run -p 7687:7687 --name {CONTAINER} -v "{host_file.parent}:{container_directory}" memgraph/memgraph')
+        sys.exit(1)
+
+
+def run(size, parallelism, host_directory, container_directory, profile):
+    dataset_directory = Path(__file__).parents[3].joinpath(f"datasets/graph500/{size}")
+    host_directory = (host_directory or dataset_directory / "load_csv").resolve()
+
+    conn = mgclient.connect(host=HOST, port=PORT)
+    if conn.status is not mgclient.CONN_STATUS_READY:
+        print("Connection status: %s" % conn.status)
+        return
+    print("Connected to Memgraph")
+    conn.autocommit = True
+    cursor = conn.cursor()
+    workers = server_workers(cursor)
+    parallelism = parallelism or workers
+    print(f"Memgraph runs {workers} Bolt workers, loading with parallelism {parallelism}")
+
+    staged = []
+    for phase, source_name, query in PHASES:
+        source = dataset_directory / source_name
+        chunks = plan_chunks(source.stat().st_size, workers)
+        start = time.time()
+        files, rows = split_csv(source, chunks, host_directory, phase)
+        print(f"[{phase}] Staged {rows:,} rows in {len(files)} chunks in {time.time() - start:.2f} seconds")
+        staged.append((phase, query, files, rows))
+
+    check_mount(staged[0][2][0], container_directory)
+    # Node CREATEs need no index; the edge MATCHes need :Node(id).
+    profiled = ProfiledImport(cursor.execute, PROFILES[profile], edge_indexes=["CREATE INDEX ON :Node(id)"])
+    profiled.begin()
+
+    results = []
+    with multiprocessing.Pool(parallelism) as pool:
+        for phase, query, files, rows in staged:
+            queries = [query.format(path=f"{container_directory}/{file.name}") for file in files]
+            reset = reset_peak_rss(CONTAINER)
+            start = time.time()
+            with profiled.step(f"load {phase}"), ImportMonitor(mgclient_storage_info(HOST, PORT), container=CONTAINER) as monitor:
+                pool.map(execute_csv_chunk, queries, chunksize=1)
+            seconds = time.time() - start
+            # Without the reset, VmHWM is the peak since Memgraph started;
+            # the highest sampled RSS is still this phase's.
+            peak = monitor.peak("peak_rss") if reset else monitor.peak("rss")
+            peak = round(peak / 2**20, 2) if peak is not None else "-"
+            print(f"[{phase}] Loaded {rows:,} rows in {seconds:.2f} seconds")
+            print(monitor.summary())
+            results.append((phase, len(files), rows, seconds, peak, reset))
+            if phase == "nodes":
+                profiled.nodes_loaded()
+
+    profiled.finish()
+    conn.close()
+
+    print()
+    print(f"{'phase':<14} {'chunks':>6} {'rows':>13} {'seconds':>9} {'rows/s':>11} {'peak MB':>10}")
+    for phase, chunks, rows, seconds, peak, reset in results:
+        note = "" if reset else "  (highest sampled RSS)"
+        print(f"{phase:<14} {chunks:>6} {rows:>13,} {seconds:>9.2f} {rows / seconds:>11,.0f} {peak:>10}{note}")
+    print(f"{'total':<14} {'':>6} {sum(r[2] for r in results):>13,} {sum(r[3] for r in results):>9.2f}")
+    print(profiled.summary())
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Concurrent server-side LOAD CSV import of a graph500 dataset.")
+    parser.add_argument("size", help="Dataset size: small, medium or large.")
+    parser.add_argument(
+        "--parallelism",
+        type=int,
+        default=None,
+        help="Concurrent LOAD CSV queries per phase (default: Memgraph's Bolt worker count).",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=list(PROFILES),
+        default="bulk",
+        help="Import profile (see import/import_profile.py; default: bulk). Concurrent LOAD CSV "
+             "of edges conflicts in the transactional one.",
+    )
+    parser.add_argument(
+        "--host-dir",
+        type=Path,
+        default=None,
+        help="Staging directory on the host (default: datasets/graph500/<size>/load_csv).",
+    )
+    parser.add_argument(
+        "--container-dir",
+        default="/import-data",
+        help="Where the staging directory is mounted in the container (default: /import-data).",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print(f"Running with size: {args.size}")
+    run(args.size, args.parallelism, args.host_dir, args.container_dir, args.profile)
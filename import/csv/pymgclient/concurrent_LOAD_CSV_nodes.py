@@ -1,3 +1,4 @@
+import argparse
 import mgclient
 from time import sleep
 import time
@@ -6,6 +7,10 @@ import multiprocessing
 from pathlib import Path
 import sys
 
+sys.path.insert(0, str(Path(__file__).parents[2]))
+from import_monitor import ImportMonitor, mgclient_storage_info
+from import_profile import PROFILES, ProfiledImport
+
 HOST="127.0.0.1"
 PORT=7687
 
@@ -21,7 +26,7 @@ def execute_csv_chunk(query):
         raise e
 
 
-def run(size : str):
+def run(size: str, profile: str = "bulk", managed: bool = False):
     
     target_nodes_directory = Path(__file__).parents[3].joinpath(f"datasets/graph500/{size}/csv_node_chunks")
     for file in target_nodes_directory.glob("*.csv"):
@@ -42,44 +47,60 @@ def run(size : str):
         print("Connection status: %s" % conn.status)
         return
 
-    cursor = conn.cursor()
-
+    # Storage mode, DROP GRAPH and the :Node(id) index follow the profile
+    # (import_profile.py), not whatever mode the server was left in.
     conn.autocommit = True
-    cursor.execute("DROP INDEX ON :Node(id)")
-    cursor.execute("MATCH (n) DETACH DELETE n")
-
-    sleep(1)
-
-    cursor.execute("CREATE INDEX ON :Node(id)")
-
-    conn.autocommit = False
-
-    conn.close()
+    cursor = conn.cursor()
+    profiled = ProfiledImport(
+        cursor.execute,
+        PROFILES[profile],
+        edge_indexes=["CREATE INDEX ON :Node(id)"],
+        managed=managed,
+    )
+    profiled.begin()
 
 
     print("Starting processing different csv files...")
 
-    memory = subprocess.run(["docker", "exec", "-it", "memgraph", "grep", "^VmHWM", "/proc/1/status"], check=True, capture_output=True, text=True)
-    megabytes_peak_RSS = round(int(memory.stdout.split()[1])/1024, 2)
-    print("Peak memory usage before processing chunks: ", megabytes_peak_RSS, " MB")
+    monitor = ImportMonitor(mgclient_storage_info(HOST, PORT)).start()
 
     start = time.time()
-    with multiprocessing.Pool(10) as pool: 
+    with profiled.step("load nodes"), multiprocessing.Pool(10) as pool:
         pool.starmap(execute_csv_chunk, [(q, ) for q in queries])
     end = time.time()
     print("Processing chunks finished in (wall time) ", end - start, " seconds")
 
 
-    memory = subprocess.run(["docker", "exec", "-it", "memgraph", "grep", "^VmHWM", "/proc/1/status"], check=True, capture_output=True, text=True)
-    megabytes_peak_RSS = round(int(memory.stdout.split()[1])/1024, 2)
-    print("Peak memory usage after processing chunks: ", megabytes_peak_RSS, " MB")
+    monitor.stop()
+    print(monitor.summary())
+
+    # Build the index the edge import MATCHes on, then leave the server in
+    # the profile's final mode.
+    profiled.nodes_loaded()
+    profiled.finish()
+    print(profiled.summary())
+    conn.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Import graph500 node chunks with concurrent LOAD CSV.")
+    parser.add_argument("size", help="Dataset size: small, medium or large.")
+    parser.add_argument(
+        "--profile",
+        choices=tuple(PROFILES),
+        default="bulk",
+        help="Import profile (see import/import_profile.py; default: bulk).",
+    )
+    parser.add_argument(
+        "--managed",
+        action="store_true",
+        help="Leave DROP GRAPH, the storage mode and the snapshot to the caller "
+             "(import_benchmark.py); only create the indexes.",
+    )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python concurrent_LOAD_CSV_nodes.py <size>")
-        sys.exit(1) 
-    else:
-        size = sys.argv[1]
-        print(f"Running with size: {size}")
-        run(size=size)
+    args = parse_args()
+    print(f"Running with size: {args.size}")
+    run(args.size, profile=args.profile, managed=args.managed)
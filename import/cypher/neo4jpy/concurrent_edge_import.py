@@ -1,45 +1,84 @@
+import argparse
 import multiprocessing
-from time import sleep
-import subprocess
+from itertools import islice
 import time
 from pathlib import Path
 from neo4j import GraphDatabase
-from neo4j.exceptions import TransientError
-import random
+from neo4j.exceptions import ServiceUnavailable, SessionExpired
 import sys
 
+sys.path.insert(0, str(Path(__file__).parents[2]))
+from adaptive_batching import AdaptiveBatchSize, sized_chunks
+from retry_scheduler import RetryScheduler
+from import_monitor import ImportMonitor, neo4j_storage_info
+from import_profile import PROFILES, TRANSACTIONAL, ProfiledImport
+
 HOST_PORT = "bolt://localhost:7687"
+WORKERS = 10
+
+# One driver per worker process, created by the pool initializer and reused
+# for every chunk the worker processes. Its connection pool replaces broken
+# connections on the next session, so a lost connection only costs a retry.
+driver = None
+
+def init_worker():
+    global driver
+    driver = GraphDatabase.driver(HOST_PORT, auth=("", ""))
+
+def connect_cost(samples=5):
+    # Average time to create a driver and open its first connection, i.e.
+    # what every chunk would pay without per-worker drivers.
+    start = time.time()
+    for _ in range(samples):
+        with GraphDatabase.driver(HOST_PORT, auth=("", "")) as sample:
+            sample.verify_connectivity()
+    return (time.time() - start) / samples
 
 #Option 1
 def process_chunk_managed_API(query, create_list):
-    driver = GraphDatabase.driver(HOST_PORT, auth=("", ""))
     with driver.session(max_transaction_retry_time=180.0, initial_retry_delay=0.2, retry_delay_multiplier=1.1, retry_delay_jitter_factor=0.1) as session:
         session.execute_write(lambda tx: tx.run(query, {"batch": create_list}))
-    driver.close()
 
 #Option 2
-def process_chunk(query, create_list, max_retries=100, initial_wait_time=0.200, backoff_factor=1.1, jitter=0.1):
-    session = GraphDatabase.driver(HOST_PORT, auth=("", "")).session()
-    for attempt in range(max_retries):
+def process_chunk(query, create_list):
+    # One attempt per call: conflicting chunks (TransientError) are requeued
+    # by the RetryScheduler in the main process instead of sleeping here. A
+    # second attempt only happens when the first one lost the connection.
+    for attempt in range(2):
         try:
-            with session.begin_transaction() as tx:
-                tx.run(query, {"batch": create_list})
-                tx.commit()
-                break
-        except TransientError as te:
-            jitter = random.uniform(0, jitter) * initial_wait_time 
-            wait_time = initial_wait_time * (backoff_factor ** attempt) + jitter
-            print(f"Commit failed on attempt {attempt+1}. Retrying in {wait_time} seconds...")
-            time.sleep(wait_time)
-        except Exception as e:
-            print(f"Failed to execute transaction: {e}")
-            session.close()
+            with driver.session() as session:
+                with session.begin_transaction() as tx:
+                    tx.run(query, {"batch": create_list})
+                    tx.commit()
+            return 0
+        except (ServiceUnavailable, SessionExpired) as e:
+            if attempt == 0:
+                print("Connection lost - reconnecting ...")
+                continue
             raise e
 
-def run(size: str):
+def read_edges(file_path):
+    with open(file_path, "r") as file:
+        for line in file:
+            if line.strip():
+                node_sink, node_source = line.split()
+                yield {"a": int(node_source), "b": int(node_sink)}
+
+def read_chunks(file_path, chunk_size):
+    edges = read_edges(file_path)
+    while chunk := list(islice(edges, chunk_size)):
+        yield chunk
+
+def run(size: str, adaptive: bool = False, profile: str = "bulk", managed: bool = False):
     
     FILE_PATH = ""
     CHUNK_SIZE = 50000
+    # With --adaptive, CHUNK_SIZE is only the starting point.
+    TARGET_LATENCY = 0.5
+    # Chunks parsed but not yet written; bounds client memory.
+    IN_FLIGHT = 20
+    # Split a chunk in half every SPLIT_AFTER conflicts (None to never split).
+    SPLIT_AFTER = 5
     
     p = Path(__file__).parents[3].joinpath(f"datasets/graph500/{size}")
     for file in Path(p).iterdir():
@@ -54,47 +93,79 @@ def run(size: str):
     MATCH (a:Node {id: node.a}), (b:Node {id: node.b}) CREATE (a)-[:RELATIONSHIP]->(b)
     """
 
+    # Load into the nodes concurrent_node_import.py left, in the profile's
+    # storage mode, and make sure the :Node(id) index the edges MATCH on is
+    # there.
+    driver = GraphDatabase.driver(HOST_PORT, auth=("", ""))
+    session = driver.session()
+    profiled = ProfiledImport(
+        lambda query: session.run(query).consume(),
+        PROFILES[profile],
+        edge_indexes=["CREATE INDEX ON :Node(id)"],
+        reset=False,
+        managed=managed,
+    )
+    profiled.begin()
+    profiled.nodes_loaded()
 
-    chunks = []
-    with open(FILE_PATH, "r") as file:
-        create_relationships = []
-        chunks = []
-        while True:
-            line = file.readline()
-            if not line:
-                if len(create_relationships) > 0:
-                    chunks.append(create_relationships)
-                    print("Adding last chunk ...", len(create_relationships))
-                    break
-            else:
-                node_sink, node_source = line.strip().split()  
-                create_relationships.append({"a": int(node_source), "b": int(node_sink)})
-                if len(create_relationships) == CHUNK_SIZE:
-                    print("Chunk size reached - adding to chunks ...", len(create_relationships))
-                    chunks.append(create_relationships)
-                    create_relationships = []
-
-
-    memory = subprocess.run(["docker", "exec", "-it", "memgraph", "grep", "^VmHWM", "/proc/1/status"], check=True, capture_output=True, text=True)
-    megabytes_peak_RSS = round(int(memory.stdout.split()[1])/1024, 2)
-    print("Peak memory usage before processing chunks: ", megabytes_peak_RSS, " MB")
+    monitor = ImportMonitor(neo4j_storage_info(HOST_PORT)).start()
 
     print("Starting processing chunks...")
+    seconds_per_connect = connect_cost()
     start = time.time()
-    with multiprocessing.Pool(10) as pool:
-        pool.starmap(process_chunk, [(query, chunk) for chunk in chunks])
+    # The file is parsed while the pool writes: the scheduler reads at most
+    # IN_FLIGHT chunks ahead, instead of the whole edge list.
+    with profiled.step("load edges"), multiprocessing.Pool(WORKERS, initializer=init_worker) as pool:
+        if adaptive:
+            batcher = AdaptiveBatchSize(
+                initial=CHUNK_SIZE,
+                target_latency=TARGET_LATENCY,
+                split_on_memory_limit=PROFILES[profile].load_mode == TRANSACTIONAL,
+            )
+            chunks = sized_chunks(read_edges(FILE_PATH), batcher)
+        else:
+            batcher = None
+            chunks = read_chunks(FILE_PATH, CHUNK_SIZE)
+        scheduler = RetryScheduler(pool, process_chunk, query, in_flight=IN_FLIGHT, split_after=SPLIT_AFTER, batcher=batcher)
+        stats = scheduler.run(chunks)
     end = time.time()
     print("Processing chunks finished in ", end - start, " seconds")
+    print("Retries:", stats.summary())
+    saved = max(stats.attempts - WORKERS, 0) * seconds_per_connect
+    print(f"Reused {WORKERS} connections for {stats.attempts} chunk attempts: saved ~{saved:.2f} s of connection setup "
+          f"({seconds_per_connect * 1000:.1f} ms per connect, ~{saved / WORKERS:.2f} s wall time over {WORKERS} workers)")
+    if adaptive:
+        print(batcher.summary())
+
+    monitor.stop()
+    print(monitor.summary())
+
+    profiled.finish()
+    print(profiled.summary())
+    session.close()
+    driver.close()
+
 
-    memory = subprocess.run(["docker", "exec", "-it", "memgraph", "grep", "^VmHWM", "/proc/1/status"], check=True, capture_output=True, text=True)
-    megabytes_peak_RSS = round(int(memory.stdout.split()[1])/1024, 2)
-    print("Peak memory usage after processing chunks: ", megabytes_peak_RSS, " MB")
+def parse_args():
+    parser = argparse.ArgumentParser(description="Import graph500 edges with concurrent UNWIND chunks.")
+    parser.add_argument("size", help="Dataset size: small, medium or large.")
+    parser.add_argument("--adaptive", action="store_true", help="Adapt the chunk size to the commit latency.")
+    parser.add_argument(
+        "--profile",
+        choices=tuple(PROFILES),
+        default="bulk",
+        help="Import profile (see import/import_profile.py; default: bulk). Use the one "
+             "concurrent_node_import.py ran with.",
+    )
+    parser.add_argument(
+        "--managed",
+        action="store_true",
+        help="Leave DROP GRAPH, the storage mode and the snapshot to the caller "
+             "(import_benchmark.py); only create the indexes.",
+    )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python concurrent_edge_import.py <size>")
-        sys.exit(1)
-    else: 
-        run(sys.argv[1])
-        sys.exit(0)
+    args = parse_args()
+    run(args.size, adaptive=args.adaptive, profile=args.profile, managed=args.managed)
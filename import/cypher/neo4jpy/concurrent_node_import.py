@@ -1,26 +1,59 @@
+import argparse
 import multiprocessing
 import time
-import subprocess
-from time import sleep
 from pathlib import Path
 from neo4j import GraphDatabase
+from neo4j.exceptions import ServiceUnavailable, SessionExpired
 import sys
 
+sys.path.insert(0, str(Path(__file__).parents[2]))
+from adaptive_batching import AdaptiveBatchSize, run_adaptive
+from import_monitor import ImportMonitor, neo4j_storage_info
+from import_profile import PROFILES, TRANSACTIONAL, ProfiledImport
+
 HOST_PORT = "bolt://localhost:7687"
+WORKERS = 10
+
+# One driver per worker process, created by the pool initializer and reused
+# for every chunk the worker processes. Its connection pool replaces broken
+# connections on the next session, so a lost connection only costs a retry.
+driver = None
+
+def init_worker():
+    global driver
+    driver = GraphDatabase.driver(HOST_PORT, auth=("", ""))
+
+def connect_cost(samples=5):
+    # Average time to create a driver and open its first connection, i.e.
+    # what every chunk would pay without per-worker drivers.
+    start = time.time()
+    for _ in range(samples):
+        with GraphDatabase.driver(HOST_PORT, auth=("", "")) as sample:
+            sample.verify_connectivity()
+    return (time.time() - start) / samples
 
 def process_chunk(query, create_list):
-    try: 
-        driver = GraphDatabase.driver(HOST_PORT, auth=("", ""))
-        with driver.session() as session:
-            session.run(query, {"batch": create_list})
-        driver.close()
-    except Exception as e:
-        print("Failed to execute chunk: ", e)
-        raise e
+    # A second attempt only happens when the first one lost the connection.
+    for attempt in range(2):
+        try: 
+            with driver.session() as session:
+                session.run(query, {"batch": create_list})
+            return 0
+        except (ServiceUnavailable, SessionExpired) as e:
+            if attempt == 0:
+                print("Connection lost - reconnecting ...")
+                continue
+            print("Failed to execute chunk: ", e)
+            raise e
+        except Exception as e:
+            print("Failed to execute chunk: ", e)
+            raise e
 
-def run(size: str):
+def run(size: str, adaptive: bool = False, profile: str = "bulk", managed: bool = False):
 
     CHUNK_SIZE = 10000
+    # With --adaptive, CHUNK_SIZE is only the starting point.
+    TARGET_LATENCY = 0.5
     FILE_PATH = ""
 
     p = Path(__file__).parents[3].joinpath(f"datasets/graph500/{size}")
@@ -29,15 +62,17 @@ def run(size: str):
             FILE_PATH = str(file)
             break
 
+    # Storage mode, DROP GRAPH and the :Node(id) index follow the profile
+    # (import_profile.py), not whatever mode the server was left in.
     driver = GraphDatabase.driver(HOST_PORT, auth=("", ""))
-
-    with driver.session() as session:
-        session.run("DROP INDEX ON :Node(id)")
-        session.run("MATCH (n) DETACH DELETE n")
-        sleep(1)
-        session.run("CREATE INDEX ON :Node(id)")
-
-    driver.close()
+    session = driver.session()
+    profiled = ProfiledImport(
+        lambda query: session.run(query).consume(),
+        PROFILES[profile],
+        edge_indexes=["CREATE INDEX ON :Node(id)"],
+        managed=managed,
+    )
+    profiled.begin()
 
     query = """
     WITH $batch AS nodes
@@ -64,26 +99,63 @@ def run(size: str):
                     chunks.append(create_nodes)
                     create_nodes = []
             
-        res = subprocess.run(["docker", "exec", "-it", "memgraph", "grep", "^VmHWM", "/proc/1/status"], check=True, capture_output=True, text=True)
-        megabytes_peak_RSS = round(int(res.stdout.split()[1])/1024, 2)
-        print("Peak memory usage before processing chunks: ", megabytes_peak_RSS, " MB")
+        monitor = ImportMonitor(neo4j_storage_info(HOST_PORT)).start()
 
         print("Starting processing chunks...")
+        seconds_per_connect = connect_cost()
+        done = len(chunks)
         start = time.time()
-        with multiprocessing.Pool(10) as pool:
-            pool.starmap(process_chunk, [(query, chunk) for chunk in chunks])
+        with profiled.step("load nodes"), multiprocessing.Pool(WORKERS, initializer=init_worker) as pool:
+            if adaptive:
+                batcher = AdaptiveBatchSize(
+                    initial=CHUNK_SIZE,
+                    target_latency=TARGET_LATENCY,
+                    split_on_memory_limit=PROFILES[profile].load_mode == TRANSACTIONAL,
+                )
+                rows = [row for chunk in chunks for row in chunk]
+                done = run_adaptive(pool, process_chunk, query, rows, batcher, in_flight=20)
+            else:
+                pool.starmap(process_chunk, [(query, chunk) for chunk in chunks])
         end = time.time()
         print("Processing chunks finished in (wall time) ", end - start, " seconds")
+        saved = max(done - WORKERS, 0) * seconds_per_connect
+        print(f"Reused {WORKERS} connections for {done} chunks: saved ~{saved:.2f} s of connection setup "
+              f"({seconds_per_connect * 1000:.1f} ms per connect, ~{saved / WORKERS:.2f} s wall time over {WORKERS} workers)")
+        if adaptive:
+            print(batcher.summary())
         
-        res = subprocess.run(["docker", "exec", "-it", "memgraph", "grep", "^VmHWM", "/proc/1/status"], check=True, capture_output=True, text=True)
-        megabytes_peak_RSS = round(int(res.stdout.split()[1])/1024, 2)
-        print("Peak memory usage after processing chunks: ", megabytes_peak_RSS, " MB")
+        monitor.stop()
+        print(monitor.summary())
+
+    # Build the index the edge import MATCHes on, then leave the server in
+    # the profile's final mode.
+    profiled.nodes_loaded()
+    profiled.finish()
+    print(profiled.summary())
+    session.close()
+    driver.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Import graph500 nodes with concurrent UNWIND chunks.")
+    parser.add_argument("size", help="Dataset size: small, medium or large.")
+    parser.add_argument("--adaptive", action="store_true", help="Adapt the chunk size to the commit latency.")
+    parser.add_argument(
+        "--profile",
+        choices=tuple(PROFILES),
+        default="bulk",
+        help="Import profile (see import/import_profile.py; default: bulk).",
+    )
+    parser.add_argument(
+        "--managed",
+        action="store_true",
+        help="Leave DROP GRAPH, the storage mode and the snapshot to the caller "
+             "(import_benchmark.py); only create the indexes.",
+    )
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python concurrent_node_import.py <size>")
-        sys.exit(1)
-    else:
-        size = sys.argv[1]
-        print(f"Running with size: {size}")
-        run(size=size)
+    args = parse_args()
+    print(f"Running with size: {args.size}")
+    run(size=args.size, adaptive=args.adaptive, profile=args.profile, managed=args.managed)
@@ -1,29 +1,67 @@
+import argparse
 import multiprocessing
 import mgclient
 import time
 import sys
 from time import sleep
 from pathlib import Path
-import subprocess
+
+sys.path.insert(0, str(Path(__file__).parents[2]))
+from adaptive_batching import AdaptiveBatchSize, run_adaptive
+from import_monitor import ImportMonitor, mgclient_storage_info
+from import_profile import PROFILES, TRANSACTIONAL, ProfiledImport
 
 HOST="127.0.0.1"
 PORT=7687
+WORKERS = 10
 
-def process_chunk(query, create_list):
-    try: 
+# One connection per worker process, opened by the pool initializer and
+# reused for every chunk the worker processes.
+conn = None
+
+def init_worker():
+    global conn
+    conn = mgclient.connect(host=HOST, port=PORT)
+
+def connection():
+    # Reopen the worker's connection if the server dropped it.
+    global conn
+    if conn is None or conn.status in (mgclient.CONN_STATUS_BAD, mgclient.CONN_STATUS_CLOSED):
+        print("Connection lost - reconnecting ...")
         conn = mgclient.connect(host=HOST, port=PORT)
-        cursor = conn.cursor()
-        cursor.execute(query, {"batch": create_list})
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        print("Failed to execute chunk: ", e)
-        raise e
+    return conn
 
+def connect_cost(samples=5):
+    # Average time to open and close a connection, i.e. what every chunk
+    # would pay without per-worker connections.
+    start = time.time()
+    for _ in range(samples):
+        mgclient.connect(host=HOST, port=PORT).close()
+    return (time.time() - start) / samples
 
-def run(size: str):
+def process_chunk(query, create_list):
+    # A second attempt only happens when the first one lost the connection.
+    for attempt in range(2):
+        conn = connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query, {"batch": create_list})
+            conn.commit()
+            return 0
+        except Exception as e:
+            if attempt == 0 and conn.status == mgclient.CONN_STATUS_BAD:
+                continue
+            if conn.status == mgclient.CONN_STATUS_IN_TRANSACTION:
+                conn.rollback()
+            print("Failed to execute chunk: ", e)
+            raise e
+
+
+def run(size: str, adaptive: bool = False, profile: str = "bulk", managed: bool = False):
 
     CHUNK_SIZE = 10000
+    # With --adaptive, CHUNK_SIZE is only the starting point.
+    TARGET_LATENCY = 0.5
     FILE_PATH = ""
 
     p = Path(__file__).parents[3].joinpath(f"datasets/graph500/{size}")
@@ -40,17 +78,18 @@ def run(size: str):
     else:
         print("Connection status: %s" % conn.status)
         return
-    cursor = conn.cursor()
-
-    
     conn.autocommit = True
-    cursor.execute("DROP INDEX ON :Node(id)")
-    cursor.execute("MATCH (n) DETACH DELETE n")
-
-    sleep(1)
+    cursor = conn.cursor()
 
-    cursor.execute("CREATE INDEX ON :Node(id)")
-    conn.autocommit = False
+    # Storage mode, DROP GRAPH and the :Node(id) index follow the profile
+    # (import_profile.py), not whatever mode the server was left in.
+    profiled = ProfiledImport(
+        cursor.execute,
+        PROFILES[profile],
+        edge_indexes=["CREATE INDEX ON :Node(id)"],
+        managed=managed,
+    )
+    profiled.begin()
 
     query = """
     WITH $batch AS nodes
@@ -77,28 +116,62 @@ def run(size: str):
                     chunks.append(create_nodes)
                     create_nodes = []
 
-    memory = subprocess.run(["docker", "exec", "-it", "memgraph", "grep", "^VmHWM", "/proc/1/status"], check=True, capture_output=True, text=True)
-    megabytes_peak_RSS = round(int(memory.stdout.split()[1])/1024, 2)
-    print("Peak memory usage before processing chunks: ", megabytes_peak_RSS, " MB")
+    monitor = ImportMonitor(mgclient_storage_info(HOST, PORT)).start()
 
 
     print("Starting processing chunks...")
+    seconds_per_connect = connect_cost()
+    done = len(chunks)
     start = time.time()
-    with multiprocessing.Pool(10) as pool:
-        pool.starmap(process_chunk, [(query, chunk) for chunk in chunks])
+    with profiled.step("load nodes"), multiprocessing.Pool(WORKERS, initializer=init_worker) as pool:
+        if adaptive:
+            batcher = AdaptiveBatchSize(
+                initial=CHUNK_SIZE,
+                target_latency=TARGET_LATENCY,
+                split_on_memory_limit=PROFILES[profile].load_mode == TRANSACTIONAL,
+            )
+            rows = [row for chunk in chunks for row in chunk]
+            done = run_adaptive(pool, process_chunk, query, rows, batcher, in_flight=20)
+        else:
+            pool.starmap(process_chunk, [(query, chunk) for chunk in chunks])
     end = time.time()
     print("Processing chunks finished in ", end - start, " seconds")
-
-    memory = subprocess.run(["docker", "exec", "-it", "memgraph", "grep", "^VmHWM", "/proc/1/status"], check=True, capture_output=True, text=True)
-    megabytes_peak_RSS = round(int(memory.stdout.split()[1])/1024, 2)
-    print("Peak memory usage after processing chunks: ", megabytes_peak_RSS, " MB")
+    saved = max(done - WORKERS, 0) * seconds_per_connect
+    print(f"Reused {WORKERS} connections for {done} chunks: saved ~{saved:.2f} s of connection setup "
+          f"({seconds_per_connect * 1000:.1f} ms per connect, ~{saved / WORKERS:.2f} s wall time over {WORKERS} workers)")
+    if adaptive:
+        print(batcher.summary())
+
+    monitor.stop()
+    print(monitor.summary())
+
+    # Build the index the edge import MATCHes on, then leave the server in
+    # the profile's final mode.
+    profiled.nodes_loaded()
+    profiled.finish()
+    print(profiled.summary())
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Import graph500 nodes with concurrent UNWIND chunks.")
+    parser.add_argument("size", help="Dataset size: small, medium or large.")
+    parser.add_argument("--adaptive", action="store_true", help="Adapt the chunk size to the commit latency.")
+    parser.add_argument(
+        "--profile",
+        choices=tuple(PROFILES),
+        default="bulk",
+        help="Import profile (see import/import_profile.py; default: bulk).",
+    )
+    parser.add_argument(
+        "--managed",
+        action="store_true",
+        help="Leave DROP GRAPH, the storage mode and the snapshot to the caller "
+             "(import_benchmark.py); only create the indexes.",
+    )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python concurrent_node_import.py <size>")
-        sys.exit(1)
-    else:
-        size = sys.argv[1]
-        print(f"Running with size: {size}")
-        run(size=size)
+    args = parse_args()
+    print(f"Running with size: {args.size}")
+    run(size=args.size, adaptive=args.adaptive, profile=args.profile, managed=args.managed)
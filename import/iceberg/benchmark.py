@@ -0,0 +1,261 @@
+"""Sweep iceberg_to_memgraph.py over a parameter grid and collect results.
+
+Every cell of the grid (--sources x --workers x --batch-sizes x
+--user-writes) runs --repeats times. Each run is a fresh
+iceberg_to_memgraph.py process started with --metrics-json, so client
+memory is measured per run and nothing is scraped from stdout.
+
+Per run we record users and transactions rows/s separately, p50/p95 batch
+latency, conflict retries, client peak RSS and Memgraph's SHOW STORAGE INFO
+memory after the load. Everything is written to <out>.json (full metrics)
+and <out>.csv (one flat row per run), tagged with the Memgraph version so
+results from different releases can be diffed directly. Both files are
+updated after every run, and a run that fails is recorded as failed
+instead of ending the sweep.
+
+The default sources are the Iceberg-backed ones; parquet and arrow read
+the files written by generate_iceberg.py --export-files, so export those
+first and then pass them to --sources.
+
+Any argument this script doesn't know is passed through to every run:
+
+    python benchmark.py --workers 1 8 --batch-sizes 10000 50000 --stream
+"""
+import argparse
+import csv
+import json
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from itertools import product
+from pathlib import Path
+
+from gqlalchemy import Memgraph
+
+from iceberg_to_memgraph import USER_QUERIES, _parse_uri
+from loaders import available_sources
+
+SCRIPT = Path(__file__).resolve().parent / "iceberg_to_memgraph.py"
+
+# Sources that read the Iceberg tables directly; the file-based ones need
+# a generate_iceberg.py --export-files run first.
+ICEBERG_SOURCES = ["duckdb", "pyiceberg"]
+
+FIELDS = [
+    "memgraph_version", "source", "workers", "batch_size", "user_write", "repeat",
+    "status", "elapsed_s", "users_rows_per_s", "tx_rows_per_s",
+    "users_p50_batch_ms", "users_p95_batch_ms", "tx_p50_batch_ms", "tx_p95_batch_ms",
+    "retries", "client_peak_rss_mb", "memgraph_memory_res_mb",
+    "memgraph_peak_memory_res_mb", "memgraph_memory_tracked_mb",
+]
+
+_UNITS = {"B": 1 / 1024**2, "KiB": 1 / 1024, "MiB": 1, "GiB": 1024, "TiB": 1024**2}
+
+
+def _mib(value: str | None) -> float | None:
+    """Parse a SHOW STORAGE INFO size such as "1.23GiB" into MiB."""
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]iB|B)\s*", value or "")
+    if not match:
+        return None
+    return round(float(match.group(1)) * _UNITS[match.group(2)], 1)
+
+
+def memgraph_version(uri: str) -> str:
+    host, port = _parse_uri(uri)
+    rows = list(Memgraph(host=host, port=port).execute_and_fetch("SHOW VERSION"))
+    return rows[0]["version"] if rows else "unknown"
+
+
+def run_once(cell: dict, uri: str, extra: list[str]) -> dict:
+    """Run iceberg_to_memgraph.py for one grid cell and return its metrics."""
+    with tempfile.NamedTemporaryFile(suffix=".json") as out:
+        cmd = [
+            sys.executable,
+            str(SCRIPT),
+            "--source", cell["source"],
+            "--workers", str(cell["workers"]),
+            "--batch-size", str(cell["batch_size"]),
+            "--user-write", cell["user_write"],
+            "--uri", uri,
+            "--metrics-json", out.name,
+            *extra,
+        ]
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+        return json.loads(Path(out.name).read_text())
+
+
+def flatten(cell: dict, repeat: int, version: str, metrics: dict) -> dict:
+    users, tx = metrics["phases"]["users"], metrics["phases"]["tx"]
+    info = metrics["storage_info"]
+    return {
+        "memgraph_version": version,
+        **cell,
+        "repeat": repeat,
+        "status": "ok",
+        "elapsed_s": metrics["elapsed_s"],
+        "users_rows_per_s": users["rows_per_s"],
+        "tx_rows_per_s": tx["rows_per_s"],
+        "users_p50_batch_ms": users["p50_batch_ms"],
+        "users_p95_batch_ms": users["p95_batch_ms"],
+        "tx_p50_batch_ms": tx["p50_batch_ms"],
+        "tx_p95_batch_ms": tx["p95_batch_ms"],
+        "retries": users["retries"] + tx["retries"],
+        "client_peak_rss_mb": metrics["client_peak_rss_mb"],
+        "memgraph_memory_res_mb": _mib(info.get("memory_res")),
+        "memgraph_peak_memory_res_mb": _mib(info.get("peak_memory_res")),
+        "memgraph_memory_tracked_mb": _mib(info.get("memory_tracked")),
+    }
+
+
+def print_summary(rows: list[dict], cells: list[dict]) -> None:
+    """Median over repeats for every cell."""
+    header = (
+        f"{'source':<10} {'workers':>7} {'batch':>7} {'write':>6} "
+        f"{'elapsed s':>9} {'users/s':>9} {'tx/s':>9} {'tx p95 ms':>9} "
+        f"{'client MB':>9} {'memgraph MB':>11}"
+    )
+    print("\n" + header)
+    print("-" * len(header))
+    for cell in cells:
+        runs = [
+            r for r in rows
+            if r["status"] == "ok" and all(r[k] == v for k, v in cell.items())
+        ]
+        failed = sum(
+            r["status"] != "ok" and all(r[k] == v for k, v in cell.items())
+            for r in rows
+        )
+        if not runs:
+            if failed:
+                print(
+                    f"{cell['source']:<10} {cell['workers']:>7} {cell['batch_size']:>7} "
+                    f"{cell['user_write']:>6} {'failed':>9}"
+                )
+            continue
+
+        def med(key: str) -> float:
+            values = [r[key] for r in runs if r[key] is not None]
+            return statistics.median(values) if values else float("nan")
+
+        print(
+            f"{cell['source']:<10} {cell['workers']:>7} {cell['batch_size']:>7} "
+            f"{cell['user_write']:>6} {med('elapsed_s'):>9.2f} "
+            f"{med('users_rows_per_s'):>9,.0f} {med('tx_rows_per_s'):>9,.0f} "
+            f"{med('tx_p95_batch_ms'):>9.1f} {med('client_peak_rss_mb'):>9.0f} "
+            f"{med('memgraph_memory_res_mb'):>11.0f}"
+            + (f"  ({failed} failed)" if failed else "")
+        )
+
+
+def parse_args() -> tuple[argparse.Namespace, list[str]]:
+    parser = argparse.ArgumentParser(
+        description="Benchmark iceberg_to_memgraph.py over a parameter grid. "
+                    "Unknown arguments are passed through to every run."
+    )
+    parser.add_argument(
+        "--sources",
+        nargs="+",
+        choices=available_sources(),
+        default=ICEBERG_SOURCES,
+        help="Source backends to compare (default: duckdb pyiceberg; "
+             "parquet and arrow need files from "
+             "generate_iceberg.py --export-files first).",
+    )
+    parser.add_argument(
+        "--workers",
+        nargs="+",
+        type=int,
+        default=[1, 4, 8],
+        help="Writer process counts (default: 1 4 8).",
+    )
+    parser.add_argument(
+        "--batch-sizes",
+        nargs="+",
+        type=int,
+        default=[10_000],
+        help="UNWIND batch sizes (default: 10000).",
+    )
+    parser.add_argument(
+        "--user-writes",
+        nargs="+",
+        choices=tuple(USER_QUERIES),
+        default=["create"],
+        help="User write modes (default: create).",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Runs per grid cell (default: 3).",
+    )
+    parser.add_argument(
+        "--uri",
+        default="bolt://localhost:7687",
+        help="Memgraph Bolt URI (default: bolt://localhost:7687).",
+    )
+    parser.add_argument(
+        "--out",
+        default="benchmark_results",
+        help="Output path prefix; writes <out>.csv and <out>.json "
+             "(default: benchmark_results).",
+    )
+    return parser.parse_known_args()
+
+
+def main() -> None:
+    args, extra = parse_args()
+    version = memgraph_version(args.uri)
+    cells = [
+        {"source": s, "workers": w, "batch_size": b, "user_write": u}
+        for s, w, b, u in product(
+            args.sources, args.workers, args.batch_sizes, args.user_writes
+        )
+    ]
+    print(
+        f"Memgraph {version}: {len(cells)} cells x {args.repeats} repeats"
+        + (f", extra args: {' '.join(extra)}" if extra else "")
+    )
+
+    rows: list[dict] = []
+    raw: list[dict] = []
+    failures = 0
+    with open(f"{args.out}.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for cell, repeat in product(cells, range(1, args.repeats + 1)):
+            tag = (
+                f"[{cell['source']}, workers={cell['workers']}, batch={cell['batch_size']}, "
+                f"user-write={cell['user_write']}] run {repeat}/{args.repeats}"
+            )
+            try:
+                metrics = run_once(cell, args.uri, extra)
+            except subprocess.CalledProcessError as e:
+                failures += 1
+                row = {"memgraph_version": version, **cell, "repeat": repeat, "status": "failed"}
+                raw.append({"memgraph_version": version, "repeat": repeat, **cell,
+                            "status": "failed", "returncode": e.returncode})
+                print(f"{tag}: failed with exit code {e.returncode}")
+            else:
+                row = flatten(cell, repeat, version, metrics)
+                raw.append({"memgraph_version": version, "repeat": repeat, **metrics})
+                print(
+                    f"{tag}: {row['elapsed_s']:.2f}s, users {row['users_rows_per_s']:,} rows/s, "
+                    f"tx {row['tx_rows_per_s']:,} rows/s"
+                )
+            rows.append(row)
+            # Written as we go, so an interrupted sweep keeps its finished runs.
+            writer.writerow(row)
+            f.flush()
+            with open(f"{args.out}.json", "w") as out:
+                json.dump({"extra_args": extra, "runs": raw}, out, indent=2)
+
+    print_summary(rows, cells)
+    if failures:
+        print(f"\n{failures} of {len(rows)} runs failed")
+    print(f"\nResults: {args.out}.csv, {args.out}.json")
+
+
+if __name__ == "__main__":
+    main()
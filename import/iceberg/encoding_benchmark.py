@@ -0,0 +1,180 @@
+"""Compare the two Bolt parameter encodings on one batch of each table.
+
+    rows     $rows = [{user_id: 1, name: "...", ...}, ...]   (list of maps)
+    columns  $cols = {user_id: [1, ...], name: ["...", ...]}  (map of lists)
+
+For the first --batch-size rows of users and transactions this prints, per
+encoding:
+
+    payload   PackStream size of the parameter, i.e. the bytes the Bolt RUN
+              message carries. Row maps repeat every key string per row.
+    build     client CPU to turn the Arrow batch into the parameter.
+    send      client CPU to pack and send it (only with --uri): the
+              parameter is attached to a trivial query so Memgraph does no
+              real work and the client side of the round trip is isolated.
+
+CPU times are time.process_time(), median over --repeats.
+
+    python encoding_benchmark.py --source pyiceberg --batch-size 10000
+    python encoding_benchmark.py --uri bolt://localhost:7687
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime
+from typing import Callable
+
+import pyarrow as pa
+from gqlalchemy import Memgraph
+
+from iceberg_to_memgraph import _parse_uri, batch_to_columns, batch_to_rows
+from loaders import available_sources, get_loader
+
+ENCODERS: dict[str, tuple[str, Callable[[pa.RecordBatch], object]]] = {
+    "rows": ("rows", batch_to_rows),
+    "columns": ("cols", batch_to_columns),
+}
+
+# Memgraph has to receive and decode the parameter, but does nothing with it.
+SEND_QUERY = "RETURN 0 AS n"
+
+
+def _header(size: int) -> int:
+    """PackStream marker + length bytes for a string, list or map."""
+    if size < 16:
+        return 1
+    if size < 2**8:
+        return 2
+    if size < 2**16:
+        return 3
+    return 5
+
+
+def packstream_size(value) -> int:
+    """Bytes `value` takes in PackStream v1, the encoding Bolt uses."""
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, int):
+        if -16 <= value < 128:
+            return 1
+        if -(2**7) <= value < 2**7:
+            return 2
+        if -(2**15) <= value < 2**15:
+            return 3
+        if -(2**31) <= value < 2**31:
+            return 5
+        return 9
+    if isinstance(value, float):
+        return 9
+    if isinstance(value, str):
+        n = len(value.encode())
+        return _header(n) + n
+    if isinstance(value, datetime):
+        # LocalDateTime: struct header, signature, seconds and nanoseconds.
+        seconds = int(value.timestamp())
+        return 2 + packstream_size(seconds) + packstream_size(value.microsecond * 1000)
+    if isinstance(value, (list, tuple)):
+        return _header(len(value)) + sum(map(packstream_size, value))
+    if isinstance(value, dict):
+        return _header(len(value)) + sum(
+            packstream_size(k) + packstream_size(v) for k, v in value.items()
+        )
+    raise TypeError(f"No PackStream size for {type(value).__name__}")
+
+
+def _cpu_ms(fn: Callable[[], object], repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.process_time()
+        fn()
+        times.append(time.process_time() - start)
+    return statistics.median(times) * 1000
+
+
+def first_batch(batches, batch_size: int) -> pa.RecordBatch:
+    """The first batch_size rows of a table, as one batch."""
+    collected, rows = [], 0
+    for batch in batches:
+        collected.append(batch)
+        rows += batch.num_rows
+        if rows >= batch_size:
+            break
+    return pa.Table.from_batches(collected).slice(0, batch_size).combine_chunks().to_batches()[0]
+
+
+def measure(batch: pa.RecordBatch, db: Memgraph | None, repeats: int) -> dict[str, dict]:
+    results = {}
+    for encoding, (name, encode) in ENCODERS.items():
+        value = encode(batch)
+        results[encoding] = {
+            "payload_bytes": packstream_size({name: value}),
+            "build_ms": _cpu_ms(lambda: encode(batch), repeats),
+            "send_ms": (
+                _cpu_ms(
+                    lambda: db.execute(SEND_QUERY, parameters={name: value}),
+                    repeats,
+                )
+                if db is not None
+                else None
+            ),
+        }
+    return results
+
+
+def print_results(table: str, rows: int, results: dict[str, dict]) -> None:
+    print(f"\n[{table}] {rows:,} rows per batch")
+    header = f"{'encoding':<8} {'payload KiB':>11} {'build ms':>9} {'send ms':>8}"
+    print(header)
+    print("-" * len(header))
+    for encoding, r in results.items():
+        send = f"{r['send_ms']:>8.1f}" if r["send_ms"] is not None else f"{'-':>8}"
+        print(
+            f"{encoding:<8} {r['payload_bytes'] / 1024:>11,.1f} "
+            f"{r['build_ms']:>9.1f} {send}"
+        )
+    ratio = results["columns"]["payload_bytes"] / results["rows"]["payload_bytes"]
+    print(f"columns payload is {ratio:.0%} of rows")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare row and columnar Bolt parameter encodings."
+    )
+    parser.add_argument(
+        "--source",
+        choices=available_sources(),
+        default="pyiceberg",
+        help="Where to read the sample batches from (default: pyiceberg).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=10_000,
+        help="Rows per batch (default: 10000).",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=5,
+        help="Timed repetitions per measurement (default: 5).",
+    )
+    parser.add_argument(
+        "--uri",
+        default=None,
+        help="Memgraph Bolt URI. If set, also measure client CPU to send each "
+             "parameter; otherwise only payload size and build time.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    loader = get_loader(args.source, batch_size=args.batch_size, stream=True)
+    db = Memgraph(*_parse_uri(args.uri)) if args.uri else None
+    for table, batches in (("users", loader.users()), ("transactions", loader.transactions())):
+        batch = first_batch(batches, args.batch_size)
+        print_results(table, batch.num_rows, measure(batch, db, args.repeats))
+
+
+if __name__ == "__main__":
+    main()
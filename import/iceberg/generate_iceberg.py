@@ -2,8 +2,15 @@
 
 Defaults: 1,000,000 users and 5,000,000 transactions.
 
-Generation is vectorized with numpy, so producing 1M+5M rows takes only a
-few seconds. Random seeds are fixed, so runs are deterministic.
+Tables are generated in chunks of --chunk-rows rows. Worker processes
+(--workers) each build a chunk with numpy and Arrow compute — no Python
+object per row — and write it as its own Parquet data file; the files are
+then committed to the Iceberg table in a single snapshot. Memory stays at
+roughly one chunk per worker, so 100M+ rows fit on a laptop.
+
+Every chunk is seeded from (--seed, table, chunk index), so a dataset is
+reproducible for a given seed and chunk size no matter how many workers
+write it.
 
 In production your Iceberg tables already live in your data lake (S3 + Glue
 or REST catalog). This script just creates a reproducible stand-in so the
@@ -11,10 +18,15 @@ example runs end-to-end on a fresh clone — only the catalog config block
 below changes when you point at a real lake.
 """
 import argparse
+import multiprocessing as mp
+import os
 from pathlib import Path
 
 import numpy as np
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
 from pyiceberg.catalog.sql import SqlCatalog
 from pyiceberg.exceptions import NoSuchNamespaceError, NoSuchTableError
 from pyiceberg.io.pyarrow import schema_to_pyarrow
@@ -29,10 +41,17 @@ from pyiceberg.types import (
 
 ROOT = Path(__file__).resolve().parent
 WAREHOUSE = ROOT / "warehouse"
+FILES_DIR = ROOT / "files"
+
+# Row group / IPC batch size for --export-files. Small enough that a
+# timestamp-range filter can skip most of a file.
+EXPORT_CHUNK_ROWS = 100_000
 NAMESPACE = "default"
 
 DEFAULT_USERS = 1_000_000
 DEFAULT_TXS = 5_000_000
+DEFAULT_SEED = 42
+DEFAULT_CHUNK_ROWS = 2_000_000
 
 COUNTRIES = ["US", "UK", "DE", "FR", "JP", "ES", "IT", "BR", "IN", "CA"]
 
@@ -52,18 +71,25 @@ TX_SCHEMA = Schema(
 )
 
 
-def generate_users(n: int, seed: int = 42) -> pa.Table:
+def generate_users(n: int, seed=42, first_id: int = 1) -> pa.Table:
+    """Users first_id .. first_id + n - 1. `seed` is anything
+    np.random.default_rng accepts, e.g. [seed, table, chunk]."""
     rng = np.random.default_rng(seed)
-    user_ids = np.arange(1, n + 1, dtype=np.int64)
-    countries = np.array(COUNTRIES)[rng.integers(0, len(COUNTRIES), size=n)]
+    user_ids = pa.array(np.arange(first_id, first_id + n, dtype=np.int64))
+    countries = pc.take(
+        pa.array(COUNTRIES), pa.array(rng.integers(0, len(COUNTRIES), size=n))
+    )
 
-    # Synthetic but unique per user. List comp on 1M rows takes ~1s.
-    names = [f"User_{i:07d}" for i in user_ids]
-    emails = [f"user{i}@example.com" for i in user_ids]
+    # Synthetic but unique per user, built column-wise by Arrow compute.
+    id_strings = pc.cast(user_ids, pa.string())
+    names = pc.binary_join_element_wise(
+        "User_", pc.utf8_lpad(id_strings, width=7, padding="0"), ""
+    )
+    emails = pc.binary_join_element_wise("user", id_strings, "@example.com", "")
 
     # Derive the PyArrow schema from the Iceberg schema so column nullability
-    # matches `required=True` declarations — otherwise iceberg_table.append()
-    # rejects the table with a "required vs optional" mismatch.
+    # matches `required=True` declarations — otherwise Iceberg rejects the
+    # data with a "required vs optional" mismatch.
     return pa.table(
         {
             "user_id": user_ids,
@@ -71,13 +97,15 @@ def generate_users(n: int, seed: int = 42) -> pa.Table:
             "email": emails,
             "country": countries,
         },
-        schema=schema_to_pyarrow(USERS_SCHEMA),
+        schema=_file_schema(USERS_SCHEMA),
     )
 
 
-def generate_transactions(n_txs: int, n_users: int, seed: int = 43) -> pa.Table:
+def generate_transactions(
+    n_txs: int, n_users: int, seed=43, first_id: int = 1
+) -> pa.Table:
     rng = np.random.default_rng(seed)
-    tx_ids = np.arange(1, n_txs + 1, dtype=np.int64)
+    tx_ids = np.arange(first_id, first_id + n_txs, dtype=np.int64)
     from_user = rng.integers(1, n_users + 1, size=n_txs, dtype=np.int64)
     to_user = rng.integers(1, n_users + 1, size=n_txs, dtype=np.int64)
 
@@ -103,10 +131,61 @@ def generate_transactions(n_txs: int, n_users: int, seed: int = 43) -> pa.Table:
             "amount": amount,
             "timestamp": timestamps,
         },
-        schema=schema_to_pyarrow(TX_SCHEMA),
+        schema=_file_schema(TX_SCHEMA),
     )
 
 
+def _file_schema(schema: Schema) -> pa.Schema:
+    """Arrow schema for data files registered with add_files(), which
+    refuses Parquet files that carry Iceberg field ids; columns are matched
+    by name instead."""
+    return pa.schema(field.remove_metadata() for field in schema_to_pyarrow(schema))
+
+
+TABLE_KEYS = {"users": 0, "transactions": 1}  # mixed into every chunk seed
+
+
+def _write_chunk(task: tuple) -> tuple[str, int]:
+    """Worker: generate one chunk and write it as a Parquet data file.
+    Returns the file's path and row count."""
+    table, index, first_id, n, n_users, seed, data_dir = task
+    chunk_seed = [seed, TABLE_KEYS[table], index]
+    if table == "users":
+        data = generate_users(n, seed=chunk_seed, first_id=first_id)
+    else:
+        data = generate_transactions(n, n_users, seed=chunk_seed, first_id=first_id)
+    path = f"{data_dir}/{table}-{seed}-{index:05d}.parquet"
+    filesystem, file_path = pafs.FileSystem.from_uri(path)
+    pq.write_table(data, file_path, filesystem=filesystem)
+    return path, n
+
+
+def write_chunked(
+    iceberg_table,
+    table: str,
+    n: int,
+    chunk_rows: int,
+    workers: int,
+    seed: int,
+    n_users: int = 0,
+) -> None:
+    """Generate `n` rows of `table` in chunks on `workers` processes and
+    commit all data files as one Iceberg snapshot."""
+    data_dir = f"{iceberg_table.location()}/data"
+    filesystem, dir_path = pafs.FileSystem.from_uri(data_dir)
+    filesystem.create_dir(dir_path, recursive=True)
+    tasks = [
+        (table, index, first, min(chunk_rows, n - first + 1), n_users, seed, data_dir)
+        for index, first in enumerate(range(1, n + 1, chunk_rows))
+    ]
+    paths = []
+    with mp.Pool(min(workers, len(tasks)) or 1) as pool:
+        for i, (path, rows) in enumerate(pool.imap(_write_chunk, tasks), start=1):
+            paths.append(path)
+            print(f"[{table}] chunk {i}/{len(tasks)} ({rows:,} rows) written")
+    iceberg_table.add_files(paths)
+
+
 def get_catalog() -> SqlCatalog:
     WAREHOUSE.mkdir(parents=True, exist_ok=True)
     return SqlCatalog(
@@ -134,12 +213,40 @@ def reset_table(catalog: SqlCatalog, name: str, schema: Schema):
     return catalog.create_table(full, schema=schema)
 
 
-def write_iceberg(
-    catalog: SqlCatalog, name: str, schema: Schema, arrow_table: pa.Table
-):
-    iceberg_table = reset_table(catalog, name, schema)
-    iceberg_table.append(arrow_table)
-    return iceberg_table
+def append_transactions(catalog: SqlCatalog, n_txs: int, seed: int = DEFAULT_SEED) -> int:
+    """Append n_txs new transactions between the existing users as a new
+    Iceberg snapshot — a stand-in for a daily lake refresh when trying out
+    iceberg_to_memgraph.py --incremental. Returns the first new tx_id."""
+    users = catalog.load_table(f"{NAMESPACE}.users")
+    txs = catalog.load_table(f"{NAMESPACE}.transactions")
+    n_users = int(users.current_snapshot().summary["total-records"])
+    first_id = int(txs.current_snapshot().summary["total-records"]) + 1
+    # Seed from --seed and the position, so repeated appends differ but stay
+    # reproducible.
+    append_seed = [seed, TABLE_KEYS["transactions"], first_id]
+    txs.append(generate_transactions(n_txs, n_users, seed=append_seed, first_id=first_id))
+    return first_id
+
+
+def export_files(catalog: SqlCatalog) -> None:
+    """Write the same tables as plain Parquet and Arrow IPC files for the
+    `parquet` and `arrow` sources. Transactions are sorted by timestamp so
+    row groups cover disjoint time ranges, which is what lets --since /
+    --until prune them; lakes are usually clustered the same way.
+
+    The sort needs each table in memory, so this is meant for the default
+    sizes rather than the 100M-row ones."""
+    FILES_DIR.mkdir(parents=True, exist_ok=True)
+    users = catalog.load_table(f"{NAMESPACE}.users").scan().to_arrow()
+    txs = catalog.load_table(f"{NAMESPACE}.transactions").scan().to_arrow()
+    txs = txs.sort_by("timestamp")
+    for name, table in (("users", users), ("transactions", txs)):
+        pq.write_table(
+            table, FILES_DIR / f"{name}.parquet", row_group_size=EXPORT_CHUNK_ROWS
+        )
+        with pa.OSFile(str(FILES_DIR / f"{name}.arrow"), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table, max_chunksize=EXPORT_CHUNK_ROWS)
 
 
 def main() -> None:
@@ -158,23 +265,72 @@ def main() -> None:
         default=DEFAULT_TXS,
         help=f"Number of transactions to generate (default: {DEFAULT_TXS:,})",
     )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=DEFAULT_SEED,
+        help=f"Base random seed (default: {DEFAULT_SEED}).",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=DEFAULT_CHUNK_ROWS,
+        help="Rows per generated chunk, i.e. per Iceberg data file "
+             f"(default: {DEFAULT_CHUNK_ROWS:,}). Part of what makes a dataset "
+             "reproducible, together with --seed.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes generating and writing chunks in parallel "
+             "(default: CPU count).",
+    )
+    parser.add_argument(
+        "--export-files",
+        action="store_true",
+        help=f"Also write Parquet + Arrow IPC copies to {FILES_DIR.name}/ "
+             "for the parquet/arrow sources.",
+    )
+    parser.add_argument(
+        "--append",
+        action="store_true",
+        help="Append --transactions new transactions to the existing tables "
+             "as a new snapshot instead of regenerating everything.",
+    )
     args = parser.parse_args()
 
     catalog = get_catalog()
     ensure_namespace(catalog, NAMESPACE)
 
+    if args.append:
+        first_id = append_transactions(catalog, args.transactions, args.seed)
+        print(
+            f"Appended {args.transactions:,} transactions "
+            f"(tx_id {first_id:,}..{first_id + args.transactions - 1:,})"
+        )
+        return
+
     print(f"Generating {args.users:,} users...")
-    users_table = generate_users(args.users)
+    write_chunked(
+        reset_table(catalog, "users", USERS_SCHEMA),
+        "users", args.users, args.chunk_rows, args.workers, args.seed,
+    )
     print(f"Generating {args.transactions:,} transactions...")
-    txs_table = generate_transactions(args.transactions, args.users)
-
-    print("Writing Iceberg tables...")
-    write_iceberg(catalog, "users", USERS_SCHEMA, users_table)
-    write_iceberg(catalog, "transactions", TX_SCHEMA, txs_table)
+    write_chunked(
+        reset_table(catalog, "transactions", TX_SCHEMA),
+        "transactions", args.transactions, args.chunk_rows, args.workers, args.seed,
+        n_users=args.users,
+    )
+    if args.export_files:
+        print("Writing Parquet + Arrow IPC files...")
+        export_files(catalog)
 
     print(f"\nusers:        {args.users:,} rows")
     print(f"transactions: {args.transactions:,} rows")
     print(f"warehouse:    {WAREHOUSE}")
+    if args.export_files:
+        print(f"files:        {FILES_DIR}")
 
 
 if __name__ == "__main__":
@@ -3,25 +3,72 @@
 The source backend (PyIceberg, DuckDB) is swappable via --source. Only the
 read side differs — the writer below is identical for every backend.
 
+Loaders yield pyarrow.RecordBatch objects, not lists of dicts. Batches stay
+columnar through the queue (Arrow pickles as raw buffers) and are turned
+into Bolt parameters only right before the write, column by column.
+With --encoding columns they are sent as a map of parallel lists instead of
+a list of row maps, so the Bolt payload carries each key once per batch.
+
+Use --stream to scan incrementally instead of materializing each table
+first: batches flow to the writers as soon as the first one is decoded,
+and --read-ahead bounds how many are buffered, so client memory stays flat
+regardless of table size.
+
 Use --workers N to fan out N parallel Bolt writer processes. The single
 reader feeds a multiprocessing queue; each worker process drains it via
-its own gqlalchemy Memgraph connection. Memgraph runs in analytical mode
-(set in prepare_graph), so concurrent writes don't conflict.
+its own gqlalchemy Memgraph connection. By default Memgraph runs in
+analytical mode (set in prepare_graph), so concurrent writes don't conflict.
+
+With --storage-mode transactional, edge writes that touch the same User
+conflict; those batches are retried and counted in the final report. Add
+--partition hash|degree to group transactions by from_user first, so no
+two workers ever share a source node.
+
+Use --target-latency-ms to let the batch size adapt: --batch-size becomes
+the starting point, and each phase grows or shrinks it towards the target
+commit latency (see ../adaptive_batching.py, shared with the graph500
+importers). The converged size is printed so it can be pinned next time.
+
+Use --multi-reader (with --workers N) to drop the central queue: the table
+is split into N disjoint slices of Parquet row groups and every worker
+process reads its own slice and writes it directly. Each worker reports
+its rows/s, followed by the aggregate.
 
 The reported elapsed time covers the source -> Memgraph ingestion only:
 schema setup and graph reset are excluded so the number reflects actual
-data movement, not one-time bookkeeping.
+data movement, not one-time bookkeeping. With --profile, the index build
+deferred to between the two phases is part of it; the final storage mode
+switch and snapshot are timed separately.
 """
 import argparse
+import functools
+import json
 import multiprocessing as mp
+import queue
+import random
+import resource
+import sys
 import time
-from typing import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable
 from urllib.parse import urlparse
 
+import numpy as np
+import pyarrow as pa
 from gqlalchemy import Memgraph
+from gqlalchemy.exceptions import GQLAlchemyDatabaseError
+
+from loaders import LOADERS, available_sources, get_loader
+from loaders.base import Loader, rebatch
+from incremental import plan_delta, write_markers
+from partitioning import STRATEGIES, partition_by_source
 
-from loaders import available_sources, get_loader
-from loaders.base import Loader
+# adaptive_batching.py is shared with the graph500 importers in import/cypher.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from adaptive_batching import AdaptiveBatchSize, is_memory_limit_error  # noqa: E402
+from import_profile import PROFILES, ProfiledImport  # noqa: E402
 
 USER_CREATE_QUERY = """
 UNWIND $rows AS r
@@ -45,45 +92,277 @@ MATCH (b:User {id: r.to_user})
 CREATE (a)-[:SENT {tx_id: r.tx_id, amount: r.amount, ts: r.timestamp}]->(b)
 """
 
+# Idempotent variant for --incremental: re-applying a delta after a failed
+# run must not duplicate edges.
+TX_MERGE_QUERY = """
+UNWIND $rows AS r
+MATCH (a:User {id: r.from_user})
+MATCH (b:User {id: r.to_user})
+MERGE (a)-[t:SENT {tx_id: r.tx_id}]->(b)
+SET t.amount = r.amount,
+    t.ts     = r.timestamp
+"""
+
+# Columnar twins of the queries above (--encoding columns). $cols is a map
+# of parallel lists, e.g. {user_id: [...], name: [...]}, so each key string
+# is sent once per batch instead of once per row.
+USER_CREATE_COLUMNS_QUERY = """
+WITH $cols AS c
+UNWIND range(0, size(c.user_id) - 1) AS i
+CREATE (u:User {id: c.user_id[i], name: c.name[i], email: c.email[i], country: c.country[i]})
+"""
+
+USER_MERGE_COLUMNS_QUERY = """
+WITH $cols AS c
+UNWIND range(0, size(c.user_id) - 1) AS i
+MERGE (u:User {id: c.user_id[i]})
+SET u.name    = c.name[i],
+    u.email   = c.email[i],
+    u.country = c.country[i]
+"""
+
+TX_BATCH_COLUMNS_QUERY = """
+WITH $cols AS c
+UNWIND range(0, size(c.tx_id) - 1) AS i
+MATCH (a:User {id: c.from_user[i]})
+MATCH (b:User {id: c.to_user[i]})
+CREATE (a)-[:SENT {tx_id: c.tx_id[i], amount: c.amount[i], ts: c.timestamp[i]}]->(b)
+"""
+
+TX_MERGE_COLUMNS_QUERY = """
+WITH $cols AS c
+UNWIND range(0, size(c.tx_id) - 1) AS i
+MATCH (a:User {id: c.from_user[i]})
+MATCH (b:User {id: c.to_user[i]})
+MERGE (a)-[t:SENT {tx_id: c.tx_id[i]}]->(b)
+SET t.amount = c.amount[i],
+    t.ts     = c.timestamp[i]
+"""
+
+COLUMN_QUERIES = {
+    USER_CREATE_QUERY: USER_CREATE_COLUMNS_QUERY,
+    USER_MERGE_QUERY: USER_MERGE_COLUMNS_QUERY,
+    TX_BATCH_QUERY: TX_BATCH_COLUMNS_QUERY,
+    TX_MERGE_QUERY: TX_MERGE_COLUMNS_QUERY,
+}
+
+ENCODINGS = ("rows", "columns")
+
+STORAGE_MODES = {
+    "analytical": "IN_MEMORY_ANALYTICAL",
+    "transactional": "IN_MEMORY_TRANSACTIONAL",
+}
+
+# Write-write conflict retries (transactional mode only).
+MAX_RETRIES = 20
+RETRY_BASE_S = 0.05
+RETRY_CAP_S = 2.0
+
 _SHUTDOWN = "__SHUTDOWN__"  # string sentinel survives pickling across processes
 
 
+@dataclass
+class PhaseStats:
+    """Counters for one ingest phase (users or tx). Every writer process
+    fills its own and sends it back; the main process merges them."""
+
+    rows: int = 0
+    retries: int = 0
+    seconds: float = 0.0  # wall time of the whole phase, set by ingest()
+    latencies: list[float] = field(default_factory=list)  # per batch, with retries
+
+    def merge(self, other: "PhaseStats") -> "PhaseStats":
+        self.rows += other.rows
+        self.retries += other.retries
+        self.latencies.extend(other.latencies)
+        return self
+
+    def summary(self) -> dict:
+        p50, p95 = (
+            np.percentile(self.latencies, [50, 95]) * 1000
+            if self.latencies
+            else (0.0, 0.0)
+        )
+        return {
+            "rows": self.rows,
+            "seconds": round(self.seconds, 3),
+            "rows_per_s": round(self.rows / self.seconds) if self.seconds else 0,
+            "batches": len(self.latencies),
+            "p50_batch_ms": round(float(p50), 2),
+            "p95_batch_ms": round(float(p95), 2),
+            "retries": self.retries,
+        }
+
+
 def _parse_uri(uri: str) -> tuple[str, int]:
     parsed = urlparse(uri)
     return parsed.hostname or "localhost", parsed.port or 7687
 
 
-def prepare_graph(db: Memgraph) -> None:
-    """Pre-ingestion setup: switch to analytical mode for fast bulk writes,
-    wipe the graph (DROP GRAPH also clears schema/indexes), then create
-    the label and label-property indexes used by the loader."""
-    db.execute("STORAGE MODE IN_MEMORY_ANALYTICAL")
-    db.execute("DROP GRAPH")
+def _peak_rss_mb() -> float:
+    """Peak RSS of this process or its largest (already joined) worker."""
+    # ru_maxrss is reported in kilobytes on Linux.
+    return max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    ) / 1024
+
+
+def storage_info(db: Memgraph) -> dict[str, str]:
+    """SHOW STORAGE INFO as a {key: value} dict (values as Memgraph prints
+    them, e.g. "memory_res": "1.23GiB")."""
+    return {
+        row["storage info"]: row["value"]
+        for row in db.execute_and_fetch("SHOW STORAGE INFO")
+    }
+
+
+def batch_to_rows(batch: pa.RecordBatch) -> list[dict]:
+    """Build the `$rows` parameter straight from the Arrow columns.
+
+    This is the only place Python objects are created for a batch, and it
+    runs in whichever process executes the write — in parallel mode that is
+    the writer process, not the reader."""
+    names = batch.schema.names
+    columns = [column.to_pylist() for column in batch.columns]
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+def batch_to_columns(batch: pa.RecordBatch) -> dict[str, list]:
+    """Build the `$cols` parameter: one Python list per Arrow column, with
+    no per-row dicts at all."""
+    return {
+        name: column.to_pylist()
+        for name, column in zip(batch.schema.names, batch.columns)
+    }
+
+
+def batch_parameters(query: str, batch: pa.RecordBatch) -> dict:
+    """Encode a batch the way `query` consumes it: queries that reference
+    $cols get the columnar map, all others the list of row maps."""
+    if "$cols" in query:
+        return {"cols": batch_to_columns(batch)}
+    return {"rows": batch_to_rows(batch)}
+
+
+def encoded(query: str, encoding: str) -> str:
+    """The variant of a row query for the given --encoding."""
+    return COLUMN_QUERIES[query] if encoding == "columns" else query
+
+
+def prepare_graph(
+    db: Memgraph, storage_mode: str = "analytical", reset: bool = True
+) -> None:
+    """Pre-ingestion setup: switch storage mode (analytical by default, for
+    fast conflict-free bulk writes), wipe the graph (DROP GRAPH also clears
+    schema/indexes) unless reset=False, then create the label and
+    label-property indexes used by the loader (a no-op if they exist)."""
+    db.execute(f"STORAGE MODE {STORAGE_MODES[storage_mode]}")
+    if reset:
+        db.execute("DROP GRAPH")
     db.execute("CREATE INDEX ON :User")
     db.execute("CREATE INDEX ON :User(id)")
 
 
-def write_serial(
-    db: Memgraph, label: str, query: str, batches: Iterable[list[dict]]
+def execute_batch(
+    db: Memgraph, query: str, batch: pa.RecordBatch, stats: PhaseStats
 ) -> None:
+    """Run one UNWIND batch, retrying write-write conflicts with jittered
+    exponential backoff, and record rows, latency and retries in stats.
+
+    Conflicts only happen in IN_MEMORY_TRANSACTIONAL mode; any other error
+    is raised immediately."""
+    start = time.perf_counter()
+    parameters = batch_parameters(query, batch)
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            db.execute(query, parameters=parameters)
+            stats.rows += batch.num_rows
+            stats.retries += attempt
+            stats.latencies.append(time.perf_counter() - start)
+            return
+        except GQLAlchemyDatabaseError as e:
+            if attempt == MAX_RETRIES or "conflict" not in str(e).lower():
+                raise
+            time.sleep(random.uniform(0, min(RETRY_CAP_S, RETRY_BASE_S * 2**attempt)))
+    raise AssertionError("unreachable")
+
+
+def execute_split(
+    db: Memgraph, query: str, batch: pa.RecordBatch, stats: PhaseStats, split: bool
+) -> tuple[int, float, int, list[int]]:
+    """execute_batch for adaptive batch sizing. With split, a batch that hits
+    Memgraph's memory limit is written as two halves instead of failing.
+
+    Returns what AdaptiveBatchSize.record_result expects: rows, seconds,
+    conflict retries and the sizes of the batches that hit the limit."""
+    start = time.perf_counter()
+    retries = stats.retries
+    try:
+        execute_batch(db, query, batch, stats)
+        return batch.num_rows, time.perf_counter() - start, stats.retries - retries, []
+    except GQLAlchemyDatabaseError as e:
+        if not (split and is_memory_limit_error(e) and batch.num_rows > 1):
+            raise
+    half = batch.num_rows // 2
+    failed = [batch.num_rows]
+    for part in (batch.slice(0, half), batch.slice(half)):
+        failed += execute_split(db, query, part, stats, split)[3]
+    return batch.num_rows, time.perf_counter() - start, stats.retries - retries, failed
+
+
+def write_serial(
+    db: Memgraph,
+    label: str,
+    query: str,
+    batches: Iterable[pa.RecordBatch],
+    make_batcher: Callable[[], AdaptiveBatchSize] | None = None,
+) -> PhaseStats:
+    stats = PhaseStats()
+    batcher = make_batcher() if make_batcher else None
+    if batcher:
+        batches = rebatch(batches, lambda: batcher.size)
     for i, batch in enumerate(batches, start=1):
-        db.execute(query, parameters={"rows": batch})
-        print(f"[{label}] batch {i} ({len(batch)} rows) done")
+        if batcher:
+            batcher.record_result(
+                *execute_split(db, query, batch, stats, batcher.split_on_memory_limit)
+            )
+        else:
+            execute_batch(db, query, batch, stats)
+        print(f"[{label}] batch {i} ({batch.num_rows} rows) done")
+    if batcher:
+        print(f"[{label}] {batcher.summary()}")
+    return stats
 
 
 def _writer_process(
-    host: str, port: int, label: str, query: str, q: "mp.Queue"
+    host: str,
+    port: int,
+    label: str,
+    query: str,
+    q: "mp.Queue",
+    results: "mp.Queue",
+    feedback: "mp.Queue | None" = None,
+    split: bool = False,
 ) -> None:
     """Worker entry point. Each process owns its Memgraph connection — Bolt
-    sockets aren't safe to share across forked processes."""
+    sockets aren't safe to share across forked processes.
+
+    With a feedback queue (adaptive batch sizing), the outcome of every
+    batch is sent back to the reader, which sizes the next batches."""
     name = mp.current_process().name
     db = Memgraph(host=host, port=port)
+    stats = PhaseStats()
     while True:
         item = q.get()
         if item == _SHUTDOWN:
+            results.put(stats)
             return
-        db.execute(query, parameters={"rows": item})
-        print(f"[{label}] {name} finished batch ({len(item)} rows)")
+        if feedback is not None:
+            feedback.put(execute_split(db, query, item, stats, split))
+        else:
+            execute_batch(db, query, item, stats)
+        print(f"[{label}] {name} finished batch ({item.num_rows} rows)")
 
 
 def write_parallel(
@@ -91,31 +370,233 @@ def write_parallel(
     port: int,
     label: str,
     query: str,
-    batches: Iterable[list[dict]],
+    batches: Iterable[pa.RecordBatch],
     n_workers: int,
-) -> None:
+    make_batcher: Callable[[], AdaptiveBatchSize] | None = None,
+) -> PhaseStats:
     """Producer-consumer: the main process reads from the loader and pushes
-    batches onto a multiprocessing queue; n_workers writer processes pull
-    and run UNWIND/MERGE on their own Memgraph connections."""
+    Arrow batches onto a multiprocessing queue; n_workers writer processes
+    pull, convert to rows and run UNWIND/MERGE on their own Memgraph
+    connections.
+
+    With make_batcher, the main process also cuts the batches: before each
+    one it applies the results the workers have reported so far."""
     q: "mp.Queue" = mp.Queue(maxsize=n_workers * 4)
+    results: "mp.Queue" = mp.Queue()
+    batcher = make_batcher() if make_batcher else None
+    feedback: "mp.Queue | None" = mp.Queue() if batcher else None
     procs = [
         mp.Process(
             target=_writer_process,
-            args=(host, port, label, query, q),
+            args=(
+                host, port, label, query, q, results, feedback,
+                batcher is not None and batcher.split_on_memory_limit,
+            ),
             name=f"writer-{label}-{i}",
         )
         for i in range(n_workers)
     ]
+
+    def next_size() -> int:
+        while True:
+            try:
+                batcher.record_result(*feedback.get_nowait())
+            except queue.Empty:
+                return batcher.size
+
+    if batcher:
+        batches = rebatch(batches, next_size)
     for p in procs:
         p.start()
+    collected: list[PhaseStats] = []
     try:
         for batch in batches:
-            q.put(batch)
-    finally:
+            _put_checked(q, batch, procs, label)
         for _ in range(n_workers):
-            q.put(_SHUTDOWN)
+            _put_checked(q, _SHUTDOWN, procs, label)
+        # Drain results (and feedback) before joining: a worker can't exit
+        # while what it put on a queue is still waiting in the pipe.
+        while len(collected) < n_workers:
+            if batcher:
+                next_size()
+            try:
+                collected.append(results.get(timeout=1))
+            except queue.Empty:
+                _check_workers(procs, label)
+    except BaseException:
+        for p in procs:
+            if p.is_alive():
+                p.terminate()
+        raise
+    finally:
+        for p in procs:
+            p.join()
+    _check_workers(procs, label)
+    if batcher:
+        next_size()
+        print(f"[{label}] {batcher.summary()}")
+    stats = PhaseStats()
+    for worker_stats in collected:
+        stats.merge(worker_stats)
+    return stats
+
+
+def _check_workers(procs: list["mp.Process"], label: str) -> None:
+    """Raise if a worker died: the batches it had taken are lost."""
+    failed = [p.name for p in procs if p.exitcode not in (None, 0)]
+    if failed:
+        raise RuntimeError(f"[{label}] worker(s) failed: {', '.join(failed)}")
+
+
+def _put_checked(q: "mp.Queue", item, procs: list["mp.Process"], label: str) -> None:
+    """q.put that gives up once a worker has died, instead of blocking
+    forever on a full queue nobody reads."""
+    while True:
+        _check_workers(procs, label)
+        try:
+            q.put(item, timeout=1)
+            return
+        except queue.Full:
+            pass
+
+
+def _read_slice(
+    make_loader: Callable[[], Loader], table_name: str, groups: list
+) -> Iterable[pa.RecordBatch]:
+    return make_loader().read_slice(table_name, groups)
+
+
+def _direct_writer_process(
+    host: str,
+    port: int,
+    label: str,
+    query: str,
+    read: Callable[[], Iterable[pa.RecordBatch]],
+    results: "mp.Queue",
+    make_batcher: Callable[[], AdaptiveBatchSize] | None = None,
+) -> None:
+    """Queue-less worker: produce its own batches with read() and write them
+    on a private connection, then report (name, seconds, stats). With
+    make_batcher, the worker sizes its own batches."""
+    name = mp.current_process().name
+    db = Memgraph(host=host, port=port)
+    stats = PhaseStats()
+    batcher = make_batcher() if make_batcher else None
+    batches = rebatch(read(), lambda: batcher.size) if batcher else read()
+    start = time.perf_counter()
+    for batch in batches:
+        if batcher:
+            batcher.record_result(
+                *execute_split(db, query, batch, stats, batcher.split_on_memory_limit)
+            )
+        else:
+            execute_batch(db, query, batch, stats)
+        print(f"[{label}] {name} finished batch ({batch.num_rows} rows)")
+    if batcher:
+        print(f"[{label}] {name}: {batcher.summary()}")
+    results.put((name, time.perf_counter() - start, stats))
+
+
+def _run_direct(
+    host: str,
+    port: int,
+    label: str,
+    query: str,
+    reads: list[Callable[[], Iterable[pa.RecordBatch]]],
+    make_batcher: Callable[[], AdaptiveBatchSize] | None = None,
+) -> PhaseStats:
+    """Start one _direct_writer_process per read, wait for all of them and
+    print per-worker and aggregate rows/s."""
+    results: "mp.Queue" = mp.Queue()
+    procs = [
+        mp.Process(
+            target=_direct_writer_process,
+            args=(host, port, label, query, read, results, make_batcher),
+            name=f"worker-{label}-{i}",
+        )
+        for i, read in enumerate(reads)
+    ]
+    start = time.perf_counter()
     for p in procs:
-        p.join()
+        p.start()
+    collected = []
+    try:
+        # As in write_parallel: read the results before joining, or a worker
+        # whose stats don't fit in the pipe never exits.
+        while len(collected) < len(procs):
+            try:
+                collected.append(results.get(timeout=1))
+            except queue.Empty:
+                _check_workers(procs, label)
+    except BaseException:
+        for p in procs:
+            if p.is_alive():
+                p.terminate()
+        raise
+    finally:
+        for p in procs:
+            p.join()
+    elapsed = time.perf_counter() - start
+    _check_workers(procs, label)
+
+    total = PhaseStats()
+    for name, seconds, stats in sorted(collected, key=lambda r: r[0]):
+        print(
+            f"[{label}] {name}: {stats.rows:,} rows in {seconds:.2f}s "
+            f"({stats.rows / seconds:,.0f} rows/s, {stats.retries} conflict retries)"
+        )
+        total.merge(stats)
+    print(
+        f"[{label}] {len(procs)} workers: {total.rows:,} rows in {elapsed:.2f}s "
+        f"({total.rows / elapsed:,.0f} rows/s aggregate)"
+    )
+    return total
+
+
+def write_sliced(
+    host: str,
+    port: int,
+    label: str,
+    query: str,
+    loader: Loader,
+    make_loader: Callable[[], Loader],
+    table_name: str,
+    n_workers: int,
+    make_batcher: Callable[[], AdaptiveBatchSize] | None = None,
+) -> PhaseStats:
+    """No central reader: plan n_workers disjoint slices, then let each
+    worker process read and write its own slice end to end."""
+    reads = [
+        functools.partial(_read_slice, make_loader, table_name, groups)
+        for groups in loader.slices(table_name, n_workers)
+    ]
+    return _run_direct(host, port, label, query, reads, make_batcher)
+
+
+def write_partitioned(
+    host: str,
+    port: int,
+    label: str,
+    query: str,
+    batches: Iterable[pa.RecordBatch],
+    n_workers: int,
+    strategy: str,
+    batch_size: int,
+    make_batcher: Callable[[], AdaptiveBatchSize] | None = None,
+) -> PhaseStats:
+    """Pre-pass over all transactions, then one worker per partition so no
+    two workers ever write edges out of the same User."""
+    start = time.perf_counter()
+    partitions = partition_by_source(batches, n_workers, strategy)
+    print(
+        f"[{label}] {strategy} partitioning in {time.perf_counter() - start:.2f}s, "
+        f"rows per worker: {[p.num_rows for p in partitions]}"
+    )
+    reads = [
+        functools.partial(iter, p.to_batches(max_chunksize=batch_size))
+        for p in partitions
+    ]
+    return _run_direct(host, port, label, query, reads, make_batcher)
 
 
 def ingest(
@@ -125,28 +606,69 @@ def ingest(
     loader: Loader,
     n_workers: int,
     user_query: str,
-) -> float:
-    """Time the source -> Memgraph ingestion (excludes prepare_graph)."""
+    make_loader: Callable[[], Loader] | None = None,
+    partition: str | None = None,
+    batch_size: int = 10_000,
+    tx_query: str = TX_BATCH_QUERY,
+    make_batcher: Callable[[], AdaptiveBatchSize] | None = None,
+    after_users: Callable[[], None] | None = None,
+) -> tuple[float, dict[str, PhaseStats]]:
+    """Time the source -> Memgraph ingestion (excludes prepare_graph).
+    Returns the elapsed seconds and the stats of each phase ("users", "tx").
+
+    With make_loader, every worker builds its own loader from it and reads
+    a disjoint slice of each table (--multi-reader). With partition, the
+    transactions are grouped by from_user first (--partition). With
+    make_batcher, batch sizes adapt to commit latency; every phase (and
+    every direct worker) starts a fresh controller. after_users runs
+    between the phases (the --profile's deferred index build)."""
     start = time.perf_counter()
-
-    if n_workers <= 1:
-        write_serial(db, "users", user_query, loader.users())
-        write_serial(db, "tx", TX_BATCH_QUERY, loader.transactions())
-    else:
-        # Users must finish before transactions: the tx batch MATCHes them.
-        write_parallel(host, port, "users", user_query, loader.users(), n_workers)
-        write_parallel(host, port, "tx", TX_BATCH_QUERY, loader.transactions(), n_workers)
-
-    return time.perf_counter() - start
+    phases: dict[str, PhaseStats] = {}
+
+    # Users must finish before transactions: the tx batch MATCHes them.
+    for label, table_name, query, batches in (
+        ("users", "users", user_query, loader.users),
+        ("tx", "transactions", tx_query, loader.transactions),
+    ):
+        phase_start = time.perf_counter()
+        if make_loader is not None:
+            stats = write_sliced(
+                host, port, label, query, loader, make_loader, table_name, n_workers,
+                make_batcher,
+            )
+        elif n_workers <= 1:
+            stats = write_serial(db, label, query, batches(), make_batcher)
+        elif partition is not None and label == "tx":
+            stats = write_partitioned(
+                host, port, label, query, batches(), n_workers, partition, batch_size,
+                make_batcher,
+            )
+        else:
+            stats = write_parallel(
+                host, port, label, query, batches(), n_workers, make_batcher
+            )
+        stats.seconds = time.perf_counter() - phase_start
+        phases[label] = stats
+        if label == "users" and after_users is not None:
+            after_users()
+
+    return time.perf_counter() - start, phases
 
 
 def dry_run(loader: Loader) -> float:
-    """Iterate the loader without writing — times batch preparation only."""
+    """Iterate the loader without writing — times batch preparation only.
+
+    Batches are left in Arrow form, so this measures the source scan and
+    nothing else. Compare the reported peak RSS between backends."""
     start = time.perf_counter()
 
     for label, batches in (("users", loader.users()), ("tx", loader.transactions())):
+        first = time.perf_counter()
         for i, batch in enumerate(batches, start=1):
-            print(f"[{label}] batch {i} ({len(batch)} rows) prepared")
+            if i == 1:
+                wait_ms = (time.perf_counter() - first) * 1000
+                print(f"[{label}] first batch after {wait_ms:.1f} ms")
+            print(f"[{label}] batch {i} ({batch.num_rows} rows) prepared")
 
     return time.perf_counter() - start
 
@@ -178,6 +700,77 @@ def parse_args() -> argparse.Namespace:
         default=10_000,
         help="Rows per UNWIND batch / Bolt round trip (default: 10000).",
     )
+    parser.add_argument(
+        "--target-latency-ms",
+        type=float,
+        metavar="MS",
+        help="Adapt the batch size towards this commit latency, starting from "
+             "--batch-size, and print the converged size at the end of each "
+             "phase. Conflict retries and memory-limit errors shrink it.",
+    )
+    parser.add_argument(
+        "--encoding",
+        choices=ENCODINGS,
+        default="rows",
+        help="Bolt parameter layout: 'rows' (a list of maps, the default) or "
+             "'columns' (a map of parallel lists; smaller payload, cheaper "
+             "to build).",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the source scan batch by batch instead of reading each "
+             "table fully into memory first.",
+    )
+    parser.add_argument(
+        "--read-ahead",
+        type=int,
+        default=2,
+        help="With --stream: batches decoded ahead of the writer (default: 2).",
+    )
+    parser.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        help="Only load transactions with timestamp >= SINCE (ISO 8601). "
+             "Pushed down to the file reader; parquet/arrow sources only.",
+    )
+    parser.add_argument(
+        "--until",
+        type=datetime.fromisoformat,
+        help="Only load transactions with timestamp < UNTIL (ISO 8601). "
+             "Pushed down to the file reader; parquet/arrow sources only.",
+    )
+    parser.add_argument(
+        "--multi-reader",
+        action="store_true",
+        help="Each of the --workers processes reads its own disjoint slice of "
+             "the table (Parquet row groups) and writes it directly, instead "
+             "of draining one central reader's queue.",
+    )
+    parser.add_argument(
+        "--storage-mode",
+        choices=tuple(STORAGE_MODES),
+        default="analytical",
+        help="Memgraph storage mode during the load (default: analytical). "
+             "In transactional mode parallel edge writes can conflict; "
+             "conflicts are retried and counted in the final report.",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=tuple(PROFILES),
+        help="Run the load inside an import profile (../import_profile.py) "
+             "instead of only switching storage mode: 'bulk' loads in "
+             "analytical mode, builds the User indexes only once they are "
+             "needed, then switches to transactional mode and creates a "
+             "snapshot. Overrides --storage-mode; every step is timed.",
+    )
+    parser.add_argument(
+        "--partition",
+        choices=STRATEGIES,
+        help="With --workers > 1: pre-partition transactions by from_user "
+             "('hash' or degree-aware 'degree' bin packing) so workers never "
+             "share a source User. Holds all transactions in memory.",
+    )
     parser.add_argument(
         "--user-write",
         choices=tuple(USER_QUERIES),
@@ -185,39 +778,198 @@ def parse_args() -> argparse.Namespace:
         help="How to write user nodes: 'create' (faster, assumes clean graph) "
              "or 'merge' (idempotent, safe for re-runs). Default: create.",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Keep the graph and load only rows appended to the Iceberg tables "
+             "since the snapshot recorded by the previous --incremental run "
+             "(everything on the first run). Users and edges are written with "
+             "MERGE; --user-write is ignored.",
+    )
+    parser.add_argument(
+        "--metrics-json",
+        metavar="PATH",
+        help="Also write the run's settings, per-phase rows/s and batch "
+             "latencies, client peak RSS and SHOW STORAGE INFO to PATH.",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
         help="Iterate source batches without writing to Memgraph; reports prep time only.",
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.partition and args.multi_reader:
+        parser.error("--partition and --multi-reader are mutually exclusive")
+    if args.incremental and args.multi_reader:
+        parser.error("--incremental and --multi-reader are mutually exclusive")
+    if (args.since or args.until) and not LOADERS[args.source].supports_time_range:
+        parser.error(f"--since/--until are not supported by --source {args.source}")
+    if args.multi_reader and not LOADERS[args.source].supports_slices:
+        parser.error(f"--multi-reader is not supported by --source {args.source}")
+    if args.incremental and not LOADERS[args.source].supports_incremental:
+        parser.error(f"--incremental is not supported by --source {args.source}")
+    if args.profile:
+        load_mode = PROFILES[args.profile].load_mode
+        args.storage_mode = next(k for k, v in STORAGE_MODES.items() if v == load_mode)
+    return args
+
+
+def _run_tag(args: argparse.Namespace) -> str:
+    """The "[source, workers=..., ...]" prefix of the final report line;
+    options left at their defaults are omitted."""
+    if args.dry_run:
+        parts = [args.source, f"batch={args.batch_size}"]
+    else:
+        parts = [
+            args.source,
+            f"workers={args.workers}",
+            f"batch={args.batch_size}",
+            f"user-write={args.user_write}",
+        ]
+    if args.target_latency_ms and not args.dry_run:
+        parts.append(f"target-latency={args.target_latency_ms:g}ms")
+    if args.encoding != "rows":
+        parts.append(f"encoding={args.encoding}")
+    if args.stream:
+        parts.append(f"stream, read-ahead={args.read_ahead}")
+    if args.since:
+        parts.append(f"since={args.since.isoformat()}")
+    if args.until:
+        parts.append(f"until={args.until.isoformat()}")
+    if args.dry_run:
+        return f"[{', '.join(parts)}, dry-run]"
+    if args.multi_reader:
+        parts.append("multi-reader")
+    if args.partition:
+        parts.append(f"partition={args.partition}")
+    if args.profile:
+        parts.append(f"profile={args.profile}")
+    elif args.storage_mode != "analytical":
+        parts.append(args.storage_mode)
+    if args.incremental:
+        parts.append("incremental")
+    return f"[{', '.join(parts)}]"
 
 
 def main() -> None:
     args = parse_args()
-    loader = get_loader(args.source, batch_size=args.batch_size)
+    make_loader = functools.partial(
+        get_loader,
+        args.source,
+        batch_size=args.batch_size,
+        stream=args.stream,
+        read_ahead=args.read_ahead,
+        **{k: getattr(args, k) for k in ("since", "until") if getattr(args, k)},
+    )
+    loader = make_loader()
 
     if args.dry_run:
         elapsed = dry_run(loader)
         print(
-            f"[{args.source}, batch={args.batch_size}, dry-run] "
-            f"Prepared source batches in {elapsed:.2f}s"
+            f"{_run_tag(args)} "
+            f"Prepared source batches in {elapsed:.2f}s "
+            f"(peak RSS {_peak_rss_mb():.0f} MB)"
         )
         return
 
     host, port = _parse_uri(args.uri)
     db = Memgraph(host=host, port=port)
-    prepare_graph(db)
-    elapsed = ingest(
-        db, host, port, loader, args.workers, USER_QUERIES[args.user_write]
+    profiled = None
+    if args.profile:
+        # MERGE needs the User(id) index while writing users; CREATE only
+        # once the transactions MATCH on it.
+        user_indexes = ["CREATE INDEX ON :User", "CREATE INDEX ON :User(id)"]
+        merge_users = args.incremental or args.user_write == "merge"
+        profiled = ProfiledImport(
+            db.execute,
+            PROFILES[args.profile],
+            node_indexes=user_indexes if merge_users else (),
+            edge_indexes=() if merge_users else user_indexes,
+            reset=not args.incremental,
+        )
+        profiled.begin()
+    else:
+        prepare_graph(db, args.storage_mode, reset=not args.incremental)
+    after_users = profiled.nodes_loaded if profiled else None
+    # Splitting a batch that hit the memory limit is only safe when the
+    # failed transaction was rolled back, i.e. not in analytical mode.
+    make_batcher = (
+        functools.partial(
+            AdaptiveBatchSize,
+            initial=args.batch_size,
+            target_latency=args.target_latency_ms / 1000,
+            split_on_memory_limit=args.storage_mode == "transactional",
+        )
+        if args.target_latency_ms
+        else None
     )
+    if args.incremental:
+        delta, snapshot_ids = plan_delta(db, loader)
+        elapsed, phases = ingest(
+            db,
+            host,
+            port,
+            delta,
+            args.workers,
+            encoded(USER_MERGE_QUERY, args.encoding),
+            partition=args.partition,
+            batch_size=args.batch_size,
+            tx_query=encoded(TX_MERGE_QUERY, args.encoding),
+            make_batcher=make_batcher,
+            after_users=after_users,
+        )
+        # A marker moved past rows that never made it in would skip them
+        # for good, so only move the markers once both phases are complete.
+        written = {"users": phases["users"].rows, "transactions": phases["tx"].rows}
+        short = [
+            f"{table} {written[table]:,} of {delta.rows(table):,} rows"
+            for table in written
+            if written[table] != delta.rows(table)
+        ]
+        if short:
+            raise RuntimeError(
+                f"Incomplete delta ({', '.join(short)}); snapshot markers not moved"
+            )
+        write_markers(db, snapshot_ids)
+    else:
+        elapsed, phases = ingest(
+            db,
+            host,
+            port,
+            loader,
+            args.workers,
+            encoded(USER_QUERIES[args.user_write], args.encoding),
+            make_loader=make_loader if args.multi_reader else None,
+            partition=args.partition,
+            batch_size=args.batch_size,
+            tx_query=encoded(TX_BATCH_QUERY, args.encoding),
+            make_batcher=make_batcher,
+            after_users=after_users,
+        )
+    if profiled:
+        profiled.finish()
+        print(profiled.summary())
 
+    retries = sum(stats.retries for stats in phases.values())
     print(
-        f"[{args.source}, workers={args.workers}, batch={args.batch_size}, "
-        f"user-write={args.user_write}] "
-        f"Ingested into Memgraph in {elapsed:.2f}s"
+        f"{_run_tag(args)} "
+        f"Ingested into Memgraph in {elapsed:.2f}s ({retries} conflict retries)"
     )
 
+    if args.metrics_json:
+        metrics = {
+            "settings": {
+                k: v for k, v in vars(args).items() if k not in ("metrics_json", "dry_run")
+            },
+            "elapsed_s": round(elapsed, 3),
+            "phases": {label: stats.summary() for label, stats in phases.items()},
+            "client_peak_rss_mb": round(_peak_rss_mb(), 1),
+            "profile_steps": dict(profiled.timings) if profiled else None,
+            "storage_info": storage_info(db),
+        }
+        with open(args.metrics_json, "w") as f:
+            json.dump(metrics, f, indent=2, default=str)
+
 
 if __name__ == "__main__":
     main()
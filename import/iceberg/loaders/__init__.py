@@ -6,23 +6,36 @@ To plug in a new source (e.g. DuckDB, raw Parquet, LOAD CSV):
     2. Register it in LOADERS below.
     3. Run: python iceberg_to_memgraph.py --source <name>
 """
+from .arrow_ipc_loader import ArrowIPCLoader
 from .base import Loader
 from .duckdb_loader import DuckDBLoader
+from .parquet_loader import ParquetLoader
 from .pyiceberg_loader import PyIcebergLoader
 
 LOADERS: dict[str, type[Loader]] = {
     "pyiceberg": PyIcebergLoader,
     "duckdb": DuckDBLoader,
-    # "parquet":  ParquetLoader,   # TODO
+    "parquet": ParquetLoader,
+    "arrow": ArrowIPCLoader,
 }
 
 
-def get_loader(source: str, batch_size: int = 10_000) -> Loader:
+def get_loader(
+    source: str,
+    batch_size: int = 10_000,
+    stream: bool = False,
+    read_ahead: int = 2,
+    **options,
+) -> Loader:
+    """Build a backend. Extra options (e.g. since=/until= for backends with
+    supports_time_range) are passed to its constructor as-is."""
     if source not in LOADERS:
         raise ValueError(
             f"Unknown source: {source!r}. Available: {sorted(LOADERS)}"
         )
-    return LOADERS[source](batch_size=batch_size)
+    return LOADERS[source](
+        batch_size=batch_size, stream=stream, read_ahead=read_ahead, **options
+    )
 
 
 def available_sources() -> list[str]:
@@ -0,0 +1,13 @@
+"""Read users + transactions from local Arrow IPC (Feather v2) files.
+
+IPC files are Arrow's in-memory layout on disk: with memory mapping the
+record batches are used in place, with no decode step at all. There are no
+row-group statistics, so a --since/--until filter is evaluated on every
+batch, but only the timestamp column's pages are touched to do it.
+"""
+from .file_loader import FileLoader
+
+
+class ArrowIPCLoader(FileLoader):
+    FORMAT = "ipc"
+    SUFFIX = "arrow"
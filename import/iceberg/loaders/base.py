@@ -2,23 +2,155 @@
 
 The point of this abstraction is that iceberg_to_memgraph.py is identical
 regardless of where the data is read from — Iceberg via PyIceberg, Iceberg
-via DuckDB, raw Parquet, CSV, etc. Each backend yields batches of plain
-dicts; the writer turns them into Cypher.
+via DuckDB, raw Parquet, CSV, etc. Each backend yields Arrow RecordBatches;
+the writer turns their columns into Cypher parameters.
+
+Backends support two scan modes. The default materializes the whole table
+as Arrow before yielding; streaming mode (stream=True) reads incrementally
+and uses rebatch() + read_ahead() below so the first batch is available
+immediately and memory stays bounded by the read-ahead depth.
 """
+import queue
+import threading
 from abc import ABC, abstractmethod
-from typing import Iterator
+from typing import Callable, Iterable, Iterator
+
+import pyarrow as pa
+
+from .slices import RowGroup
+
+_DONE = object()  # end-of-stream marker for read_ahead's queue
+
+# The columns the Cypher in iceberg_to_memgraph.py reads. Backends that can
+# project columns at the reader should read exactly these.
+USER_COLUMNS = ("user_id", "name", "email", "country")
+TX_COLUMNS = ("tx_id", "from_user", "to_user", "amount", "timestamp")
 
 
 class Loader(ABC):
-    """Yield users and transactions as batches of dicts.
+    """Yield users and transactions as pyarrow.RecordBatch objects.
 
-    Keep the dict keys aligned with the Cypher in iceberg_to_memgraph.py:
+    Batches stay columnar all the way to the writer — no per-row Python
+    objects are built on the read side. Keep the column names aligned with
+    the Cypher in iceberg_to_memgraph.py (USER_COLUMNS / TX_COLUMNS):
         users:        user_id, name, email, country
         transactions: tx_id, from_user, to_user, amount, timestamp
     """
 
+    # Backends that accept since=/until= (a transaction timestamp range
+    # pushed down to the reader) set this to True.
+    supports_time_range: bool = False
+    # Backends that implement slices()/read_slice() (--multi-reader) and
+    # snapshot_id()/delta() (--incremental) set these to True.
+    supports_slices: bool = False
+    supports_incremental: bool = False
+
     @abstractmethod
-    def users(self) -> Iterator[list[dict]]: ...
+    def users(self) -> Iterator[pa.RecordBatch]: ...
 
     @abstractmethod
-    def transactions(self) -> Iterator[list[dict]]: ...
+    def transactions(self) -> Iterator[pa.RecordBatch]: ...
+
+    # Optional: parallel readers (iceberg_to_memgraph.py --multi-reader).
+    # slices() runs once in the main process and must return picklable
+    # descriptors; read_slice() runs in each worker on a fresh loader.
+
+    def slices(self, table_name: str, n: int) -> list[list[RowGroup]]:
+        """Split `table_name` ("users" or "transactions") into at most n
+        disjoint slices."""
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support parallel readers"
+        )
+
+    def read_slice(
+        self, table_name: str, groups: list[RowGroup]
+    ) -> Iterator[pa.RecordBatch]:
+        """Yield the rows of one slice returned by slices()."""
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support parallel readers"
+        )
+
+    # Optional: snapshot-diff ingestion (iceberg_to_memgraph.py --incremental).
+    # The rows of a delta are read back with read_slice().
+
+    def snapshot_id(self, table_name: str) -> int | None:
+        """The table's current snapshot id (None for an empty table)."""
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support incremental loads"
+        )
+
+    def delta(
+        self, table_name: str, from_snapshot_id: int | None, to_snapshot_id: int
+    ) -> list[RowGroup]:
+        """Row groups appended after from_snapshot_id up to to_snapshot_id;
+        everything in to_snapshot_id if from_snapshot_id is None."""
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support incremental loads"
+        )
+
+
+def rebatch(
+    batches: Iterable[pa.RecordBatch], batch_size: int | Callable[[], int]
+) -> Iterator[pa.RecordBatch]:
+    """Re-slice a stream of arbitrarily sized batches into batch_size rows.
+
+    Streaming readers hand out whatever the file format gives them (one
+    batch per Parquet row group, per data file, ...). Slicing is zero-copy;
+    only batches that straddle an input boundary are concatenated.
+
+    batch_size may be a callable, asked again before every output batch
+    (used by the adaptive batch sizing in iceberg_to_memgraph.py).
+    """
+    size = batch_size if callable(batch_size) else lambda: batch_size
+    target = size()
+    pending: list[pa.RecordBatch] = []
+    buffered = 0
+    for batch in batches:
+        offset = 0
+        while offset < batch.num_rows:
+            take = min(target - buffered, batch.num_rows - offset)
+            pending.append(batch.slice(offset, take))
+            buffered += take
+            offset += take
+            if buffered >= target:
+                yield _concat(pending)
+                pending, buffered = [], 0
+                target = size()
+    if buffered:
+        yield _concat(pending)
+
+
+def _concat(batches: list[pa.RecordBatch]) -> pa.RecordBatch:
+    if len(batches) == 1:
+        return batches[0]
+    return pa.Table.from_batches(batches).combine_chunks().to_batches()[0]
+
+
+def read_ahead(batches: Iterator[pa.RecordBatch], depth: int) -> Iterator[pa.RecordBatch]:
+    """Pull batches on a background thread, keeping at most `depth` ready.
+
+    Arrow and DuckDB release the GIL while decoding, so the next batches are
+    read while the caller is busy writing the current one. The bounded
+    queue keeps memory flat no matter how large the table is.
+    """
+    q: "queue.Queue" = queue.Queue(maxsize=max(depth, 1))
+
+    def produce() -> None:
+        try:
+            for batch in batches:
+                q.put(batch)
+        except BaseException as e:  # re-raised on the consumer side
+            q.put(e)
+            return
+        q.put(_DONE)
+
+    # Daemon: if the consumer stops early, a producer blocked on put() must
+    # not keep the interpreter alive.
+    threading.Thread(target=produce, name="read-ahead", daemon=True).start()
+    while True:
+        item = q.get()
+        if item is _DONE:
+            return
+        if isinstance(item, BaseException):
+            raise item
+        yield item
@@ -0,0 +1,77 @@
+"""Shared reader for plain files on local disk (Parquet, Arrow IPC).
+
+Files are opened through a memory-mapping filesystem, so the OS pages in
+only the bytes a scan touches and Arrow IPC columns are used in place
+without a copy. Only the columns the Cypher needs are read, and the
+optional transaction timestamp range is handed to the scanner as a filter
+expression: for Parquet it skips whole row groups by their min/max
+statistics before decoding, then trims the boundary groups row by row.
+
+Each table is `<data_dir>/<table>.<suffix>` — a single file — or a
+directory of that name holding many files.
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+from pyarrow import fs
+
+from .base import TX_COLUMNS, USER_COLUMNS, Loader, rebatch
+
+DEFAULT_DATA_DIR = Path(__file__).resolve().parent.parent / "files"
+
+
+class FileLoader(Loader):
+    """Base for single-format file backends; subclasses set FORMAT/SUFFIX."""
+
+    FORMAT: str
+    SUFFIX: str
+    supports_time_range = True
+
+    def __init__(
+        self,
+        data_dir: Path = DEFAULT_DATA_DIR,
+        batch_size: int = 10_000,
+        stream: bool = False,
+        read_ahead: int = 2,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> None:
+        # Scans always stream; `stream` is accepted for interface parity and
+        # read_ahead maps onto the scanner's own batch read-ahead.
+        self.data_dir = data_dir
+        self.batch_size = batch_size
+        self.read_ahead = read_ahead
+        self.since = since
+        self.until = until
+        self.fs = fs.LocalFileSystem(use_mmap=True)
+
+    def _scan(
+        self, table_name: str, columns: tuple[str, ...], filter=None
+    ) -> Iterator[pa.RecordBatch]:
+        path = self.data_dir / f"{table_name}.{self.SUFFIX}"
+        dataset = ds.dataset(str(path), format=self.FORMAT, filesystem=self.fs)
+        batches = dataset.to_batches(
+            columns=list(columns),
+            filter=filter,
+            batch_size=self.batch_size,
+            batch_readahead=self.read_ahead,
+        )
+        return rebatch(batches, self.batch_size)
+
+    def _time_filter(self):
+        expr = None
+        if self.since is not None:
+            expr = ds.field("timestamp") >= pa.scalar(self.since, pa.timestamp("us"))
+        if self.until is not None:
+            upper = ds.field("timestamp") < pa.scalar(self.until, pa.timestamp("us"))
+            expr = upper if expr is None else expr & upper
+        return expr
+
+    def users(self) -> Iterator[pa.RecordBatch]:
+        return self._scan("users", USER_COLUMNS)
+
+    def transactions(self) -> Iterator[pa.RecordBatch]:
+        return self._scan("transactions", TX_COLUMNS, self._time_filter())
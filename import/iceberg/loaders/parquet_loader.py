@@ -0,0 +1,12 @@
+"""Read users + transactions from local Parquet files.
+
+Useful when the lake exports plain Parquet without an Iceberg catalog, or
+to A/B the raw file read against the Iceberg backends. Column projection
+and the --since/--until row-group pruning are described in file_loader.py.
+"""
+from .file_loader import FileLoader
+
+
+class ParquetLoader(FileLoader):
+    FORMAT = "parquet"
+    SUFFIX = "parquet"
@@ -7,19 +7,31 @@ loader (and iceberg_to_memgraph.py) is unchanged.
 from pathlib import Path
 from typing import Iterator
 
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pyiceberg.catalog.sql import SqlCatalog
 
-from .base import Loader
+from .base import Loader, read_ahead, rebatch
+from .slices import RowGroup, delta_row_groups, plan_slices
 
 DEFAULT_WAREHOUSE = Path(__file__).resolve().parent.parent / "warehouse"
 NAMESPACE = "default"
 
 
 class PyIcebergLoader(Loader):
+    supports_slices = True
+    supports_incremental = True
+
     def __init__(
-        self, warehouse: Path = DEFAULT_WAREHOUSE, batch_size: int = 10_000
+        self,
+        warehouse: Path = DEFAULT_WAREHOUSE,
+        batch_size: int = 10_000,
+        stream: bool = False,
+        read_ahead: int = 2,
     ) -> None:
         self.batch_size = batch_size
+        self.stream = stream
+        self.read_ahead = read_ahead
         self.catalog = SqlCatalog(
             "default",
             **{
@@ -28,14 +40,48 @@ class PyIcebergLoader(Loader):
             },
         )
 
-    def _scan(self, table_name: str) -> Iterator[list[dict]]:
+    def _scan(self, table_name: str) -> Iterator[pa.RecordBatch]:
         table = self.catalog.load_table(f"{NAMESPACE}.{table_name}")
+        if self.stream:
+            # to_arrow_batch_reader() decodes one data file at a time instead
+            # of building the full table; batches are re-sliced to batch_size.
+            reader = table.scan().to_arrow_batch_reader()
+            yield from read_ahead(
+                rebatch(reader, self.batch_size), self.read_ahead
+            )
+            return
         arrow = table.scan().to_arrow()
-        for batch in arrow.to_batches(max_chunksize=self.batch_size):
-            yield batch.to_pylist()
+        yield from arrow.to_batches(max_chunksize=self.batch_size)
+
+    def slices(self, table_name: str, n: int) -> list[list[RowGroup]]:
+        return plan_slices(self.catalog.load_table(f"{NAMESPACE}.{table_name}"), n)
+
+    def read_slice(
+        self, table_name: str, groups: list[RowGroup]
+    ) -> Iterator[pa.RecordBatch]:
+        io = self.catalog.load_table(f"{NAMESPACE}.{table_name}").io
+
+        def batches() -> Iterator[pa.RecordBatch]:
+            for group in groups:
+                with io.new_input(group.path).open() as f:
+                    yield from pq.ParquetFile(f).iter_batches(
+                        batch_size=self.batch_size, row_groups=[group.index]
+                    )
+
+        return rebatch(batches(), self.batch_size)
+
+    def snapshot_id(self, table_name: str) -> int | None:
+        snapshot = self.catalog.load_table(f"{NAMESPACE}.{table_name}").current_snapshot()
+        return snapshot.snapshot_id if snapshot else None
+
+    def delta(
+        self, table_name: str, from_snapshot_id: int | None, to_snapshot_id: int
+    ) -> list[RowGroup]:
+        table = self.catalog.load_table(f"{NAMESPACE}.{table_name}")
+        return delta_row_groups(table, from_snapshot_id, to_snapshot_id)
 
-    def users(self) -> Iterator[list[dict]]:
+    def users(self) -> Iterator[pa.RecordBatch]:
         return self._scan("users")
 
-    def transactions(self) -> Iterator[list[dict]]:
+    def transactions(self) -> Iterator[pa.RecordBatch]:
         return self._scan("transactions")
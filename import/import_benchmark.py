@@ -0,0 +1,236 @@
+"""Compare the graph500 import strategies on the same server, side by side.
+
+The csv/ and cypher/ directories hold one node script and one edge script
+per strategy:
+
+    cypher-pymgclient    UNWIND batches, pymgclient         cypher/pymgclient/
+    cypher-neo4j         UNWIND batches, neo4j driver       cypher/neo4jpy/
+    loadcsv-pymgclient   concurrent LOAD CSV, pymgclient    csv/pymgclient/
+    loadcsv-neo4j        concurrent LOAD CSV, neo4j driver  csv/neo4jpy/
+
+This runs every chosen strategy for every chosen size and storage mode, and
+starts each run from the same state: a dropped graph (DROP GRAPH, so no
+leftover indexes or deltas), the requested storage mode, no indexes and a
+reset peak RSS. The node script runs first, then the edge script, each as
+its own process with its output in --log-dir, while an ImportMonitor
+samples Memgraph. The scripts run with the import profile of the storage
+mode (import_profile.py): bulk for IN_MEMORY_ANALYTICAL, transactional for
+IN_MEMORY_TRANSACTIONAL. They run with --managed, so they only create the
+:Node(id) index where their profile puts it; the starting state and the
+end of the import (the bulk profile's switch back to transactional mode
+and CREATE SNAPSHOT) are done here, once per run, and timed as "finish".
+The result is one table:
+
+    python3 import_benchmark.py small medium
+    python3 import_benchmark.py small --strategies cypher-pymgclient loadcsv-pymgclient \\
+        --storage-modes IN_MEMORY_ANALYTICAL IN_MEMORY_TRANSACTIONAL --output results.csv
+
+Times are wall times of the whole script, so they include reading the
+dataset and staging the CSV chunks, i.e. everything a real import pays for.
+All scripts use 10 workers. Concurrent LOAD CSV of edges needs
+IN_MEMORY_ANALYTICAL; in transactional mode a failing run is reported as
+such and the benchmark moves on.
+"""
+import argparse
+import csv
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import mgclient
+
+from import_monitor import ImportMonitor, mgclient_storage_info, reset_peak_rss
+from import_profile import PROFILES, ProfiledImport
+
+HOST = "127.0.0.1"
+PORT = 7687
+CONTAINER = "memgraph"
+
+DIRECTORY = Path(__file__).parent
+SIZES = ["small", "medium", "large"]
+STORAGE_MODES = ["IN_MEMORY_ANALYTICAL", "IN_MEMORY_TRANSACTIONAL"]
+# The import scripts set the storage mode through their --profile.
+PROFILE_FOR_MODE = {"IN_MEMORY_ANALYTICAL": "bulk", "IN_MEMORY_TRANSACTIONAL": "transactional"}
+
+# strategy: (node script, edge script)
+STRATEGIES = {
+    "cypher-pymgclient": ("cypher/pymgclient/concurrent_node_import.py", "cypher/pymgclient/concurrent_edge_import.py"),
+    "cypher-neo4j": ("cypher/neo4jpy/concurrent_node_import.py", "cypher/neo4jpy/concurrent_edge_import.py"),
+    "loadcsv-pymgclient": ("csv/pymgclient/concurrent_LOAD_CSV_nodes.py", "csv/pymgclient/concurrent_LOAD_CSV_edges.py"),
+    "loadcsv-neo4j": ("csv/neo4jpy/concurrent_LOAD_CSV_nodes.py", "csv/neo4jpy/concurrent_LOAD_CSV_edges.py"),
+}
+
+
+@dataclass
+class Result:
+    size: str
+    storage_mode: str
+    strategy: str
+    nodes: int = 0
+    node_seconds: float = 0.0
+    edges: int = 0
+    edge_seconds: float = 0.0
+    finish_seconds: float = 0.0
+    peak_mb: float | None = None
+    status: str = "ok"
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.node_seconds if self.node_seconds else 0.0
+
+    @property
+    def edges_per_second(self) -> float:
+        return self.edges / self.edge_seconds if self.edge_seconds else 0.0
+
+    @property
+    def seconds(self) -> float:
+        return self.node_seconds + self.edge_seconds + self.finish_seconds
+
+
+def profiled_import(cursor, storage_mode: str) -> ProfiledImport:
+    """The profile steps the --managed scripts leave to the benchmark."""
+    return ProfiledImport(cursor.execute, PROFILES[PROFILE_FOR_MODE[storage_mode]], log=False)
+
+
+def reset(storage_mode: str) -> None:
+    """The same starting point for every run: an empty graph in the requested
+    storage mode, without indexes."""
+    conn = mgclient.connect(host=HOST, port=PORT)
+    conn.autocommit = True
+    cursor = conn.cursor()
+    profiled_import(cursor, storage_mode).begin()
+    cursor.execute("FREE MEMORY")
+    conn.close()
+
+
+def finish(storage_mode: str) -> float:
+    """End the import the way the profile does; returns the seconds it took
+    (the bulk profile's storage mode switch and snapshot)."""
+    conn = mgclient.connect(host=HOST, port=PORT)
+    conn.autocommit = True
+    start = time.time()
+    profiled_import(conn.cursor(), storage_mode).finish()
+    seconds = time.time() - start
+    conn.close()
+    return seconds
+
+
+def run_phase(script: str, size: str, storage_mode: str, log) -> tuple[float, ImportMonitor, bool]:
+    """Run one import script; returns its wall time, the monitor that
+    sampled it and whether it succeeded."""
+    monitor = ImportMonitor(mgclient_storage_info(HOST, PORT), container=CONTAINER)
+    start = time.time()
+    with monitor:
+        process = subprocess.run(
+            [sys.executable, str(DIRECTORY / script), size, "--profile", PROFILE_FOR_MODE[storage_mode], "--managed"],
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+    return time.time() - start, monitor, process.returncode == 0
+
+
+def run_strategy(strategy: str, size: str, storage_mode: str, log_directory: Path) -> Result:
+    result = Result(size, storage_mode, strategy)
+    reset(storage_mode)
+    per_run_peak = reset_peak_rss(CONTAINER)
+
+    node_script, edge_script = STRATEGIES[strategy]
+    log_path = log_directory / f"{size}_{storage_mode}_{strategy}.log"
+    peaks = []
+    with open(log_path, "w") as log:
+        for phase, script in (("nodes", node_script), ("edges", edge_script)):
+            seconds, monitor, ok = run_phase(script, size, storage_mode, log)
+            last = monitor.samples[-1] if monitor.samples else None
+            peaks.append(monitor.peak("peak_rss") if per_run_peak else monitor.peak("rss"))
+            if phase == "nodes":
+                result.node_seconds = seconds
+                result.nodes = (last.vertex_count or 0) if last else 0
+            else:
+                result.edge_seconds = seconds
+                result.edges = (last.edge_count or 0) if last else 0
+            if not ok:
+                result.status = f"{phase} failed, see {log_path}"
+                break
+        else:
+            result.finish_seconds = finish(storage_mode)
+
+    peaks = [p for p in peaks if p is not None]
+    result.peak_mb = round(max(peaks) / 2**20, 1) if peaks else None
+    return result
+
+
+def print_table(results: list[Result]) -> None:
+    header = (
+        f"{'size':<7} {'storage mode':<24} {'strategy':<19} {'nodes/s':>11} {'edges/s':>11} "
+        f"{'node s':>8} {'edge s':>8} {'finish s':>8} {'wall s':>8} {'peak MB':>9}  status"
+    )
+    print()
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        peak = f"{r.peak_mb:>9,.1f}" if r.peak_mb is not None else f"{'-':>9}"
+        print(
+            f"{r.size:<7} {r.storage_mode:<24} {r.strategy:<19} {r.nodes_per_second:>11,.0f} "
+            f"{r.edges_per_second:>11,.0f} {r.node_seconds:>8.2f} {r.edge_seconds:>8.2f} {r.finish_seconds:>8.2f} "
+            f"{r.seconds:>8.2f} {peak}  {r.status}"
+        )
+
+
+def write_csv(results: list[Result], path: Path) -> None:
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([*Result.__dataclass_fields__, "nodes_per_second", "edges_per_second", "seconds"])
+        for r in results:
+            writer.writerow([*asdict(r).values(), r.nodes_per_second, r.edges_per_second, r.seconds])
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the graph500 import strategies against each other.")
+    parser.add_argument("sizes", nargs="+", choices=SIZES, help="Dataset sizes to import.")
+    parser.add_argument(
+        "--strategies",
+        nargs="+",
+        choices=list(STRATEGIES),
+        default=list(STRATEGIES),
+        help="Strategies to compare (default: all).",
+    )
+    parser.add_argument(
+        "--storage-modes",
+        nargs="+",
+        choices=STORAGE_MODES,
+        default=["IN_MEMORY_ANALYTICAL"],
+        help="Storage modes to run each strategy in (default: IN_MEMORY_ANALYTICAL).",
+    )
+    parser.add_argument(
+        "--log-dir",
+        type=Path,
+        default=Path("benchmark_logs"),
+        help="Where the output of every import script goes (default: ./benchmark_logs).",
+    )
+    parser.add_argument("--output", type=Path, default=None, help="Also write the results to this CSV file.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    args.log_dir.mkdir(parents=True, exist_ok=True)
+    results = []
+    for size in args.sizes:
+        for storage_mode in args.storage_modes:
+            for strategy in args.strategies:
+                print(f"[{size}] {storage_mode} {strategy} ...", flush=True)
+                result = run_strategy(strategy, size, storage_mode, args.log_dir)
+                print(
+                    f"[{size}] {storage_mode} {strategy}: {result.seconds:.2f} s, {result.status}",
+                    flush=True,
+                )
+                results.append(result)
+    print_table(results)
+    if args.output:
+        write_csv(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""Background sampling of Memgraph memory and graph size during an import.
+
+Reading VmHWM before and after an import gives one number: the peak. An
+ImportMonitor polls Memgraph at a fixed interval while the import runs and
+keeps the whole time series:
+
+    monitor = ImportMonitor(mgclient_storage_info(HOST, PORT))
+    with monitor:
+        ...run the import...
+    print(monitor.summary())
+    monitor.write_csv("samples.csv")   # optional, for plotting
+
+Each sample holds the vertex and edge counts and memory_tracked from SHOW
+STORAGE INFO, plus the resident set size (VmRSS) and its peak (VmHWM) of the
+Memgraph process from /proc. The ingestion rate over time is the change in
+vertices and edges between consecutive samples.
+
+/proc is read with `docker exec <container> cat /proc/1/status` (no TTY
+needed), or directly from /proc/<pid>/status for a Memgraph running on the
+host. Without either, RSS falls back to memory_res from SHOW STORAGE INFO.
+
+The sampler runs in a thread of the importing process and opens its own
+connection, so it works next to multiprocessing pools. Like
+adaptive_batching.py it only needs the standard library; the client is
+imported by the *_storage_info factory the script picks.
+"""
+import csv
+import re
+import subprocess
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+UNITS = {"B": 1, "KiB": 2**10, "MiB": 2**20, "GiB": 2**30, "TiB": 2**40}
+
+
+def parse_bytes(value) -> int | None:
+    """memory_tracked and friends come as bytes or, in newer Memgraph
+    versions, as strings like "1.52GiB"."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]iB|B)?\s*", str(value))
+    if not match:
+        return None
+    return int(float(match.group(1)) * UNITS[match.group(2) or "B"])
+
+
+def mgclient_storage_info(host: str = "127.0.0.1", port: int = 7687) -> Callable[[], dict]:
+    """SHOW STORAGE INFO through pymgclient, on a connection of its own."""
+    conn = None
+
+    def storage_info() -> dict:
+        nonlocal conn
+        import mgclient
+
+        if conn is None or conn.status != mgclient.CONN_STATUS_READY:
+            conn = mgclient.connect(host=host, port=port)
+            conn.autocommit = True
+        cursor = conn.cursor()
+        cursor.execute("SHOW STORAGE INFO")
+        return dict(cursor.fetchall())
+
+    return storage_info
+
+
+def neo4j_storage_info(uri: str = "bolt://localhost:7687", auth=("", "")) -> Callable[[], dict]:
+    """SHOW STORAGE INFO through the neo4j driver."""
+    driver = None
+
+    def storage_info() -> dict:
+        nonlocal driver
+        from neo4j import GraphDatabase
+
+        if driver is None:
+            driver = GraphDatabase.driver(uri, auth=auth)
+        records, _, _ = driver.execute_query("SHOW STORAGE INFO")
+        return {record["storage info"]: record["value"] for record in records}
+
+    return storage_info
+
+
+def gqlalchemy_storage_info(host: str = "127.0.0.1", port: int = 7687) -> Callable[[], dict]:
+    """SHOW STORAGE INFO through GQLAlchemy."""
+    memgraph = None
+
+    def storage_info() -> dict:
+        nonlocal memgraph
+        from gqlalchemy import Memgraph
+
+        if memgraph is None:
+            memgraph = Memgraph(host=host, port=port)
+        return {
+            row["storage info"]: row["value"]
+            for row in memgraph.execute_and_fetch("SHOW STORAGE INFO")
+        }
+
+    return storage_info
+
+
+def read_proc_status(container: str | None = "memgraph", pid: int | None = None) -> dict[str, int]:
+    """VmRSS and VmHWM of the Memgraph process, in bytes."""
+    if pid is not None:
+        with open(f"/proc/{pid}/status") as f:
+            status = f.read()
+    else:
+        status = subprocess.run(
+            ["docker", "exec", container, "cat", "/proc/1/status"],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    memory = {}
+    for line in status.splitlines():
+        key, _, value = line.partition(":")
+        if key in ("VmRSS", "VmHWM"):
+            memory[key] = int(value.split()[0]) * 1024
+    return memory
+
+
+def reset_peak_rss(container: str = "memgraph") -> bool:
+    """Reset VmHWM of the Memgraph process, so the next reading is the peak
+    of what runs from now on. Returns False if the kernel or container does
+    not allow it; VmHWM then stays the peak since Memgraph started."""
+    return subprocess.run(
+        ["docker", "exec", container, "sh", "-c", "echo 5 > /proc/1/clear_refs"],
+        capture_output=True,
+    ).returncode == 0
+
+
+@dataclass
+class Sample:
+    elapsed: float  # seconds since the monitor started
+    vertex_count: int | None
+    edge_count: int | None
+    memory_tracked: int | None  # bytes
+    rss: int | None  # bytes
+    peak_rss: int | None  # VmHWM, bytes
+
+
+class ImportMonitor:
+    """Samples Memgraph every `interval` seconds between start() and stop().
+
+    container/pid select where /proc is read (see read_proc_status); pass
+    container=None and pid=None to skip /proc. With log, every sample is
+    printed as it is taken."""
+
+    def __init__(
+        self,
+        storage_info: Callable[[], dict] | None,
+        interval: float = 1.0,
+        container: str | None = "memgraph",
+        pid: int | None = None,
+        log: bool = False,
+    ) -> None:
+        self.storage_info = storage_info
+        self.interval = interval
+        self.container = container
+        self.pid = pid
+        self.log = log
+        self.samples: list[Sample] = []
+        self.errors = 0
+        self._proc = container is not None or pid is not None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._start = 0.0
+
+    def start(self) -> "ImportMonitor":
+        self._start = time.monotonic()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="import-monitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop sampling, after one last sample of the finished import."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.sample()
+
+    def __enter__(self) -> "ImportMonitor":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while True:
+            self.sample()
+            if self._stop.wait(self.interval):
+                return
+
+    def sample(self) -> Sample:
+        info: dict = {}
+        memory: dict = {}
+        if self.storage_info is not None:
+            try:
+                info = self.storage_info()
+            except Exception as e:
+                self.errors += 1
+                if self.log:
+                    print(f"[monitor] SHOW STORAGE INFO failed: {e}")
+        if self._proc:
+            try:
+                memory = read_proc_status(self.container, self.pid)
+            except (OSError, subprocess.CalledProcessError):
+                # No docker or no such process: stop trying, use memory_res.
+                self._proc = False
+        sample = Sample(
+            elapsed=time.monotonic() - self._start,
+            vertex_count=info.get("vertex_count"),
+            edge_count=info.get("edge_count"),
+            memory_tracked=parse_bytes(info.get("memory_tracked")),
+            rss=memory.get("VmRSS", parse_bytes(info.get("memory_res"))),
+            peak_rss=memory.get("VmHWM"),
+        )
+        self.samples.append(sample)
+        if self.log:
+            print(self._format(sample))
+        return sample
+
+    @staticmethod
+    def _format(sample: Sample) -> str:
+        return (
+            f"[monitor] {sample.elapsed:7.1f} s  vertices {_count(sample.vertex_count)}  "
+            f"edges {_count(sample.edge_count)}  memory_tracked {_mb(sample.memory_tracked)}  "
+            f"RSS {_mb(sample.rss)}"
+        )
+
+    def rates(self) -> list[tuple[float, float, float]]:
+        """(elapsed, vertices/s, edges/s) between consecutive samples."""
+        rates = []
+        for previous, current in zip(self.samples, self.samples[1:]):
+            seconds = current.elapsed - previous.elapsed
+            if seconds <= 0:
+                continue
+            rates.append(
+                (
+                    current.elapsed,
+                    _delta(previous.vertex_count, current.vertex_count) / seconds,
+                    _delta(previous.edge_count, current.edge_count) / seconds,
+                )
+            )
+        return rates
+
+    def peak(self, field: str) -> int | None:
+        values = [getattr(s, field) for s in self.samples if getattr(s, field) is not None]
+        return max(values, default=None)
+
+    def summary(self) -> str:
+        if not self.samples:
+            return "No samples taken"
+        first, last = self.samples[0], self.samples[-1]
+        seconds = last.elapsed - first.elapsed
+        lines = [
+            f"Sampled {len(self.samples)} times over {seconds:.1f} s: "
+            f"{_count(last.vertex_count)} vertices, {_count(last.edge_count)} edges"
+        ]
+        rates = self.rates()
+        for index, kind, field in ((1, "vertices", "vertex_count"), (2, "edges", "edge_count")):
+            added = _delta(getattr(first, field), getattr(last, field))
+            if added and seconds > 0:
+                lines.append(
+                    f"Ingestion rate: {added / seconds:,.0f} {kind}/s on average, "
+                    f"{max(r[index] for r in rates):,.0f} {kind}/s at best"
+                )
+        lines.append(
+            f"Peak RSS: {_mb(self.peak('peak_rss') or self.peak('rss'))}, "
+            f"peak memory_tracked: {_mb(self.peak('memory_tracked'))}"
+        )
+        return "\n".join(lines)
+
+    def write_csv(self, path: str) -> None:
+        """The time series, one row per sample, with the rate since the
+        previous sample."""
+        rates = {elapsed: (v, e) for elapsed, v, e in self.rates()}
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow([*Sample.__dataclass_fields__, "vertices_per_second", "edges_per_second"])
+            for sample in self.samples:
+                v, e = rates.get(sample.elapsed, ("", ""))
+                writer.writerow([*asdict(sample).values(), v, e])
+
+
+def _delta(before: int | None, after: int | None) -> int:
+    return (after or 0) - (before or 0)
+
+
+def _count(value: int | None) -> str:
+    return "-" if value is None else f"{value:,}"
+
+
+def _mb(value: int | None) -> str:
+    return "-" if value is None else f"{value / 2**20:,.1f} MB"
@@ -0,0 +1,143 @@
+"""Import profiles: the storage mode, index and snapshot steps around a load.
+
+Every importer needs the same bookkeeping around its node and edge writes,
+and the order matters for speed:
+
+    bulk           STORAGE MODE IN_MEMORY_ANALYTICAL, DROP GRAPH
+                   load nodes, with only the indexes the node writes need
+                   create the indexes the edge writes MATCH on
+                   load edges
+                   create the remaining indexes
+                   STORAGE MODE IN_MEMORY_TRANSACTIONAL, CREATE SNAPSHOT
+
+    transactional  STORAGE MODE IN_MEMORY_TRANSACTIONAL, DROP GRAPH
+                   create every index, load nodes, load edges
+
+Building an index once over loaded nodes is cheaper than updating it on
+every insert, and analytical mode skips the delta bookkeeping. Analytical
+mode has no WAL, though, so the bulk profile ends with a snapshot: until it
+is written, a restart loses the import. The transactional profile is for
+loads into a graph that serves other clients, or that need rollbacks.
+
+    profiled = ProfiledImport(db.execute, BULK,
+                              edge_indexes=["CREATE INDEX ON :Node(id)"])
+    profiled.run(load_nodes, load_edges)
+    print(profiled.summary())
+
+or step by step, with begin(), nodes_loaded() and finish() around the
+caller's own phases. Every step is timed. execute runs one query outside an
+explicit transaction (STORAGE MODE, index DDL and CREATE SNAPSHOT cannot
+run inside one), e.g. gqlalchemy's Memgraph.execute or a pymgclient cursor
+with autocommit on. Like adaptive_batching.py, this only needs the standard
+library.
+"""
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Sequence
+
+ANALYTICAL = "IN_MEMORY_ANALYTICAL"
+TRANSACTIONAL = "IN_MEMORY_TRANSACTIONAL"
+
+
+@dataclass(frozen=True)
+class ImportProfile:
+    name: str
+    load_mode: str  # storage mode while loading
+    final_mode: str | None  # mode to switch to afterwards; None to stay
+    defer_indexes: bool  # build indexes only once the data they cover is in
+    snapshot: bool  # CREATE SNAPSHOT at the end
+
+
+BULK = ImportProfile("bulk", ANALYTICAL, TRANSACTIONAL, defer_indexes=True, snapshot=True)
+TRANSACTIONAL_LOAD = ImportProfile("transactional", TRANSACTIONAL, None, defer_indexes=False, snapshot=False)
+
+PROFILES = {profile.name: profile for profile in (BULK, TRANSACTIONAL_LOAD)}
+
+
+@dataclass
+class ProfiledImport:
+    """Runs a profile's steps around the caller's loads.
+
+    node_indexes   needed while loading nodes (e.g. the MERGE key); always
+                   created first
+    edge_indexes   what the edge writes MATCH nodes on; deferred to after
+                   the nodes in a profile with defer_indexes
+    late_indexes   nothing during the load needs them; deferred to the end
+    reset          DROP GRAPH first (False to load into the existing graph)
+    managed        the caller has emptied the graph and set the storage
+                   mode, and ends the import itself (import_benchmark.py):
+                   only the indexes are created, no DROP GRAPH, storage
+                   mode switch or snapshot
+    """
+
+    execute: Callable[[str], object]
+    profile: ImportProfile = BULK
+    node_indexes: Sequence[str] = ()
+    edge_indexes: Sequence[str] = ()
+    late_indexes: Sequence[str] = ()
+    reset: bool = True
+    managed: bool = False
+    log: bool = True
+    timings: list[tuple[str, float]] = field(default_factory=list)
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """Time a step; steps that fail are not recorded."""
+        start = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - start
+        self.timings.append((name, seconds))
+        if self.log:
+            print(f"[{self.profile.name}] {name}: {seconds:.2f} s")
+
+    def _create(self, name: str, queries: Sequence[str]) -> None:
+        if queries:
+            with self.step(name):
+                for query in queries:
+                    self.execute(query)
+
+    def begin(self) -> None:
+        if self.reset and not self.managed:
+            with self.step("drop graph"):
+                # DROP GRAPH is only available in analytical mode.
+                self.execute(f"STORAGE MODE {ANALYTICAL}")
+                self.execute("DROP GRAPH")
+        if not self.managed:
+            with self.step(f"storage mode {self.profile.load_mode}"):
+                self.execute(f"STORAGE MODE {self.profile.load_mode}")
+        if self.profile.defer_indexes:
+            self._create("node indexes", self.node_indexes)
+        else:
+            self._create("indexes", [*self.node_indexes, *self.edge_indexes, *self.late_indexes])
+
+    def nodes_loaded(self) -> None:
+        if self.profile.defer_indexes:
+            self._create("edge indexes", self.edge_indexes)
+
+    def finish(self) -> None:
+        if self.profile.defer_indexes:
+            self._create("late indexes", self.late_indexes)
+        if self.managed:
+            return
+        if self.profile.final_mode:
+            with self.step(f"storage mode {self.profile.final_mode}"):
+                self.execute(f"STORAGE MODE {self.profile.final_mode}")
+        if self.profile.snapshot:
+            with self.step("create snapshot"):
+                self.execute("CREATE SNAPSHOT")
+
+    def run(self, load_nodes: Callable[[], object], load_edges: Callable[[], object] | None = None) -> None:
+        self.begin()
+        with self.step("load nodes"):
+            load_nodes()
+        self.nodes_loaded()
+        if load_edges is not None:
+            with self.step("load edges"):
+                load_edges()
+        self.finish()
+
+    def summary(self) -> str:
+        total = sum(seconds for _, seconds in self.timings)
+        steps = ", ".join(f"{name} {seconds:.2f} s" for name, seconds in self.timings)
+        return f"Profile {self.profile.name}: {total:.2f} s ({steps})"
@@ -1,9 +1,17 @@
 import mysql.connector
 from gqlalchemy import Memgraph
+from pathlib import Path
+import argparse
 import random
 import string
+import sys
 import time
 
+sys.path.insert(0, str(Path(__file__).parents[2]))
+from migration_checkpoint import Checkpoint
+from migration_compaction import compact
+from parallel_migration import MigrationTask, ParallelMigration
+
 # Configuration
 AURORA_HOST = "localhost"
 AURORA_PORT = 3306
@@ -14,6 +22,21 @@ AURORA_DATABASE = "testdb"
 MEMGRAPH_HOST = "localhost"
 MEMGRAPH_PORT = 7688
 
+# How Memgraph (inside Docker) reaches Aurora
+AURORA_CONFIG = """{
+    host: "aurora",
+    port: 3306,
+    user: "testuser",
+    password: "testpass",
+    database: "testdb"
+}"""
+
+# Tables (then relationship tables) migrated at once
+WORKERS = 8
+
+# Which tables are in, for --resume
+CHECKPOINT = Path(__file__).with_name("migrate.checkpoint.json")
+
 # Configuration for the complete migration
 TABLES = [f"Table{i}" for i in range(1, 6)]  # Table1, Table2, ..., Table5
 ROWS_PER_TABLE = 100
@@ -149,15 +172,25 @@ def ensure_aurora_has_data():
     print("Aurora data creation complete.")
 
 
-def migrate_with_gqlalchemy():
-    """Migrate data from Aurora to Memgraph using explicit SQL queries."""
+def migrate_with_gqlalchemy(keep_helpers=False, checkpoint=None):
+    """Migrate data from Aurora to Memgraph using explicit SQL queries.
+
+    Afterwards the __MigrationNode__ label, __unique_id__ property and their
+    index are removed again, unless keep_helpers.
+
+    With a checkpoint that resumes an earlier run, the graph is kept and
+    only the tables that run didn't finish are migrated."""
     try:
         print("[Worker 1] Connecting to Memgraph...")
         memgraph = Memgraph(host=MEMGRAPH_HOST, port=MEMGRAPH_PORT)
 
-        print("[Worker 1] Setting storage mode and clearing graph...")
-        memgraph.execute("STORAGE MODE IN_MEMORY_ANALYTICAL")
-        memgraph.execute("DROP GRAPH")
+        if checkpoint is not None and checkpoint.resumed:
+            print(f"[Worker 1] Resuming from {checkpoint.path}, keeping the graph...")
+            memgraph.execute("STORAGE MODE IN_MEMORY_ANALYTICAL")
+        else:
+            print("[Worker 1] Setting storage mode and clearing graph...")
+            memgraph.execute("STORAGE MODE IN_MEMORY_ANALYTICAL")
+            memgraph.execute("DROP GRAPH")
 
         print("[Worker 1] Creating necessary indices...")
         memgraph.execute("CREATE INDEX ON :__MigrationNode__(__unique_id__)")
@@ -179,50 +212,44 @@ def migrate_with_gqlalchemy():
 
         print("[Worker 1] Starting migration from Aurora to Memgraph...")
         
-        # Migrate Table1-Table6 as nodes
-        for table_name in TABLES:
-            print(f"[Worker 1] Migrating {table_name} as nodes...")
-            
-            # Create nodes directly from Aurora data
-            memgraph.execute(
-                f"""
-                CALL migrate.mysql("SELECT * FROM `{table_name}`", {{
-                    host: "aurora",
-                    port: 3306,
-                    user: "testuser",
-                    password: "testpass",
-                    database: "testdb"
-                }}) YIELD row
+        # Migrate Table1-Table6 as nodes, then the RelTable relationships.
+        # Every task CREATEs, so its cleanup deletes what an interrupted
+        # attempt left behind before it runs again.
+        migration = ParallelMigration(
+            lambda: Memgraph(host=MEMGRAPH_HOST, port=MEMGRAPH_PORT),
+            workers=WORKERS,
+            checkpoint=checkpoint,
+        )
+        migration.run_phase("nodes", [
+            MigrationTask(
+                name=table_name,
+                query=f"""
+                CALL migrate.mysql("SELECT * FROM `{table_name}`", {AURORA_CONFIG}) YIELD row
                 CREATE (n:{table_name}:__MigrationNode__)
                 SET n += row, n.__unique_id__ = "{table_name}_" + row.id
-                """
+                RETURN count(n) AS migrated
+                """,
+                cleanup=f"MATCH (n:{table_name}) DETACH DELETE n",
             )
-            
-            print(f"[Worker 1] Created {table_name} nodes")
-
-        # Migrate RelTable relationships
-        for i, rel_table_name in enumerate(RELATIONSHIP_TABLES):
-            print(f"[Worker 1] Migrating {rel_table_name} relationships...")
-            
-            # Create relationships directly from Aurora data
-            memgraph.execute(
-                f"""
-                CALL migrate.mysql("SELECT * FROM `{rel_table_name}`", {{
-                    host: "aurora",
-                    port: 3306,
-                    user: "testuser",
-                    password: "testpass",
-                    database: "testdb"
-                }}) YIELD row
+            for table_name in TABLES
+        ])
+        migration.run_phase("relationships", [
+            MigrationTask(
+                name=rel_table_name,
+                query=f"""
+                CALL migrate.mysql("SELECT * FROM `{rel_table_name}`", {AURORA_CONFIG}) YIELD row
                 MATCH (a:__MigrationNode__ {{__unique_id__: "Table{i+1}_" + row.from_id}}), (b:__MigrationNode__ {{__unique_id__: "Table{i+2}_" + row.to_id}})
                 CREATE (a)-[r:{rel_table_name} {{
                     strength: row.strength,
                     created_at: row.created_at
                 }}]->(b)
-                """
+                RETURN count(r) AS migrated
+                """,
+                cleanup=f"MATCH ()-[r:{rel_table_name}]->() DELETE r",
             )
-            
-            print(f"[Worker 1] Created {rel_table_name} relationships")
+            for i, rel_table_name in enumerate(RELATIONSHIP_TABLES)
+        ])
+        print(migration.summary())
 
         print("[Worker 1] Migration completed.")
 
@@ -235,22 +262,65 @@ def migrate_with_gqlalchemy():
         relationship_count = list(memgraph.execute_and_fetch("MATCH ()-[r]->() RETURN count(r) as count"))
         print(f"[Worker 1] Total relationships in Memgraph: {relationship_count[0]['count']}")
 
+        if not keep_helpers:
+            print("[Worker 1] Removing __MigrationNode__ and __unique_id__ from all nodes...")
+            report = compact(
+                lambda: Memgraph(host=MEMGRAPH_HOST, port=MEMGRAPH_PORT),
+                TABLES,
+                "__MigrationNode__",
+                "__unique_id__",
+            )
+            print(f"[Worker 1] {report.summary()}")
+
         print("[Worker 1] Creating snapshot...")
         memgraph.execute("CREATE SNAPSHOT")
+        if checkpoint is not None:
+            checkpoint.remove()
 
     except Exception as e:
         print(f"[Worker 1] Error during migration: {e}")
+        if checkpoint is not None:
+            print(f"[Worker 1] {checkpoint.summary()}; rerun with --resume to continue")
         import traceback
         traceback.print_exc()
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Complete migration from Amazon Aurora to Memgraph.")
+    parser.add_argument(
+        "--keep-helpers",
+        action="store_true",
+        help="Keep the __MigrationNode__ label, __unique_id__ property and their index after the migration.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted migration: keep the Aurora data and the graph in Memgraph, "
+             "and skip the tables the checkpoint has as done.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=CHECKPOINT,
+        help=f"Checkpoint file (default: {CHECKPOINT.name} next to this script).",
+    )
+    return parser.parse_args()
+
+
 def main():
     """Main function to orchestrate the complete migration process."""
+    args = parse_args()
     print("=== Complete Migration from Amazon Aurora to Memgraph ===")
     
-    # Step 1: Ensure Aurora has the required data
+    checkpoint = Checkpoint(args.checkpoint, resume=args.resume)
+
+    # Step 1: Ensure Aurora has the required data; regenerating it would
+    # not match what is already migrated.
     print("\n1. Setting up Aurora data...")
-    ensure_aurora_has_data()
+    if checkpoint.resumed:
+        print("Resuming: keeping the existing Aurora data.")
+    else:
+        ensure_aurora_has_data()
 
     # Step 3: Wait a moment for services to be ready
     print("\n3. Waiting for services to be ready...")
@@ -258,7 +328,7 @@ def main():
     
     # Step 4: Perform migration
     print("\n4. Starting migration to Memgraph...")
-    migrate_with_gqlalchemy()
+    migrate_with_gqlalchemy(args.keep_helpers, checkpoint)
     
     print("\n=== Migration Complete ===")
 
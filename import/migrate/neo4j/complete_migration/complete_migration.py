@@ -1,11 +1,26 @@
 from neo4j import GraphDatabase
 from gqlalchemy import Memgraph
+from pathlib import Path
+import argparse
 import random
 import string
+import sys
+
+sys.path.insert(0, str(Path(__file__).parents[3]))
+from migration_checkpoint import Checkpoint
+from migration_compaction import compact
+from parallel_migration import MigrationTask, ParallelMigration
 
 NEO4J_URI = "bolt://localhost:7687"
 MEMGRAPH_HOST = "localhost"
 MEMGRAPH_PORT = 7688
+NEO4J_CONFIG = '{host: "neo4j", port: 7687}'
+
+# Memgraph connections migrating labels (then relationship types) at once
+WORKERS = 8
+
+# Which labels and relationship types are in, for --resume
+CHECKPOINT = Path(__file__).with_name("complete_migration.checkpoint.json")
 
 # Configuration for the complete migration
 LABELS = [f"Label{i}" for i in range(1, 11)]  # Label1, Label2, ..., Label10
@@ -103,8 +118,58 @@ def inspect_neo4j_schema(driver):
         }
 
 
-def migrate_with_gqlalchemy():
-    """Migrate data from Neo4j to Memgraph using the migrate.neo4j module with apoc.meta.schema()."""
+def node_task(label, expected):
+    """Every node is migrated once, by the query of its first label; SET
+    n:row.labels adds the others. Migrating a node under each of its labels
+    would MERGE it from several workers at once."""
+    return MigrationTask(
+        name=label,
+        query=f"""
+            call migrate_neo4j_driver2.neo4j(
+                "MATCH (n:{label}) WHERE labels(n)[0] = '{label}' RETURN elementId(n) AS elementId, labels(n) as labels, properties(n) AS props",
+                {NEO4J_CONFIG}
+            ) YIELD row
+            MERGE (n:{label}:__MigrationNode__ {{__elementId__: row.elementId}})
+            SET n:row.labels
+            SET n += row.props
+            RETURN count(n) AS migrated
+            """,
+        expected=expected,
+        count_query=f"MATCH (n:{label}) RETURN count(n) AS count",
+    )
+
+
+def relationship_task(rel_type, expected):
+    return MigrationTask(
+        name=rel_type,
+        query=f"""
+            call migrate_neo4j_driver2.neo4j(
+                "MATCH (a)-[r:{rel_type}]->(b) RETURN elementId(a) AS from_elementId, elementId(b) AS to_elementId, properties(r) AS rel_props",
+                {NEO4J_CONFIG}
+            ) YIELD row
+            MATCH (a:__MigrationNode__ {{__elementId__: row.from_elementId}})
+            MATCH (b:__MigrationNode__ {{__elementId__: row.to_elementId}})
+            CREATE (a)-[r:{rel_type}]->(b)
+            SET r += row.rel_props
+            RETURN count(r) AS migrated
+            """,
+        expected=expected,
+        count_query=f"MATCH ()-[r:{rel_type}]->() RETURN count(r) AS count",
+        # CREATE isn't idempotent: a retried or resumed type starts from none.
+        cleanup=f"MATCH ()-[r:{rel_type}]->() DELETE r",
+    )
+
+
+def migrate_with_gqlalchemy(workers=WORKERS, keep_helpers=False, checkpoint=None):
+    """Migrate data from Neo4j to Memgraph using the migrate.neo4j module with apoc.meta.schema().
+
+    All node labels are migrated at once on `workers` Memgraph connections,
+    then, once every node is in, all relationship types. Afterwards the
+    __MigrationNode__ label, __elementId__ property and their index are
+    removed again, unless keep_helpers.
+
+    With a checkpoint that resumes an earlier run, the graph is kept and
+    only the labels and types that run didn't finish are migrated."""
     try:
         print("[Worker 1] Connecting to Memgraph...")
         memgraph = Memgraph(host=MEMGRAPH_HOST, port=MEMGRAPH_PORT)
@@ -113,17 +178,22 @@ def migrate_with_gqlalchemy():
             print(query)
             memgraph.execute(query)
 
-        print("[Worker 1] Setting storage mode and clearing graph...")
-        execute_query("STORAGE MODE IN_MEMORY_ANALYTICAL")
-        execute_query("DROP GRAPH")
+        resumed = checkpoint is not None and checkpoint.resumed
+        if resumed:
+            print(f"[Worker 1] Resuming from {checkpoint.path}, keeping the graph...")
+            execute_query("STORAGE MODE IN_MEMORY_ANALYTICAL")
+        else:
+            print("[Worker 1] Setting storage mode and clearing graph...")
+            execute_query("STORAGE MODE IN_MEMORY_ANALYTICAL")
+            execute_query("DROP GRAPH")
 
         print("[Worker 1] Creating __MigrationNode__ index on __elementId__...")
         execute_query("CREATE INDEX ON :__MigrationNode__(__elementId__)")
 
         print("[Worker 1] Verifying Neo4j connectivity...")
         execute_query(
-            """
-            call migrate_neo4j_driver2.neo4j("RETURN 1;", {host: "neo4j", port: 7687}) YIELD row RETURN row;
+            f"""
+            call migrate_neo4j_driver2.neo4j("RETURN 1;", {NEO4J_CONFIG}) YIELD row RETURN row;
             """
         )
 
@@ -131,23 +201,23 @@ def migrate_with_gqlalchemy():
         
         # Get comprehensive schema information using apoc.meta.schema()
         schema_result = list(memgraph.execute_and_fetch(
-            """
-            call migrate_neo4j_driver2.neo4j("CALL apoc.meta.schema() YIELD value RETURN value", {host: "neo4j", port: 7687}) YIELD row RETURN row.value as schema
+            f"""
+            call migrate_neo4j_driver2.neo4j("CALL apoc.meta.schema() YIELD value RETURN value", {NEO4J_CONFIG}) YIELD row RETURN row.value as schema
             """
         ))
         
         schema_data = schema_result[0]["schema"]
         
         # Extract labels and relationship types from schema
-        discovered_labels = []
-        discovered_rel_types = []
+        discovered_labels = {}
+        discovered_rel_types = {}
         
         for key, info in schema_data.items():
             if info.get("type") == "node":
-                discovered_labels.append(key)
+                discovered_labels[key] = info.get("count")
                 print(f"[Worker 1] Discovered node label: {key} (count: {info.get('count', 'unknown')})")
             elif info.get("type") == "relationship":
-                discovered_rel_types.append(key)
+                discovered_rel_types[key] = info.get("count")
                 print(f"[Worker 1] Discovered relationship type: {key} (count: {info.get('count', 'unknown')})")
         
         # Create indexes for all discovered labels
@@ -155,44 +225,23 @@ def migrate_with_gqlalchemy():
             memgraph.execute(f"CREATE INDEX ON :{label}")
             memgraph.execute(f"CREATE INDEX ON :{label}(id)")
 
-        print("[Worker 1] Starting migration of nodes...")
-        
-        # Migrate nodes for each discovered label with __elementId__
-        for label in discovered_labels:
-            print(f"[Worker 1] Migrating {label} nodes...")
-            execute_query(
-                f"""
-                call migrate_neo4j_driver2.neo4j(
-                    "MATCH (n:{label}) RETURN elementId(n) AS elementId, labels(n) as labels, properties(n) AS props",
-                    {{host: "neo4j", port: 7687}}
-                ) YIELD row
-                MERGE (n:{label}:__MigrationNode__ {{__elementId__: row.elementId}})
-                SET n:row.labels
-                SET n += row.props
-                """
-            )
-            print(f"[Worker 1] Completed migration of {label} nodes")
-
-        print("[Worker 1] Starting migration of relationships...")
-        
-        # Migrate relationships for each discovered type using __elementId__ for matching
-        for rel_type in discovered_rel_types:
-            print(f"[Worker 1] Migrating {rel_type} relationships...")
-            execute_query(
-                f"""
-                call migrate_neo4j_driver2.neo4j(
-                    "MATCH (a)-[r:{rel_type}]->(b) RETURN elementId(a) AS from_elementId, elementId(b) AS to_elementId, properties(r) AS rel_props",
-                    {{host: "neo4j", port: 7687}}
-                ) YIELD row
-                MATCH (a:__MigrationNode__ {{__elementId__: row.from_elementId}})
-                MATCH (b:__MigrationNode__ {{__elementId__: row.to_elementId}})
-                CREATE (a)-[r:{rel_type}]->(b)
-                SET r += row.rel_props
-                """
-            )
-            print(f"[Worker 1] Completed migration of {rel_type} relationships")
+        def connect():
+            return Memgraph(host=MEMGRAPH_HOST, port=MEMGRAPH_PORT)
+
+        migration = ParallelMigration(connect, workers=workers, checkpoint=checkpoint)
+
+        print(f"[Worker 1] Starting migration of nodes on {workers} workers...")
+        migration.run_phase("nodes", [node_task(label, count) for label, count in discovered_labels.items()])
+
+        # Every relationship MATCHes nodes of any label: start only once all are in.
+        print(f"[Worker 1] Starting migration of relationships on {workers} workers...")
+        migration.run_phase(
+            "relationships",
+            [relationship_task(rel_type, count) for rel_type, count in discovered_rel_types.items()],
+        )
 
         print("[Worker 1] Migration complete.")
+        print(migration.summary())
         
         # Verify migration results
         print("[Worker 1] Verifying migration results...")
@@ -206,20 +255,64 @@ def migrate_with_gqlalchemy():
             count = result[0]["count"]
             print(f"[Worker 1] {rel_type} relationships in Memgraph: {count}")
 
+        if not keep_helpers:
+            print("[Worker 1] Removing __MigrationNode__ and __elementId__ from all nodes...")
+            report = compact(connect, list(discovered_labels), "__MigrationNode__", "__elementId__", workers=workers)
+            print(f"[Worker 1] {report.summary()}")
+
         print("[Worker 1] Creating snapshot...")
         memgraph.execute("CREATE SNAPSHOT")
+        if checkpoint is not None:
+            checkpoint.remove()
 
     except Exception as e:
         print(f"[Worker 1] Error during migration: {e}")
+        if checkpoint is not None:
+            print(f"[Worker 1] {checkpoint.summary()}; rerun with --resume to continue")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Complete migration from Neo4j to Memgraph.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=WORKERS,
+        help=f"Labels (then relationship types) migrated at once, each on its own Memgraph connection (default: {WORKERS}).",
+    )
+    parser.add_argument(
+        "--keep-helpers",
+        action="store_true",
+        help="Keep the __MigrationNode__ label, __elementId__ property and their index after the migration.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted migration: keep the Neo4j data and the graph in Memgraph, "
+             "and skip the labels and relationship types the checkpoint has as done.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=CHECKPOINT,
+        help=f"Checkpoint file (default: {CHECKPOINT.name} next to this script).",
+    )
+    return parser.parse_args()
 
 
 def main():
     """Main function to orchestrate the complete migration process."""
+    args = parse_args()
     print("=== Complete Migration from Neo4j to Memgraph ===")
     
-    # Step 1: Ensure Neo4j has the required data
+    checkpoint = Checkpoint(args.checkpoint, resume=args.resume)
+
+    # Step 1: Ensure Neo4j has the required data; regenerating it would
+    # give the nodes new elementIds.
     print("\n1. Setting up Neo4j data...")
-    ensure_neo4j_has_data()
+    if checkpoint.resumed:
+        print("Resuming: keeping the existing Neo4j data.")
+    else:
+        ensure_neo4j_has_data()
     
     # Step 2: Inspect Neo4j schema
     print("\n2. Inspecting Neo4j schema...")
@@ -239,7 +332,7 @@ def main():
     
     # Step 3: Perform migration
     print("\n3. Starting migration to Memgraph...")
-    migrate_with_gqlalchemy()
+    migrate_with_gqlalchemy(args.workers, args.keep_helpers, checkpoint)
     
     print("\n=== Migration Complete ===")
 
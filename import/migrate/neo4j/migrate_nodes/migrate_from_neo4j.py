@@ -1,17 +1,36 @@
 from neo4j import GraphDatabase
 from gqlalchemy import Memgraph
-from multiprocessing import Event, Process
+from functools import partial
+from multiprocessing import Process
+from pathlib import Path
+import argparse
 import random
 import string
-import time
+import sys
+
+sys.path.insert(0, str(Path(__file__).parents[3]))
+from import_monitor import ImportMonitor, gqlalchemy_storage_info
+from import_profile import BULK, ProfiledImport
+from migration_checkpoint import Checkpoint
+from parallel_migration import MigrationTask, ParallelMigration
 
 NEO4J_URI = "bolt://localhost:7687"
 MEMGRAPH_HOST = "localhost"
 MEMGRAPH_PORT = 7688
+NEO4J_CONFIG = '{host: "neo4j", port: 7687}'
 
 TARGET_NODE_COUNT = 50_000_000
 BATCH_SIZE = 1_000_000
 
+# Concurrent migrate.neo4j streams, and how often a failed one is retried
+SHARDS = 8
+RETRIES = 2
+# Ids per migrate.neo4j call within a shard; the checkpoint moves per page
+PAGE_SIZE = 1_000_000
+
+# Which shards (and pages of them) are in, for --resume
+CHECKPOINT = Path(__file__).with_name("migrate_from_neo4j.checkpoint.json")
+
 
 def generate_string(length=100):
     return "".join(random.choices(string.ascii_letters + string.digits, k=length))
@@ -39,6 +58,9 @@ def insert_nodes(driver, start_index, batch_size):
 
 def ensure_neo4j_has_data():
     driver = GraphDatabase.driver(NEO4J_URI, auth=None)
+    # Every migration shard reads an id range: let Neo4j seek instead of scan.
+    with driver.session() as session:
+        session.run("CREATE INDEX person_id IF NOT EXISTS FOR (p:Person) ON (p.id)")
     current_count = get_existing_node_count(driver)
     print(f"Neo4j currently has {current_count} nodes.")
 
@@ -58,78 +80,189 @@ def ensure_neo4j_has_data():
     print("Neo4j data creation complete.")
 
 
-def migrate_with_gqlalchemy(done_event):
-    try:
-        print("[Worker 1] Connecting to Memgraph...")
-        memgraph = Memgraph(host=MEMGRAPH_HOST, port=MEMGRAPH_PORT)
-
-        print("[Worker 1] Setting storage mode and clearing graph...")
-        memgraph.execute("STORAGE MODE IN_MEMORY_ANALYTICAL")
-        memgraph.execute("DROP GRAPH")
-        memgraph.execute("CREATE INDEX ON :Person")
-        memgraph.execute("CREATE INDEX ON :Person(id)")
-
-        print("[Worker 1] Verifying Neo4j connectivity...")
-        memgraph.execute(
-            """
-            CALL migrate.neo4j("RETURN 1;", {host: "neo4j", port: 7687}) YIELD row RETURN row;
+def id_range(memgraph):
+    """Smallest and largest Person id in Neo4j, read through the index."""
+    row = next(memgraph.execute_and_fetch(
+        f"""
+        CALL migrate.neo4j(
+            "MATCH (p:Person) RETURN min(p.id) AS low, max(p.id) AS high",
+            {NEO4J_CONFIG}
+        ) YIELD row RETURN row.low AS low, row.high AS high
         """
-        )
+    ))
+    return row["low"], row["high"]
+
+
+def page_query(write, start, end):
+    return f"""
+        CALL migrate.neo4j(
+            "MATCH (p:Person) WHERE p.id >= {start} AND p.id < {end} RETURN p.id AS id, properties(p) AS props",
+            {NEO4J_CONFIG}
+        ) YIELD row
+        {write}
+        RETURN count(p) AS migrated
+    """
+
+
+def page_cleanup(start, end):
+    return f"MATCH (p:Person) WHERE p.id >= {start} AND p.id < {end} DETACH DELETE p"
 
-        print("[Worker 1] Starting migration...")
-        memgraph.execute(
-            """
-            CALL migrate.neo4j(
-                "MATCH (p:Person) RETURN p.id AS id, properties(p) AS props",
-                {host: "neo4j", port: 7687}
-            ) YIELD row
-            MERGE (p:Person {id: row.id})
-            SET p.message = row.props.message
-        """
-        )
-        print("[Worker 1] Migration complete.")
-    finally:
-        done_event.set()
 
+def create_indexes(queries, connection):
+    for query in queries:
+        connection.execute(query)
 
-def monitor_storage_info(done_event):
-    print("[Worker 2] Monitoring Memgraph storage info...")
+
+def shard_tasks(low, high, shards, create, page_size=PAGE_SIZE):
+    """One migrate.neo4j stream per id range [start, end), which reads it a
+    page of page_size ids at a time (keyset pagination on the id index).
+    With create, a failed page's nodes are deleted before it is retried."""
+    step = -(-(high - low + 1) // shards)
+    write = (
+        "CREATE (p:Person {id: row.id, message: row.props.message})"
+        if create
+        else "MERGE (p:Person {id: row.id}) SET p.message = row.props.message"
+    )
+    tasks = []
+    for i, start in enumerate(range(low, high + 1, step)):
+        end = min(start + step, high + 1)
+        tasks.append(MigrationTask(
+            name=f"shard {i} [{start}, {end})",
+            query=partial(page_query, write),
+            expected=end - start,
+            cleanup=page_cleanup if create else None,
+            key_range=(start, end),
+            page_size=page_size,
+        ))
+    return tasks
+
+
+def migrate_with_gqlalchemy(shards=SHARDS, retries=RETRIES, page_size=PAGE_SIZE, checkpoint_path=CHECKPOINT, resume=False):
+    print("[Worker 1] Connecting to Memgraph...")
     memgraph = Memgraph(host=MEMGRAPH_HOST, port=MEMGRAPH_PORT)
-    start = time.time()
-    while not done_event.is_set():
+
+    checkpoint = Checkpoint(checkpoint_path, resume=resume)
+    # A resumed run keeps the graph and splits the ids as the first run did.
+    profiled = ProfiledImport(memgraph.execute, BULK, reset=not checkpoint.resumed)
+    if checkpoint.resumed:
+        print(f"[Worker 1] Resuming from {checkpoint.path}, keeping the graph...")
+    else:
+        print("[Worker 1] Setting storage mode and clearing graph...")
+    # After DROP GRAPH the target is known to be empty, so plain CREATE is
+    # enough: no MERGE lookups, and the Person(id) index can wait until all
+    # nodes are in. Into a graph that has data, MERGE needs it from the
+    # first row on, and so does a resumed CREATE run: every interrupted
+    # shard starts with a cleanup that deletes its unfinished id range.
+    create = checkpoint.setting("create", profiled.reset)
+    person_indexes = ["CREATE INDEX ON :Person", "CREATE INDEX ON :Person(id)"]
+    if create and not checkpoint.resumed:
+        profiled.late_indexes = person_indexes
+    else:
+        profiled.node_indexes = person_indexes
+    profiled.begin()
+
+    print("[Worker 1] Verifying Neo4j connectivity...")
+    memgraph.execute(
+        f"""
+        CALL migrate.neo4j("RETURN 1;", {NEO4J_CONFIG}) YIELD row RETURN row;
+    """
+    )
+
+    low, high = checkpoint.setting("id_range", id_range(memgraph))
+    if low is None:
+        print("[Worker 1] No Person nodes in Neo4j, nothing to migrate.")
+        return
+    shards = checkpoint.setting("shards", shards)
+    tasks = shard_tasks(low, high, shards, create, checkpoint.setting("page_size", page_size))
+    print(
+        f"[Worker 1] Starting migration of ids {low}..{high} in {len(tasks)} shards "
+        f"with {'CREATE' if create else 'MERGE'}..."
+    )
+    # The ImportMonitor of the main process shows the overall progress;
+    # counting a shard's id range would scan the label for every shard.
+    # A failed page's cleanup deletes its id range; with the Person(id)
+    # index still deferred, build it first instead of letting the cleanup
+    # scan the whole label.
+    migration = ParallelMigration(
+        lambda: Memgraph(host=MEMGRAPH_HOST, port=MEMGRAPH_PORT),
+        workers=len(tasks),
+        progress_interval=0,
+        retries=retries,
+        checkpoint=checkpoint,
+        before_cleanup=partial(create_indexes, profiled.late_indexes) if profiled.late_indexes else None,
+    )
+    with profiled.step("migrate nodes"):
         try:
-            result = memgraph.execute_and_fetch("SHOW STORAGE INFO")
-            vertex_count = None
-            memory_tracked = None
-            for row in result:
-                if row.get("storage info") == "vertex_count":
-                    vertex_count = row.get("value")
-                elif row.get("storage info") == "memory_tracked":
-                    memory_tracked = row.get("value")
-            print(
-                f"[Worker 2] Vertices: {vertex_count}, Memory Used: {memory_tracked} bytes"
-            )
-            time.sleep(5)
-            elapsed_time = time.time() - start
-            print(f"Elapsed time: {elapsed_time}s")
-        except Exception as e:
-            print(f"[Worker 2] Error: {e}")
-            break
-    print("[Worker 2] Monitoring stopped.")
+            migration.run_phase("nodes", tasks)
+        except RuntimeError:
+            missing = [task.name for task in tasks if task.name not in migration.completed]
+            print(f"[Worker 1] Shards still missing after {retries} retries: {', '.join(missing)}")
+            print(f"[Worker 1] {checkpoint.summary()}; rerun with --resume to continue")
+            raise
+    print("[Worker 1] Migration complete.")
+    print(migration.summary())
 
+    # Back to transactional mode, with a snapshot of the migrated graph.
+    profiled.finish()
+    checkpoint.remove()
+    print(f"[Worker 1] {profiled.summary()}")
 
-if __name__ == "__main__":
-    ensure_neo4j_has_data()
 
-    done_event = Event()
-    p1 = Process(target=migrate_with_gqlalchemy, args=(done_event,))
-    p2 = Process(target=monitor_storage_info, args=(done_event,))
+def parse_args():
+    parser = argparse.ArgumentParser(description="Migrate Person nodes from Neo4j to Memgraph.")
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=SHARDS,
+        help=f"Concurrent migrate.neo4j streams, each over its own Person id range (default: {SHARDS}).",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=RETRIES,
+        help=f"Retries of a failed page of a shard, on its own (default: {RETRIES}).",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=PAGE_SIZE,
+        help=f"Ids per migrate.neo4j call within a shard; progress is checkpointed after each (default: {PAGE_SIZE:,}).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted migration: keep the graph and the shard split of the "
+             "checkpoint, skip finished shards and continue the others from their last page.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=CHECKPOINT,
+        help=f"Checkpoint file (default: {CHECKPOINT.name} next to this script).",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.resume and args.checkpoint.exists():
+        # New nodes would fall outside the id range being resumed.
+        print("Resuming: not adding nodes to Neo4j.")
+    else:
+        ensure_neo4j_has_data()
 
+    # Samples SHOW STORAGE INFO and the Memgraph container's /proc every 5 s.
+    monitor = ImportMonitor(
+        gqlalchemy_storage_info(MEMGRAPH_HOST, MEMGRAPH_PORT), interval=5, log=True
+    )
+    p1 = Process(
+        target=migrate_with_gqlalchemy,
+        args=(args.shards, args.retries, args.page_size, args.checkpoint, args.resume),
+    )
     p1.start()
-    p2.start()
 
-    p1.join()
+    with monitor:
+        p1.join()
     print("[Main] Migration process finished.")
 
-    p2.join()
-    print("[Main] Monitor process finished.")
+    print(monitor.summary())
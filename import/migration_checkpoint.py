@@ -0,0 +1,91 @@
+"""Checkpoints that let a long migration resume where it stopped.
+
+A migration that dies halfway (a lost connection, a failed shard, a killed
+client) would otherwise mean DROP GRAPH and starting over. A Checkpoint
+records, in a local JSON file, which tasks of every phase have started and
+finished, and for tasks that page through a key range the last key whose
+page is in:
+
+    checkpoint = Checkpoint("migration.checkpoint.json", resume=args.resume)
+    migration = ParallelMigration(connect, checkpoint=checkpoint)
+
+ParallelMigration then skips finished tasks, continues paged tasks from
+their last key, and runs the cleanup of a task that was interrupted before
+running it again. Settings that decide what the tasks are (e.g. the number
+of shards) go in with setting(), so a resumed run splits the work the same
+way.
+
+Without resume (or without a file to resume from), the file starts out
+empty. It is rewritten atomically after every change, and removed once the
+migration is complete. It only helps while Memgraph keeps the graph: in
+IN_MEMORY_ANALYTICAL mode there is no WAL, so if Memgraph itself restarts,
+the migrated data is gone and the migration has to start over.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+
+
+class Checkpoint:
+    def __init__(self, path, resume: bool = False) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.resumed = resume and self.path.exists()
+        if self.resumed:
+            self.state = json.loads(self.path.read_text())
+        else:
+            self.state = {"settings": {}, "tasks": {}}
+            self._write()
+
+    def _write(self) -> None:
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(self.state, indent=2))
+        os.replace(tmp, self.path)
+
+    def _task(self, key: str) -> dict:
+        return self.state["tasks"].setdefault(key, {})
+
+    def setting(self, name: str, value):
+        """value, or the value stored by the run being resumed."""
+        with self._lock:
+            value = self.state["settings"].setdefault(name, value)
+            self._write()
+        return value
+
+    def done(self, key: str) -> bool:
+        with self._lock:
+            return self.state["tasks"].get(key, {}).get("status") == "done"
+
+    def started(self, key: str) -> bool:
+        with self._lock:
+            return key in self.state["tasks"]
+
+    def last_key(self, key: str, default=None):
+        with self._lock:
+            return self.state["tasks"].get(key, {}).get("last_key", default)
+
+    def mark_started(self, key: str) -> None:
+        with self._lock:
+            self._task(key).setdefault("status", "started")
+            self._write()
+
+    def save_key(self, key: str, last_key) -> None:
+        with self._lock:
+            self._task(key)["last_key"] = last_key
+            self._write()
+
+    def mark_done(self, key: str, rows=None) -> None:
+        with self._lock:
+            self._task(key).update(status="done", rows=rows)
+            self._write()
+
+    def remove(self) -> None:
+        """Once the migration is complete there is nothing to resume."""
+        self.path.unlink(missing_ok=True)
+
+    def summary(self) -> str:
+        with self._lock:
+            tasks = self.state["tasks"].values()
+            done = sum(task.get("status") == "done" for task in tasks)
+        return f"Checkpoint {self.path}: {done} of {len(tasks)} started tasks done"
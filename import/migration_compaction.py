@@ -0,0 +1,118 @@
+"""Remove the helper label, key property and index a migration leaves behind.
+
+The complete migrations (Neo4j, Aurora) give every node a helper label and
+a key property from the source, e.g. :__MigrationNode__ {__elementId__},
+with a label-property index on them, so that relationships can MATCH their
+endpoints through one global index. Once the relationships are in, nothing
+needs them any more, but every node would keep paying for them. This runs
+after the relationship phase, before the final snapshot:
+
+    report = compact(lambda: Memgraph(HOST, PORT), labels, "__MigrationNode__", "__elementId__")
+    print(report.summary())
+
+1. Strip the helper label and property from every node: one
+   periodic.iterate (MAGE) per source label, all labels at once through a
+   ParallelMigration, each committing every batch_size nodes.
+2. Check that no node still has the helper label, and only then drop the
+   index (a migration can't be completed without it).
+3. FREE MEMORY and compare memory_tracked from SHOW STORAGE INFO before
+   and after.
+"""
+import time
+from dataclasses import dataclass
+
+from import_monitor import parse_bytes
+from parallel_migration import MigrationTask, ParallelMigration
+
+BATCH_SIZE = 100_000
+
+
+@dataclass
+class CompactionReport:
+    nodes: int
+    remaining: int  # nodes that still have the helper label
+    index_dropped: bool
+    memory_before: int | None  # memory_tracked, bytes
+    memory_after: int | None
+    seconds: float
+
+    @property
+    def reclaimed(self) -> int | None:
+        if self.memory_before is None or self.memory_after is None:
+            return None
+        return self.memory_before - self.memory_after
+
+    def summary(self) -> str:
+        lines = [f"Compaction: removed the migration helpers from {self.nodes:,} nodes in {self.seconds:.2f} s"]
+        if self.remaining:
+            lines.append(f"{self.remaining:,} nodes still have the helper label; the index was kept")
+        if self.reclaimed is not None:
+            lines.append(
+                f"memory_tracked {_mb(self.memory_before)} -> {_mb(self.memory_after)}, "
+                f"reclaimed {_mb(self.reclaimed)}"
+            )
+        return "\n".join(lines)
+
+
+def memory_tracked(connection) -> int | None:
+    info = {
+        row["storage info"]: row["value"]
+        for row in connection.execute_and_fetch("SHOW STORAGE INFO")
+    }
+    return parse_bytes(info.get("memory_tracked"))
+
+
+def compaction_task(label: str, helper_label: str, helper_property: str, batch_size: int) -> MigrationTask:
+    """Returns the number of nodes it visited."""
+    return MigrationTask(
+        name=f"compact {label}",
+        query=f"""
+            MATCH (n:{label}:{helper_label})
+            WITH count(n) AS nodes
+            CALL periodic.iterate(
+                "MATCH (n:{label}:{helper_label}) RETURN id(n) AS node_id",
+                "MATCH (n) WHERE id(n) = node_id REMOVE n:{helper_label}, n.{helper_property}",
+                {{batch_size: {batch_size}}}
+            ) YIELD success
+            RETURN nodes, success
+            """,
+    )
+
+
+def compact(
+    connect,
+    labels,
+    helper_label: str = "__MigrationNode__",
+    helper_property: str = "__elementId__",
+    workers: int = 8,
+    batch_size: int = BATCH_SIZE,
+) -> CompactionReport:
+    """labels are the source labels the helper label was added next to; a
+    node with several of them is visited once per label, which is harmless."""
+    connection = connect()
+    start = time.perf_counter()
+    memory_before = memory_tracked(connection)
+
+    migration = ParallelMigration(connect, workers=workers, progress_interval=0)
+    results = migration.run_phase(
+        "compaction",
+        [compaction_task(label, helper_label, helper_property, batch_size) for label in labels],
+    )
+
+    remaining = next(connection.execute_and_fetch(f"MATCH (n:{helper_label}) RETURN count(n) AS count"))["count"]
+    if not remaining:
+        connection.execute(f"DROP INDEX ON :{helper_label}({helper_property})")
+    connection.execute("FREE MEMORY")
+
+    return CompactionReport(
+        nodes=sum(r.rows or 0 for r in results),
+        remaining=remaining,
+        index_dropped=not remaining,
+        memory_before=memory_before,
+        memory_after=memory_tracked(connection),
+        seconds=time.perf_counter() - start,
+    )
+
+
+def _mb(value: int | None) -> str:
+    return "-" if value is None else f"{value / 2**20:,.1f} MB"
@@ -0,0 +1,266 @@
+"""Run a migration's per-label and per-type queries on several sessions at once.
+
+A migration from another database is a list of server-side queries, one per
+node label and one per relationship type, e.g.
+
+    CALL migrate.neo4j("MATCH (n:Label1) RETURN ...", {...}) YIELD row
+    MERGE ... RETURN count(*) AS migrated
+
+Run one after another, they take the sum of their times. The labels don't
+depend on each other, and neither do the relationship types once every node
+is in. A ParallelMigration runs each phase's queries on up to `workers`
+Memgraph connections at once and waits for the whole phase (a barrier)
+before the next one starts:
+
+    migration = ParallelMigration(lambda: Memgraph(HOST, PORT), workers=8)
+    migration.run_phase("nodes", node_tasks)
+    migration.run_phase("relationships", relationship_tasks)
+    print(migration.summary())
+
+Tasks start largest first (by `expected`), so a phase takes about as long as
+its largest task instead of the sum of all of them. While a phase runs,
+every running task has a progress bar with its rows/s (if tqdm is
+installed), advanced by polling the task's count_query every
+progress_interval seconds on a connection of its own. The rows a task
+migrated are the first value its query returns.
+
+A failed task is retried on its own, up to `retries` times, after running
+its cleanup query (e.g. deleting what the failed attempt wrote, so a
+CREATE-based task can run again). before_cleanup, if set, runs once before
+the first cleanup of the migration, e.g. to create the index the cleanup
+queries look their rows up with. `completed` holds the names of the tasks
+that finished, so a caller can tell which shards of a split source are in.
+
+A task with a key_range runs in pages: its query (and cleanup) is then a
+function of a page's [start, end), called for page_size keys at a time,
+i.e. keyset pagination over an indexed integer key. With a checkpoint
+(migration_checkpoint.py), finished tasks are skipped on a resumed run, a
+paged task continues after the last page that is in, and a task that was
+interrupted runs its cleanup first.
+
+connect returns a new connection with execute_and_fetch, such as
+gqlalchemy's Memgraph; every worker thread opens its own. Like
+import_profile.py, this needs nothing but the standard library.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Sequence
+
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
+
+
+@dataclass
+class MigrationTask:
+    name: str
+    query: str | Callable[[int, int], str]  # should RETURN the number of migrated rows
+    expected: int | None = None  # rows in the source, for ordering and the bar
+    count_query: str | None = None  # rows in Memgraph so far, for the bar
+    cleanup: str | Callable[[int, int], str] | None = None  # undoes a failed attempt before a retry
+    key_range: tuple[int, int] | None = None  # [start, end) to page through
+    page_size: int | None = None
+
+
+@dataclass
+class TaskResult:
+    phase: str
+    name: str
+    rows: int | None
+    seconds: float
+
+    @property
+    def rate(self) -> float:
+        return self.rows / self.seconds if self.rows and self.seconds else 0.0
+
+
+@dataclass
+class ParallelMigration:
+    connect: Callable[[], object]
+    workers: int = 8
+    progress_interval: float = 2.0  # 0 to disable polling
+    retries: int = 0  # per task
+    checkpoint: object | None = None  # a migration_checkpoint.Checkpoint
+    before_cleanup: Callable[[object], None] | None = None  # gets a connection
+    log: bool = True
+    results: list[TaskResult] = field(default_factory=list)
+    phases: list[tuple[str, float]] = field(default_factory=list)
+    completed: set[str] = field(default_factory=set)
+
+    def __post_init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._running: dict[str, tuple[MigrationTask, object]] = {}
+        self._cleanup_lock = threading.Lock()
+        self._cleanup_ready = False
+
+    def _connection(self):
+        if not hasattr(self._local, "connection"):
+            self._local.connection = self.connect()
+        return self._local.connection
+
+    def _print(self, message: str) -> None:
+        if not self.log:
+            return
+        if tqdm is not None:
+            tqdm.write(message)
+        else:
+            print(message, flush=True)
+
+    def _run_task(self, phase: str, task: MigrationTask) -> TaskResult:
+        bar = None
+        if self.log and tqdm is not None:
+            bar = tqdm(total=task.expected, desc=task.name, unit="rows", leave=True)
+        with self._lock:
+            self._running[task.name] = (task, bar)
+        start = time.perf_counter()
+        try:
+            if self.checkpoint is not None:
+                self._resume(phase, task)
+            rows = self._run_pages(phase, task) if task.key_range else self._attempt(phase, task, task.query, task.cleanup)
+        except Exception:
+            if bar is not None:
+                bar.close()
+            raise
+        finally:
+            with self._lock:
+                del self._running[task.name]
+        seconds = time.perf_counter() - start
+        migrated = next(iter(rows[0].values()), None) if rows else None
+        if bar is not None:
+            if migrated is not None:
+                bar.n = migrated
+            bar.close()
+        result = TaskResult(phase, task.name, migrated, seconds)
+        with self._lock:
+            self.completed.add(task.name)
+        if self.checkpoint is not None:
+            self.checkpoint.mark_done(f"{phase}/{task.name}", migrated)
+        self._print(f"[{phase}] {task.name}: {_count(migrated)} rows in {seconds:.2f} s ({result.rate:,.0f} rows/s)")
+        return result
+
+    def _resume(self, phase: str, task: MigrationTask) -> None:
+        """Mark the task started; if an earlier run already had, undo what
+        it wrote after the last checkpointed key."""
+        key = f"{phase}/{task.name}"
+        if self.checkpoint.started(key) and task.cleanup:
+            self._print(f"[{phase}] {task.name} was interrupted, cleaning up before resuming")
+            cleanup = task.cleanup
+            if task.key_range:
+                cleanup = cleanup(self.checkpoint.last_key(key, task.key_range[0]), task.key_range[1])
+            self._cleanup(cleanup)
+        self.checkpoint.mark_started(key)
+
+    def _attempt(self, phase: str, task: MigrationTask, query: str, cleanup: str | None) -> list:
+        for attempt in range(self.retries + 1):
+            try:
+                return list(self._connection().execute_and_fetch(query))
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                self._print(f"[{phase}] {task.name} failed ({e}), retry {attempt + 1} of {self.retries}")
+                # The failed attempt may have taken its connection down.
+                del self._local.connection
+                if cleanup:
+                    self._cleanup(cleanup)
+        return []
+
+    def _cleanup(self, cleanup: str) -> None:
+        with self._cleanup_lock:
+            if self.before_cleanup is not None and not self._cleanup_ready:
+                self.before_cleanup(self._connection())
+            self._cleanup_ready = True
+        list(self._connection().execute_and_fetch(cleanup))
+
+    def _run_pages(self, phase: str, task: MigrationTask) -> list:
+        """Run a key_range task page by page, checkpointing after each."""
+        key = f"{phase}/{task.name}"
+        start, end = task.key_range
+        if self.checkpoint is not None:
+            start = self.checkpoint.last_key(key, start)
+        migrated = 0
+        while start < end:
+            page_end = min(start + (task.page_size or end - start), end)
+            cleanup = task.cleanup(start, page_end) if task.cleanup else None
+            rows = self._attempt(phase, task, task.query(start, page_end), cleanup)
+            migrated += (next(iter(rows[0].values()), 0) or 0) if rows else 0
+            start = page_end
+            if self.checkpoint is not None:
+                self.checkpoint.save_key(key, start)
+        return [{"migrated": migrated}]
+
+    def _poll(self, stop: threading.Event) -> None:
+        """Advance the bars of running tasks from their count_query."""
+        connection = None
+        while not stop.wait(self.progress_interval):
+            with self._lock:
+                running = [(task, bar) for task, bar in self._running.values() if bar is not None and task.count_query]
+            for task, bar in running:
+                try:
+                    connection = connection or self.connect()
+                    row = next(iter(connection.execute_and_fetch(task.count_query)), None)
+                except Exception:
+                    connection = None
+                    continue
+                if row:
+                    bar.n = next(iter(row.values()))
+                    bar.refresh()
+
+    def run_phase(self, phase: str, tasks: Sequence[MigrationTask]) -> list[TaskResult]:
+        """Run all tasks, at most `workers` at a time, and return once every
+        one has finished. If any failed, raises RuntimeError naming them
+        after the others are done."""
+        tasks = sorted(tasks, key=lambda task: task.expected or 0, reverse=True)
+        if self.checkpoint is not None:
+            done = [task for task in tasks if self.checkpoint.done(f"{phase}/{task.name}")]
+            if done:
+                self._print(f"[{phase}] Skipping {len(done)} tasks finished in an earlier run")
+                self.completed.update(task.name for task in done)
+                tasks = [task for task in tasks if task not in done]
+        self._print(f"[{phase}] {len(tasks)} tasks on {min(self.workers, len(tasks))} workers")
+        stop = threading.Event()
+        poller = None
+        if self.log and tqdm is not None and self.progress_interval > 0:
+            poller = threading.Thread(target=self._poll, args=(stop,), name="migration-progress", daemon=True)
+            poller.start()
+
+        start = time.perf_counter()
+        results, failed = [], []
+        with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(tasks)))) as pool:
+            futures = {pool.submit(self._run_task, phase, task): task for task in tasks}
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    failed.append(futures[future].name)
+                    self._print(f"[{phase}] {futures[future].name} failed: {e}")
+        stop.set()
+        if poller is not None:
+            poller.join()
+
+        self.phases.append((phase, time.perf_counter() - start))
+        self.results.extend(results)
+        if failed:
+            raise RuntimeError(f"{phase}: {len(failed)} of {len(tasks)} tasks failed: {', '.join(failed)}")
+        return results
+
+    def summary(self) -> str:
+        lines = [f"{'task':<32} {'rows':>13} {'seconds':>9} {'rows/s':>11}"]
+        for phase, wall in self.phases:
+            results = [r for r in self.results if r.phase == phase]
+            for r in sorted(results, key=lambda r: r.seconds, reverse=True):
+                lines.append(f"{r.name:<32} {_count(r.rows):>13} {r.seconds:>9.2f} {r.rate:>11,.0f}")
+            serial = sum(r.seconds for r in results)
+            speedup = serial / wall if wall else 0.0
+            lines.append(
+                f"{phase}: {wall:.2f} s wall for {serial:.2f} s of queries ({speedup:.1f}x), "
+                f"longest task {max((r.seconds for r in results), default=0.0):.2f} s"
+            )
+        return "\n".join(lines)
+
+
+def _count(value: int | None) -> str:
+    return "-" if value is None else f"{value:,}"
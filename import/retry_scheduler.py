@@ -0,0 +1,249 @@
+"""Conflict-aware retries for concurrent UNWIND imports.
+
+In IN_MEMORY_TRANSACTIONAL mode, two chunks that add edges to the same node
+conflict, and one of them fails with a serialization error ("Cannot resolve
+conflicting transactions"). Retrying it in place, inside the worker, keeps
+that worker asleep and sends it straight back at the same hot nodes.
+
+RetryScheduler keeps the retries in the main process instead. Workers make
+a single attempt per chunk and report whether it conflicted. A conflicting
+chunk goes to the back of the shared queue, behind the chunks that were
+already waiting, with a jittered exponential backoff before it may run
+again. Meanwhile the worker moves on to other chunks. A chunk that keeps
+conflicting can be split into halves (split_after), so one hot node no
+longer holds the rest of its rows back. Any other error stops the import.
+
+    scheduler = RetryScheduler(pool, process_chunk, query, in_flight=20)
+    stats = scheduler.run(read_chunks(path, 50_000))
+    print(stats.summary())
+
+process_chunk(query, chunk) must make exactly one attempt and raise on
+failure; it must be a module-level function (it is pickled to the
+workers). Splitting a chunk is only safe because a conflicting transaction
+is rolled back, which is the case in the mode where conflicts happen. When
+a chunk split on the memory limit commits only some of its parts, just the
+parts that conflicted are requeued.
+"""
+import queue
+import random
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from multiprocessing.pool import Pool
+from typing import Callable, Iterable
+
+from adaptive_batching import AdaptiveBatchSize, is_memory_limit_error
+
+
+def is_conflict_error(error: BaseException) -> bool:
+    """Memgraph's serialization error: "Cannot resolve conflicting
+    transactions. You can retry this transaction when the conflicting
+    transaction is finished"."""
+    return "conflict" in str(error).lower()
+
+
+def _write_parts(
+    write: Callable[[str, list], int], query: str, chunk: list, split: bool
+) -> tuple[list[list], list[int]]:
+    """Write chunk; with split, halve it (recursively) when it hits the
+    memory limit. Returns (parts that conflicted, sizes of the parts that
+    hit the limit). A part that conflicts is rolled back, but the parts
+    written before or after it stay committed, so only the conflicted
+    parts may be written again."""
+    try:
+        write(query, chunk)
+        return [], []
+    except Exception as e:
+        if is_conflict_error(e):
+            return [chunk], []
+        if not (split and is_memory_limit_error(e) and len(chunk) > 1):
+            raise
+    half = len(chunk) // 2
+    conflicted, failed = [], [len(chunk)]
+    for part in (chunk[:half], chunk[half:]):
+        part_conflicted, part_failed = _write_parts(write, query, part, split)
+        conflicted += part_conflicted
+        failed += part_failed
+    return conflicted, failed
+
+
+def attempt_chunk(
+    write: Callable[[str, list], int], query: str, chunk: list, split: bool
+) -> tuple[str, float, list[int], list[list]]:
+    """Pool task: one attempt at a chunk. Returns ("ok" or "conflict", the
+    attempt's seconds, sizes of the parts that hit the memory limit, the
+    parts that conflicted and were not committed).
+
+    Other errors are re-raised as RuntimeError, since driver exceptions do
+    not always survive pickling back to the main process."""
+    start = time.perf_counter()
+    try:
+        conflicted, failed = _write_parts(write, query, chunk, split)
+    except Exception as e:
+        raise RuntimeError(f"{type(e).__name__}: {e}") from None
+    status = "conflict" if conflicted else "ok"
+    return status, time.perf_counter() - start, failed, conflicted
+
+
+@dataclass
+class _Task:
+    chunk: list
+    conflicts: int = 0
+    due: float = 0.0  # time.monotonic() before which it must not run
+
+
+@dataclass
+class RetryStats:
+    chunks: int = 0  # chunks committed, counting both halves of a split
+    conflicts: int = 0
+    splits: int = 0
+    retry_seconds: float = 0.0  # spent in attempts that conflicted
+    wait_seconds: float = 0.0  # idle in backoff with no other chunk to run
+    conflicts_per_chunk: Counter = field(default_factory=Counter)
+
+    @property
+    def attempts(self) -> int:
+        return self.chunks + self.conflicts
+
+    def summary(self) -> str:
+        conflicted = self.chunks - self.conflicts_per_chunk[0]
+        worst = max(self.conflicts_per_chunk, default=0)
+        return (
+            f"{self.chunks} chunks, {self.conflicts} conflicts "
+            f"({conflicted} chunks conflicted at least once, at most {worst} times), "
+            f"{self.splits} splits, {self.retry_seconds:.2f} s in conflicting attempts, "
+            f"{self.wait_seconds:.2f} s idle in backoff"
+        )
+
+
+class RetryScheduler:
+    """Runs chunks on a pool and schedules the retries of the ones that
+    conflict. With a batcher (adaptive batch sizing), commits and conflicts
+    are fed back to it; pass chunks cut with its current size."""
+
+    def __init__(
+        self,
+        pool: Pool,
+        write: Callable[[str, list], int],
+        query: str,
+        in_flight: int = 20,
+        max_conflicts: int = 100,
+        split_after: int | None = None,
+        initial_wait_time: float = 0.2,
+        backoff_factor: float = 1.1,
+        jitter: float = 0.1,
+        batcher: AdaptiveBatchSize | None = None,
+    ) -> None:
+        self.pool = pool
+        self.write = write
+        self.query = query
+        self.in_flight = in_flight
+        self.max_conflicts = max_conflicts
+        self.split_after = split_after
+        self.initial_wait_time = initial_wait_time
+        self.backoff_factor = backoff_factor
+        self.jitter = jitter
+        self.batcher = batcher
+
+    def _backoff(self, conflicts: int) -> float:
+        return (
+            self.initial_wait_time * self.backoff_factor ** (conflicts - 1)
+            + random.uniform(0, self.jitter) * self.initial_wait_time
+        )
+
+    def run(self, chunks: Iterable[list]) -> RetryStats:
+        """Write every chunk, returning once all of them are committed."""
+        stats = RetryStats()
+        split_memory = bool(self.batcher and self.batcher.split_on_memory_limit)
+        finished: queue.Queue = queue.Queue()
+        source = iter(chunks)
+        exhausted = False
+        # The shared queue: fresh chunks read ahead, requeued ones behind them.
+        waiting: deque[_Task] = deque()
+        running = 0
+
+        while True:
+            while not exhausted and len(waiting) < self.in_flight:
+                chunk = next(source, None)
+                if chunk is None:
+                    exhausted = True
+                else:
+                    waiting.append(_Task(chunk))
+
+            now = time.monotonic()
+            while running < self.in_flight:
+                task = next((t for t in waiting if t.due <= now), None)
+                if task is None:
+                    break
+                waiting.remove(task)
+                self.pool.apply_async(
+                    attempt_chunk,
+                    (self.write, self.query, task.chunk, split_memory),
+                    callback=lambda result, task=task: finished.put((task, result)),
+                    error_callback=lambda error: finished.put((None, error)),
+                )
+                running += 1
+
+            if not running and not waiting and exhausted:
+                return stats
+
+            # Block for the next result, but wake up when a backed-off chunk
+            # becomes due while a worker slot is free.
+            timeout = None
+            if waiting and running < self.in_flight:
+                timeout = max(0.0, min(t.due for t in waiting) - now)
+            try:
+                task, result = finished.get(timeout=timeout)
+            except queue.Empty:
+                if not running:
+                    stats.wait_seconds += timeout
+                continue
+            running -= 1
+            if task is None:
+                raise result
+            self._handle(task, result, waiting, stats)
+
+    def _handle(
+        self, task: _Task, result: tuple, waiting: deque, stats: RetryStats
+    ) -> None:
+        status, seconds, failed, conflicted = result
+        if status == "ok":
+            stats.chunks += 1
+            stats.conflicts_per_chunk[task.conflicts] += 1
+            if self.batcher:
+                self.batcher.record_result(len(task.chunk), seconds, 0, failed)
+            return
+
+        task.conflicts += 1
+        stats.conflicts += 1
+        stats.retry_seconds += seconds
+        if self.batcher:
+            if failed:
+                self.batcher.record_result(len(task.chunk), seconds, 0, failed)
+            self.batcher.record(len(task.chunk), seconds, retries=1)
+        if task.conflicts > self.max_conflicts:
+            raise RuntimeError(
+                f"Chunk of {len(task.chunk)} rows still conflicting after "
+                f"{self.max_conflicts} retries"
+            )
+        due = time.monotonic() + self._backoff(task.conflicts)
+        if len(conflicted) > 1 or len(conflicted[0]) < len(task.chunk):
+            # Split on the memory limit and partly committed: retry only
+            # the parts that conflicted, or the rest would be written twice.
+            committed = len(failed) + 1 - len(conflicted)
+            stats.chunks += committed
+            stats.conflicts_per_chunk[task.conflicts - 1] += committed
+            stats.splits += len(failed)
+            waiting.extend(_Task(part, task.conflicts, due) for part in conflicted)
+        elif (
+            self.split_after
+            and task.conflicts % self.split_after == 0
+            and len(task.chunk) > 1
+        ):
+            half = len(task.chunk) // 2
+            stats.splits += 1
+            waiting.append(_Task(task.chunk[:half], task.conflicts, due))
+            waiting.append(_Task(task.chunk[half:], task.conflicts, due))
+        else:
+            task.due = due
+            waiting.append(task)
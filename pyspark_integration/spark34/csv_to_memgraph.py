@@ -9,6 +9,20 @@ since the Spark Connector only supports read-only queries.
 
 Usage:
     python csv_to_memgraph.py [nodes.csv] [edges.csv]
+    python csv_to_memgraph.py --parallel --partitions 64 --batch-size 20000
+    python csv_to_memgraph.py --writer bolt --partitions 64 --batch-size 20000
+
+--parallel parses each CSV once and caches it, takes all counts from one
+groupBy, and writes every label (and every edge label pair) at the same
+time. Each subset is repartitioned to --partitions and written with
+--batch-size rows per transaction, and the run reports rows/s per Spark
+partition (from the Spark UI REST API) for tuning both on large inputs.
+
+--writer bolt skips the connector (and its JAR download): every Spark
+partition sends its rows itself, as batched UNWIND queries over a Bolt
+connection pooled per executor (bolt_writer.py). All nodes get the extra
+:Node label, so edges MATCH both endpoints on the :Node(id) index and need
+no join with the nodes and no write per label pair.
 
 Prerequisites:
     - Java 11+ installed (for Spark)
@@ -16,28 +30,46 @@ Prerequisites:
     - Memgraph running (docker compose up -d from parent directory)
 """
 
+from __future__ import annotations
+
+import argparse
+import json
 import os
+import statistics
 import sys
+import time
+import urllib.request
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 
 from neo4j import GraphDatabase
-from pyspark.sql import SparkSession
+from pyspark.sql import DataFrame, SparkSession
+from pyspark.sql.functions import spark_partition_id
+
+# bolt_writer.py is shared with the parent directory.
+BOLT_WRITER = Path(__file__).resolve().parents[1] / "bolt_writer.py"
+sys.path.insert(0, str(BOLT_WRITER.parent))
+from bolt_writer import ID_LABEL, partition_writer  # noqa: E402
 
 MG_URI = os.getenv("MEMGRAPH_URI", "bolt://localhost:7687")
 NEO4J_FORMAT = "org.neo4j.spark.DataSource"
 
+LABELS = ["Person", "Company", "Product"]
+
 # Neo4j Spark Connector 5.3.2 — works with Spark 3.4+
 NEO4J_SPARK_JAR = "org.neo4j:neo4j-connector-apache-spark_2.12:5.4.0_for_spark_3"
 
 
-def get_spark() -> SparkSession:
-    return (
+def get_spark(connector: bool = True) -> SparkSession:
+    """connector=False leaves out the connector JAR, for --writer bolt."""
+    builder = (
         SparkSession.builder
         .appName("csv-to-memgraph-spark34")
         .master("local[*]")
-        .config("spark.jars.packages", NEO4J_SPARK_JAR)
-        .getOrCreate()
     )
+    if connector:
+        builder = builder.config("spark.jars.packages", NEO4J_SPARK_JAR)
+    return builder.getOrCreate()
 
 
 def get_driver():
@@ -51,37 +83,87 @@ def clear_memgraph(driver) -> None:
     print("Cleared existing data.")
 
 
-def create_indexes(driver) -> None:
-    """Create label indexes and property indexes on node id."""
+def create_indexes(driver, id_label: bool = False) -> None:
+    """Create label indexes and property indexes on node id, and with
+    id_label the :Node(id) index the bolt writer's edges MATCH on."""
     with driver.session() as session:
-        for label in ["Person", "Company", "Product"]:
+        for label in LABELS:
             session.run(f"CREATE INDEX ON :{label}")
             session.run(f"CREATE INDEX ON :{label}(id)")
+        if id_label:
+            session.run(f"CREATE INDEX ON :{ID_LABEL}(id)")
     print("Indexes created.")
 
 
+def save_nodes(label_df: DataFrame, label: str, batch_size: int | None = None) -> None:
+    writer = (
+        label_df.write.format(NEO4J_FORMAT)
+        .mode("Append")
+        .option("url", MG_URI)
+        .option("authentication.type", "none")
+        .option("labels", f":{label}")
+        .option("node.keys", "id")
+    )
+    if batch_size:
+        writer = writer.option("batch.size", batch_size)
+    writer.save()
+
+
+def save_edges(subset: DataFrame, src_label: str, tgt_label: str, batch_size: int | None = None) -> None:
+    """subset has the `source.id`, `target.id` and weight columns."""
+    writer = (
+        subset.write.format(NEO4J_FORMAT)
+        .mode("Append")
+        .option("url", MG_URI)
+        .option("authentication.type", "none")
+        .option("relationship", "CONNECTED_TO")
+        .option("relationship.save.strategy", "keys")
+        .option("relationship.source.save.mode", "Match")
+        .option("relationship.source.labels", f":{src_label}")
+        .option("relationship.source.node.keys", "source.id:id")
+        .option("relationship.target.save.mode", "Match")
+        .option("relationship.target.labels", f":{tgt_label}")
+        .option("relationship.target.node.keys", "target.id:id")
+    )
+    if batch_size:
+        writer = writer.option("batch.size", batch_size)
+    writer.save()
+
+
 def write_nodes(spark, csv_path: str) -> None:
     """Read nodes CSV and write to Memgraph, one label at a time."""
     nodes_df = spark.read.csv(csv_path, header=True, inferSchema=True)
     total = nodes_df.count()
     print(f"Read {total} nodes from {csv_path}")
 
-    for label in ["Person", "Company", "Product"]:
+    for label in LABELS:
         label_df = nodes_df.filter(nodes_df.label == label).drop("label")
         count = label_df.count()
-
-        (
-            label_df.write.format(NEO4J_FORMAT)
-            .mode("Append")
-            .option("url", MG_URI)
-            .option("authentication.type", "none")
-            .option("labels", f":{label}")
-            .option("node.keys", "id")
-            .save()
-        )
+        save_nodes(label_df, label)
         print(f"  {label}: {count} nodes")
 
 
+def resolve_labels(edges_df: DataFrame, nodes_df: DataFrame) -> DataFrame:
+    """Join edges with nodes to add src_label and tgt_label."""
+    src_nodes = nodes_df.withColumnRenamed("id", "src_id").withColumnRenamed("label", "src_label")
+    tgt_nodes = nodes_df.withColumnRenamed("id", "tgt_id").withColumnRenamed("label", "tgt_label")
+    return (
+        edges_df
+        .join(src_nodes, edges_df.source == src_nodes.src_id)
+        .join(tgt_nodes, edges_df.target == tgt_nodes.tgt_id)
+        .drop("src_id", "tgt_id")
+    )
+
+
+def edge_columns(df: DataFrame) -> DataFrame:
+    """The columns the connector's keys strategy expects."""
+    return (
+        df.withColumnRenamed("source", "source.id")
+        .withColumnRenamed("target", "target.id")
+        .select("`source.id`", "`target.id`", "weight")
+    )
+
+
 def write_edges(spark, nodes_csv_path: str, edges_csv_path: str) -> None:
     """Read edges CSV and write to Memgraph via the Spark Connector.
 
@@ -95,16 +177,7 @@ def write_edges(spark, nodes_csv_path: str, edges_csv_path: str) -> None:
     total = edges_df.count()
     print(f"Read {total} edges from {edges_csv_path}")
 
-    # Join to resolve source and target labels
-    src_nodes = nodes_df.withColumnRenamed("id", "src_id").withColumnRenamed("label", "src_label")
-    tgt_nodes = nodes_df.withColumnRenamed("id", "tgt_id").withColumnRenamed("label", "tgt_label")
-
-    enriched = (
-        edges_df
-        .join(src_nodes, edges_df.source == src_nodes.src_id)
-        .join(tgt_nodes, edges_df.target == tgt_nodes.tgt_id)
-        .drop("src_id", "tgt_id")
-    )
+    enriched = resolve_labels(edges_df, nodes_df)
 
     # Write per (src_label, tgt_label) combo since the connector requires labels
     combos = enriched.select("src_label", "tgt_label").distinct().collect()
@@ -113,33 +186,14 @@ def write_edges(spark, nodes_csv_path: str, edges_csv_path: str) -> None:
     enriched.cache()
 
     def write_combo(src_label: str, tgt_label: str) -> str:
-        subset = (
-            enriched
-            .filter(
+        subset = edge_columns(
+            enriched.filter(
                 (enriched.src_label == src_label)
                 & (enriched.tgt_label == tgt_label)
             )
-            .withColumnRenamed("source", "source.id")
-            .withColumnRenamed("target", "target.id")
-            .select("`source.id`", "`target.id`", "weight")
         )
         count = subset.count()
-
-        (
-            subset.write.format(NEO4J_FORMAT)
-            .mode("Append")
-            .option("url", MG_URI)
-            .option("authentication.type", "none")
-            .option("relationship", "CONNECTED_TO")
-            .option("relationship.save.strategy", "keys")
-            .option("relationship.source.save.mode", "Match")
-            .option("relationship.source.labels", f":{src_label}")
-            .option("relationship.source.node.keys", "source.id:id")
-            .option("relationship.target.save.mode", "Match")
-            .option("relationship.target.labels", f":{tgt_label}")
-            .option("relationship.target.node.keys", "target.id:id")
-            .save()
-        )
+        save_edges(subset, src_label, tgt_label)
         return f"  CONNECTED_TO ({src_label} -> {tgt_label}): {count} edges"
 
     with ThreadPoolExecutor(max_workers=len(combos)) as pool:
@@ -153,6 +207,162 @@ def write_edges(spark, nodes_csv_path: str, edges_csv_path: str) -> None:
     enriched.unpersist()
 
 
+def cache_partitioned(df: DataFrame, partitions: int) -> tuple[DataFrame, dict[int, int]]:
+    """Repartition and cache df; returns it with the rows of each partition.
+    Writing from the cache keeps those partitions, so they match the write
+    tasks one to one."""
+    df = df.repartition(partitions).cache()
+    rows = {
+        row["partition"]: row["count"]
+        for row in df.groupBy(spark_partition_id().alias("partition")).count().collect()
+    }
+    return df, rows
+
+
+def task_seconds(spark, job_group: str) -> dict[int, float]:
+    """Run time of each partition's task in the last stage of every job
+    started under job_group, from the Spark UI REST API. Empty when the UI
+    is disabled or unreachable."""
+    sc = spark.sparkContext
+    if not sc.uiWebUrl:
+        return {}
+    tracker = sc.statusTracker()
+    seconds = {}
+    for job_id in tracker.getJobIdsForGroup(job_group):
+        job = tracker.getJobInfo(job_id)
+        if job is None or not job.stageIds:
+            continue
+        url = (
+            f"{sc.uiWebUrl}/api/v1/applications/{sc.applicationId}"
+            f"/stages/{max(job.stageIds)}/0/taskList?length=100000"
+        )
+        try:
+            with urllib.request.urlopen(url, timeout=10) as response:
+                tasks = json.load(response)
+        except (OSError, ValueError):
+            continue
+        for task in tasks:
+            if task.get("status") == "SUCCESS":
+                seconds[task["index"]] = task["duration"] / 1000
+    return seconds
+
+
+def partition_report(rows: dict[int, int], seconds: dict[int, float]) -> str:
+    rates = {p: rows[p] / seconds[p] for p in rows if seconds.get(p) and rows[p]}
+    if not rates:
+        return f"    {len(rows)} partitions, {min(rows.values(), default=0)}-{max(rows.values(), default=0)} rows each"
+    slowest = min(rates, key=rates.get)
+    return (
+        f"    {len(rows)} partitions, rows/s per partition: min {min(rates.values()):,.0f}, "
+        f"median {statistics.median(rates.values()):,.0f}, max {max(rates.values()):,.0f} "
+        f"(slowest: partition {slowest}, {rows[slowest]} rows in {seconds[slowest]:.2f} s)"
+    )
+
+
+def write_partitioned(spark, name: str, df: DataFrame, save, partitions: int) -> str:
+    """Write one subset from its own thread: cache it in `partitions`
+    partitions, save it, and describe its throughput."""
+    # Tag the write's jobs (and only those) so its tasks can be found
+    # afterwards; job groups are per thread.
+    spark.sparkContext.setJobGroup(f"{name} (cache)", f"cache {name}")
+    df, rows = cache_partitioned(df, partitions)
+    total = sum(rows.values())
+    spark.sparkContext.setJobGroup(name, f"write {name}")
+    start = time.perf_counter()
+    save(df)
+    elapsed = time.perf_counter() - start
+    df.unpersist()
+    rate = total / elapsed if elapsed else 0.0
+    return (
+        f"  {name}: {total} in {elapsed:.2f} s ({rate:,.0f}/s)\n"
+        + partition_report(rows, task_seconds(spark, name))
+    )
+
+
+def write_nodes_parallel(spark, csv_path: str, partitions: int, batch_size: int) -> DataFrame:
+    """Parse nodes once, count every label in one pass and write all labels
+    concurrently. Returns the cached (id, label) DataFrame for the edges."""
+    nodes_df = spark.read.csv(csv_path, header=True, inferSchema=True).cache()
+    counts = {row["label"]: row["count"] for row in nodes_df.groupBy("label").count().collect()}
+    print(f"Read {sum(counts.values())} nodes from {csv_path}: {counts}")
+
+    def write_label(label: str) -> str:
+        label_df = nodes_df.filter(nodes_df.label == label).drop("label")
+        return write_partitioned(
+            spark, f"{label} nodes", label_df,
+            lambda df: save_nodes(df, label, batch_size), partitions,
+        )
+
+    labels = [label for label in LABELS if counts.get(label)]
+    with ThreadPoolExecutor(max_workers=max(len(labels), 1)) as pool:
+        for future in as_completed([pool.submit(write_label, label) for label in labels]):
+            print(future.result())
+
+    id_labels = nodes_df.select("id", "label").cache()
+    id_labels.count()
+    nodes_df.unpersist()
+    return id_labels
+
+
+def write_edges_parallel(spark, id_labels: DataFrame, edges_csv_path: str, partitions: int, batch_size: int) -> None:
+    """Resolve labels once (cached), count every label pair in one groupBy
+    and write all pairs concurrently."""
+    edges_df = spark.read.csv(edges_csv_path, header=True, inferSchema=True)
+    enriched = resolve_labels(edges_df, id_labels).cache()
+    combos = {
+        (row["src_label"], row["tgt_label"]): row["count"]
+        for row in enriched.groupBy("src_label", "tgt_label").count().collect()
+    }
+    print(f"Read {sum(combos.values())} edges from {edges_csv_path} in {len(combos)} label pairs")
+
+    def write_combo(src_label: str, tgt_label: str) -> str:
+        subset = edge_columns(
+            enriched.filter((enriched.src_label == src_label) & (enriched.tgt_label == tgt_label))
+        )
+        return write_partitioned(
+            spark, f"CONNECTED_TO ({src_label} -> {tgt_label})", subset,
+            lambda df: save_edges(df, src_label, tgt_label, batch_size), partitions,
+        )
+
+    with ThreadPoolExecutor(max_workers=max(len(combos), 1)) as pool:
+        for future in as_completed([pool.submit(write_combo, *combo) for combo in combos]):
+            print(future.result())
+
+    enriched.unpersist()
+    id_labels.unpersist()
+
+
+def write_bolt(spark, name: str, df: DataFrame, kind: str, partitions: int, batch_size: int, max_retries: int) -> str:
+    """Write df from its partitions over Bolt (bolt_writer.py) and describe
+    its throughput."""
+    sc = spark.sparkContext
+    rows_written, retries = sc.accumulator(0), sc.accumulator(0)
+    sc.setJobGroup(name, f"write {name}")
+    start = time.perf_counter()
+    df.repartition(partitions).foreachPartition(
+        partition_writer(MG_URI, kind, batch_size, max_retries, rows_written, retries)
+    )
+    elapsed = time.perf_counter() - start
+    rate = rows_written.value / elapsed if elapsed else 0.0
+    return (
+        f"  {name}: {rows_written.value} in {elapsed:.2f} s ({rate:,.0f}/s), "
+        f"{partitions} partitions, {retries.value} retried batches"
+    )
+
+
+def write_nodes_bolt(spark, csv_path: str, partitions: int, batch_size: int, max_retries: int) -> None:
+    """All labels in one pass; each partition batches its rows per label."""
+    nodes_df = spark.read.csv(csv_path, header=True, inferSchema=True)
+    print(write_bolt(spark, "nodes", nodes_df, "nodes", partitions, batch_size, max_retries))
+
+
+def write_edges_bolt(spark, csv_path: str, partitions: int, batch_size: int, max_retries: int) -> None:
+    """Edges straight from the CSV: endpoints are matched on :Node(id), so
+    there are no labels to resolve."""
+    edges_df = spark.read.csv(csv_path, header=True, inferSchema=True).select("source", "target", "weight")
+    print(write_bolt(spark, "CONNECTED_TO", edges_df, "edges", partitions, batch_size, max_retries))
+
+
 def verify(driver) -> None:
     """Quick count check."""
     with driver.session() as session:
@@ -161,21 +371,77 @@ def verify(driver) -> None:
     print(f"\nVerification: {node_count} nodes, {edge_count} edges in Memgraph.")
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load nodes and edges CSVs into Memgraph via PySpark.")
+    parser.add_argument("nodes_csv", nargs="?", default="nodes.csv")
+    parser.add_argument("edges_csv", nargs="?", default="edges.csv")
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Parse each CSV once, write all labels concurrently and report per-partition throughput.",
+    )
+    parser.add_argument(
+        "--writer",
+        choices=["connector", "bolt"],
+        default="connector",
+        help="connector: the Neo4j Spark Connector; bolt: batched UNWIND queries sent "
+             "from every partition over Bolt, no connector JAR (default: connector).",
+    )
+    parser.add_argument(
+        "--partitions",
+        type=int,
+        default=None,
+        help="With --parallel: Spark partitions per label / label pair; with --writer bolt: "
+             "partitions of each CSV. Either way, concurrent write transactions "
+             "(default: spark.default.parallelism).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=5000,
+        help="With --parallel or --writer bolt: rows per write transaction (default: 5000).",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=5,
+        help="With --writer bolt: retries of a conflicting batch, with backoff (default: 5).",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
-    nodes_csv = sys.argv[1] if len(sys.argv) > 1 else "nodes.csv"
-    edges_csv = sys.argv[2] if len(sys.argv) > 2 else "edges.csv"
+    args = parse_args()
+    nodes_csv, edges_csv = args.nodes_csv, args.edges_csv
 
-    spark = get_spark()
+    bolt = args.writer == "bolt"
+    spark = get_spark(connector=not bolt)
     driver = get_driver()
 
     clear_memgraph(driver)
-    create_indexes(driver)
-
-    print(f"\nLoading nodes from {nodes_csv} ...")
-    write_nodes(spark, nodes_csv)
-
-    print(f"\nLoading edges from {edges_csv} ...")
-    write_edges(spark, nodes_csv, edges_csv)
+    create_indexes(driver, id_label=bolt)
+
+    if bolt:
+        spark.sparkContext.addPyFile(str(BOLT_WRITER))
+        partitions = args.partitions or spark.sparkContext.defaultParallelism
+        print(f"\nLoading nodes from {nodes_csv} over Bolt ({partitions} partitions, batch size {args.batch_size}) ...")
+        write_nodes_bolt(spark, nodes_csv, partitions, args.batch_size, args.max_retries)
+
+        print(f"\nLoading edges from {edges_csv} over Bolt ...")
+        write_edges_bolt(spark, edges_csv, partitions, args.batch_size, args.max_retries)
+    elif args.parallel:
+        partitions = args.partitions or spark.sparkContext.defaultParallelism
+        print(f"\nLoading nodes from {nodes_csv} ({partitions} partitions, batch size {args.batch_size}) ...")
+        id_labels = write_nodes_parallel(spark, nodes_csv, partitions, args.batch_size)
+
+        print(f"\nLoading edges from {edges_csv} ...")
+        write_edges_parallel(spark, id_labels, edges_csv, partitions, args.batch_size)
+    else:
+        print(f"\nLoading nodes from {nodes_csv} ...")
+        write_nodes(spark, nodes_csv)
+
+        print(f"\nLoading edges from {edges_csv} ...")
+        write_edges(spark, nodes_csv, edges_csv)
 
     verify(driver)
 